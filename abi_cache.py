@@ -0,0 +1,156 @@
+"""Cache persistent (SQLite) pentru ABI-urile contractelor, cu TTL și evicție LRU."""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from abi_signatures import SignatureIndex, build_signature_index
+from metrics import increment
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "vesting_analyzer", "abi_cache.sqlite3"
+)
+DEFAULT_TTL = 30 * 24 * 3600          # ABI-ul unui contract verificat practic nu se schimbă
+DEFAULT_NEGATIVE_TTL = 6 * 3600       # un contract neverificat poate fi verificat ulterior
+DEFAULT_MAX_ENTRIES = 50_000
+
+AbiList = List[Dict[str, Any]]
+
+
+class AbiCache:
+    """ABI-uri indexate după (rețea, adresă), stocate comprimat într-un fișier SQLite.
+
+    Alături de fiecare ABI este salvat și indexul de semnături
+    (`abi_signatures.build_signature_index`). O intrare cu ABI `None` este un
+    rezultat negativ (contract neverificat) și expiră după `negative_ttl`.
+    Când numărul de intrări depășește `max_entries` sunt eliminate cele mai
+    puțin recent accesate.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: float = DEFAULT_TTL,
+                 negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 clock: Callable[[], float] = time.time) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS abi_cache ("
+                " network TEXT NOT NULL,"
+                " address TEXT NOT NULL,"
+                " abi BLOB,"
+                " fetched_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL,"
+                " signatures BLOB,"
+                " PRIMARY KEY (network, address))"
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(abi_cache)")}
+            if "signatures" not in columns:
+                self._conn.execute("ALTER TABLE abi_cache ADD COLUMN signatures BLOB")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS abi_cache_lru ON abi_cache (accessed_at)"
+            )
+
+    @staticmethod
+    def _key(network: str, address: str) -> Tuple[str, str]:
+        return network.lower(), address.lower()
+
+    def get(self, network: str, address: str) -> Tuple[bool, Optional[AbiList]]:
+        """Returnează (găsit, abi); `abi` este None pentru un rezultat negativ."""
+        key = self._key(network, address)
+        now = self._clock()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT abi, fetched_at FROM abi_cache WHERE network = ? AND address = ?",
+                key,
+            ).fetchone()
+            if row is None:
+                increment("cache_misses_total", cache="abi")
+                return False, None
+            blob, fetched_at = row
+            ttl = self.ttl if blob is not None else self.negative_ttl
+            with self._conn:
+                if now - fetched_at > ttl:
+                    self._conn.execute(
+                        "DELETE FROM abi_cache WHERE network = ? AND address = ?", key
+                    )
+                    increment("cache_misses_total", cache="abi")
+                    return False, None
+                self._conn.execute(
+                    "UPDATE abi_cache SET accessed_at = ? WHERE network = ? AND address = ?",
+                    (now, *key),
+                )
+        increment("cache_hits_total", cache="abi")
+        if blob is None:
+            return True, None
+        return True, json.loads(zlib.decompress(blob))
+
+    def get_signatures(self, network: str, address: str) -> Optional[SignatureIndex]:
+        """Returnează indexul de semnături salvat pentru ABI-ul din cache."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT abi, signatures FROM abi_cache WHERE network = ? AND address = ?",
+                self._key(network, address),
+            ).fetchone()
+        if row is None or row[0] is None:
+            return None
+        if row[1] is None:
+            return build_signature_index(json.loads(zlib.decompress(row[0])))
+        return json.loads(zlib.decompress(row[1]))
+
+    def put(self, network: str, address: str, abi: Optional[AbiList]) -> None:
+        """Salvează ABI-ul (sau un rezultat negativ) și aplică limita de dimensiune."""
+        blob = signatures = None
+        if abi is not None:
+            blob = zlib.compress(json.dumps(abi).encode())
+            signatures = zlib.compress(json.dumps(build_signature_index(abi)).encode())
+        now = self._clock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO abi_cache"
+                " (network, address, abi, fetched_at, accessed_at, signatures)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (*self._key(network, address), blob, now, now, signatures),
+            )
+            self._conn.execute(
+                "DELETE FROM abi_cache WHERE rowid IN ("
+                " SELECT rowid FROM abi_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM abi_cache").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM abi_cache")
+
+
+_shared: Dict[str, AbiCache] = {}
+_shared_lock = threading.Lock()
+
+
+def get_abi_cache(path: Optional[str] = None) -> AbiCache:
+    """Returnează instanța partajată a cache-ului pentru `path` (implicit ABI_CACHE_PATH)."""
+    path = path or os.getenv("ABI_CACHE_PATH") or DEFAULT_CACHE_PATH
+    with _shared_lock:
+        cache = _shared.get(path)
+        if cache is None:
+            cache = _shared[path] = AbiCache(
+                path,
+                ttl=float(os.getenv("ABI_CACHE_TTL", DEFAULT_TTL)),
+                max_entries=int(os.getenv("ABI_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+            )
+        return cache
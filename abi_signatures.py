@@ -0,0 +1,60 @@
+"""Index precalculat al semnăturilor din ABI, folosit pentru alegerea overload-ului corect."""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+VIEW_MUTABILITIES = ("view", "pure")
+
+SignatureIndex = Dict[str, List[Dict[str, Any]]]
+
+
+def collapse_if_tuple(abi: Dict[str, Any]) -> str:
+    """Tipul canonic al unui parametru ABI, ex. `(address,uint256)[]` pentru `tuple[]`.
+
+    Echivalent cu `eth_utils.abi.collapse_if_tuple`, fără costul importului eth_utils.
+    """
+    typ = abi["type"]
+    if not typ.startswith("tuple"):
+        return typ
+    components = ",".join(collapse_if_tuple(c) for c in abi["components"])
+    return f"({components}){typ[5:]}"
+
+
+def build_signature_index(abi: Sequence[Dict[str, Any]]) -> SignatureIndex:
+    """Mapează numele fiecărei funcții la overload-urile sale (tipuri de intrare/ieșire, mutabilitate)."""
+    index: SignatureIndex = {}
+    for item in abi or []:
+        name = item.get("name")
+        if item.get("type") != "function" or not name:
+            continue
+        mutability = item.get("stateMutability")
+        if not mutability:
+            # ABI-urile vechi (solc < 0.4.16) folosesc doar câmpul `constant`
+            mutability = "view" if item.get("constant") else "nonpayable"
+        index.setdefault(name, []).append({
+            "inputs": [collapse_if_tuple(i) for i in item.get("inputs", [])],
+            "outputs": [collapse_if_tuple(o) for o in item.get("outputs", [])],
+            "stateMutability": mutability,
+        })
+    return index
+
+
+def resolve_call_args(index: SignatureIndex, name: str, address: Optional[str] = None,
+                      prefer_address: bool = True) -> Optional[Tuple]:
+    """Alege argumentele pentru apelul view `name`, fără apeluri de probă.
+
+    Sunt luate în considerare doar overload-urile view/pure fără parametri sau
+    cu un singur parametru `address`. Returnează None dacă niciunul nu se
+    potrivește.
+    """
+    input_sets = {
+        tuple(o["inputs"]) for o in index.get(name, [])
+        if o["stateMutability"] in VIEW_MUTABILITIES
+    }
+    candidates = []
+    if address and ("address",) in input_sets:
+        candidates.append((address,))
+    if () in input_sets:
+        candidates.append(())
+    if not candidates:
+        return None
+    return candidates[0] if prefer_address else candidates[-1]
@@ -0,0 +1,132 @@
+"""Registru thread-safe de analizoare "calde", câte unul per rețea și tip de analizor."""
+
+import os
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+DEFAULT_HEALTH_CHECK_INTERVAL = 60.0
+
+
+def _web3_of(analyzer: Any):
+    """Găsește instanța Web3 a unui `VestingContractAnalyzer` sau `VestingAnalyzer`."""
+    w3 = getattr(analyzer, "w3", None)
+    if w3 is None:
+        w3 = getattr(getattr(analyzer, "web3_conn", None), "w3", None)
+    return w3
+
+
+def _has_connection_slot(analyzer: Any) -> bool:
+    """True dacă analizorul (sau conectorul său) ar trebui să aibă o instanță Web3."""
+    return hasattr(analyzer, "w3") or hasattr(getattr(analyzer, "web3_conn", None), "w3")
+
+
+def check_health(analyzer: Any) -> bool:
+    """Verifică legătura RPC a analizorului citind ultimul bloc."""
+    w3 = _web3_of(analyzer)
+    if w3 is None:
+        # `w3` None înseamnă conexiune pierdută; fără Web3 propriu nu e nimic de verificat
+        return not _has_connection_slot(analyzer)
+    try:
+        w3.eth.block_number
+        return True
+    except Exception:
+        return False
+
+
+class _Entry:
+    __slots__ = ("analyzer", "healthy")
+
+    def __init__(self, analyzer: Any) -> None:
+        self.analyzer = analyzer
+        self.healthy = True
+
+
+class AnalyzerRegistry:
+    """Păstrează analizoarele create o dată și le reutilizează între cereri.
+
+    Un thread de fundal verifică periodic conexiunea fiecărui analizor; cele
+    căzute sunt marcate și recreate leneș, la următoarea cerere.
+    """
+
+    def __init__(self, health_check_interval: Optional[float] = None) -> None:
+        if health_check_interval is None:
+            health_check_interval = float(os.getenv(
+                "ANALYZER_HEALTH_CHECK_INTERVAL", DEFAULT_HEALTH_CHECK_INTERVAL
+            ))
+        self.health_check_interval = health_check_interval
+        self._entries: Dict[Tuple[Hashable, str], _Entry] = {}
+        self._creation_locks: Dict[Tuple[Hashable, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._health_thread: Optional[threading.Thread] = None
+
+    def get(self, network: str, factory: Callable[[str], Any]) -> Any:
+        """Returnează analizorul pentru `network`, creându-l cu `factory` la nevoie.
+
+        Dacă `factory` returnează None sau un analizor fără conexiune (`w3`
+        None), rezultatul nu este memorat, iar apelantul primește None.
+        """
+        key = (factory, network.lower())
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.healthy:
+                return entry.analyzer
+            creation_lock = self._creation_locks.setdefault(key, threading.Lock())
+
+        with creation_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry.healthy:
+                    return entry.analyzer
+            analyzer = factory(network.lower())
+            if analyzer is None or (_has_connection_slot(analyzer)
+                                    and _web3_of(analyzer) is None):
+                return None
+            with self._lock:
+                self._entries[key] = _Entry(analyzer)
+            self._ensure_health_thread()
+            return analyzer
+
+    def check_all(self) -> None:
+        """Rulează o verificare de sănătate pentru toate analizoarele înregistrate."""
+        with self._lock:
+            entries = list(self._entries.values())
+        for entry in entries:
+            entry.healthy = check_health(entry.analyzer)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def close(self) -> None:
+        """Oprește thread-ul de verificare și golește registrul."""
+        self._stop.set()
+        self.clear()
+
+    def _ensure_health_thread(self) -> None:
+        if self.health_check_interval <= 0:
+            return
+        with self._lock:
+            if self._health_thread is not None and self._health_thread.is_alive():
+                return
+            self._health_thread = threading.Thread(
+                target=self._health_loop, name="analyzer-health", daemon=True
+            )
+            self._health_thread.start()
+
+    def _health_loop(self) -> None:
+        while not self._stop.wait(self.health_check_interval):
+            self.check_all()
+
+
+_registry = AnalyzerRegistry()
+
+
+def get_analyzer(network: str, factory: Callable[[str], Any]) -> Any:
+    """Returnează analizorul "cald" din registrul global al procesului."""
+    return _registry.get(network, factory)
+
+
+def clear_analyzers() -> None:
+    """Golește registrul global, ex. după schimbarea endpoint-urilor din mediu."""
+    _registry.clear()
@@ -0,0 +1,220 @@
+"""Benchmark offline pentru analiza contractelor, pe serverul mock din `mock_server`.
+
+Rulează `VestingContractAnalyzer.analyze_multiple_contracts` și
+`vesting_logic.analyze_vesting_contracts` la mai multe dimensiuni de
+portofoliu și raportează contracte/secundă, latența p50/p99 per contract și
+numărul de cereri primite de server. Fiecare rulare folosește adrese noi,
+deci cache-urile sunt reci; conexiunile și analizoarele rămân calde.
+
+Implicit toate contractele au același cod runtime, ca o flotă de clone create
+dintr-un factory; `--unique-code` dă fiecărui contract alt bytecode.
+
+Exemplu:
+    python benchmarks/bench_analyzer.py --scales 10 100 1000 --latency 0.02
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.mock_server import DEFAULT_FIXTURE, MockChainServer  # noqa: E402
+
+SCENARIOS = ("analyze_multiple_contracts", "analyze_vesting_contracts")
+
+
+def configure_environment(server: MockChainServer, cache_dir: str,
+                          client_rate: Optional[float]) -> None:
+    """Îndreaptă ambii clienți spre serverul mock, cu cache-uri într-un director temporar."""
+    # Serverul mock răspunde ca mainnet (chainId 1)
+    os.environ.update({
+        "DEFAULT_NETWORK": "mainnet",
+        "RPC_URL_MAINNET": f"{server.url}/rpc",
+        "ETHERSCAN_API_URL_MAINNET": f"{server.url}/api",
+        "ETHERSCAN_API_KEY": "benchmark",
+        "INFURA_PROJECT_ID": "benchmark",
+        "ABI_CACHE_PATH": os.path.join(cache_dir, "abi_cache.sqlite3"),
+        "HISTORY_CACHE_PATH": os.path.join(cache_dir, "history.sqlite3"),
+        "CLONE_INDEX_PATH": os.path.join(cache_dir, "clone_index.sqlite3"),
+        "ANALYZER_HEALTH_CHECK_INTERVAL": "0",
+    })
+    os.environ.pop("RESULT_STORE_PATH", None)
+    if client_rate:
+        for prefix in ("ETHERSCAN", "RPC"):
+            os.environ[f"{prefix}_RATE_LIMIT"] = str(client_rate)
+            os.environ[f"{prefix}_BURST"] = str(max(int(client_rate), 1))
+
+
+def synthetic_addresses(count: int, offset: int) -> List[str]:
+    return [f"0x{offset + i:040x}" for i in range(count)]
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(round(q * (len(ordered) - 1))), len(ordered) - 1)]
+
+
+class LatencyRecorder:
+    """Înlocuiește o metodă pe instanță și înregistrează durata fiecărui apel.
+
+    Apelurile care aruncă o excepție sunt cronometrate și ele, dar numărate
+    separat în `failures`.
+    """
+
+    def __init__(self, owner: Any, attribute: str) -> None:
+        self.samples: List[float] = []
+        self.failures = 0
+        self._lock = threading.Lock()
+        self._owner = owner
+        self._attribute = attribute
+        self._original: Callable = getattr(owner, attribute)
+        setattr(owner, attribute, self._timed)
+
+    def _timed(self, *args, **kwargs):
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = self._original(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            with self._lock:
+                self.samples.append(time.perf_counter() - start)
+                self.failures += failed
+
+    def restore(self) -> None:
+        setattr(self._owner, self._attribute, self._original)
+
+
+def run_scenario(scenario: str, addresses: List[str], workers: int) -> Dict[str, Any]:
+    from analyzer_registry import get_analyzer
+
+    if scenario == "analyze_multiple_contracts":
+        from web3_integration import VestingContractAnalyzer
+
+        analyzer = get_analyzer("mainnet", VestingContractAnalyzer)
+        recorder = LatencyRecorder(analyzer, "analyze_contract")
+        contracts = [{"address": a, "name": f"C{i}"} for i, a in enumerate(addresses)]
+        start = time.perf_counter()
+        try:
+            results = analyzer.analyze_multiple_contracts(contracts, max_workers=workers)
+        finally:
+            elapsed = time.perf_counter() - start
+            recorder.restore()
+        failed = sum(1 for r in results if r.get("status") != "success")
+    else:
+        import vesting_logic
+
+        analyzer = get_analyzer("mainnet", vesting_logic.VestingAnalyzer)
+        recorder = LatencyRecorder(analyzer.web3_conn, "get_vesting_data")
+        start = time.perf_counter()
+        try:
+            df, _, _ = vesting_logic.analyze_vesting_contracts("\n".join(addresses), "", "mainnet")
+        finally:
+            elapsed = time.perf_counter() - start
+            recorder.restore()
+        # Apelurile eșuate, plus contractele la care analiza nici nu a ajuns
+        failed = recorder.failures + len(addresses) - len(recorder.samples)
+
+    return {
+        "scenario": scenario,
+        "contracts": len(addresses),
+        "seconds": elapsed,
+        "contracts_per_sec": len(addresses) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(recorder.samples, 0.50) * 1000,
+        "p99_ms": percentile(recorder.samples, 0.99) * 1000,
+        "mean_ms": statistics.fmean(recorder.samples) * 1000 if recorder.samples else 0.0,
+        "failed": failed,
+    }
+
+
+def run_benchmark(scales: List[int], scenarios=SCENARIOS, workers: int = 4,
+                  latency: float = 0.0, etherscan_rate: Optional[float] = None,
+                  rpc_rate: Optional[float] = None, client_rate: Optional[float] = 1000,
+                  fixture: str = DEFAULT_FIXTURE,
+                  unique_code: bool = False) -> List[Dict[str, Any]]:
+    """Rulează toate scenariile la toate dimensiunile și returnează câte un rând per rulare."""
+    from analyzer_registry import clear_analyzers
+
+    rows = []
+    saved_environ = dict(os.environ)
+    with tempfile.TemporaryDirectory() as cache_dir, \
+            MockChainServer(fixture, latency, etherscan_rate, rpc_rate,
+                            unique_code=unique_code) as server:
+        configure_environment(server, cache_dir, client_rate)
+        clear_analyzers()
+        try:
+            offset = 1
+            for scenario in scenarios:
+                for scale in scales:
+                    server.reset_counts()
+                    row = run_scenario(scenario, synthetic_addresses(scale, offset), workers)
+                    offset += scale
+                    requests = dict(server.requests)
+                    row["http_requests"] = (requests.pop("rpc:http_request", 0)
+                                            + sum(v for k, v in requests.items()
+                                                  if k.startswith("etherscan:")))
+                    row["requests"] = requests
+                    rows.append(row)
+        finally:
+            # Analizoarele create aici indică spre serverul mock oprit
+            clear_analyzers()
+            os.environ.clear()
+            os.environ.update(saved_environ)
+    return rows
+
+
+def format_table(rows: List[Dict[str, Any]]) -> str:
+    header = (f"{'scenariu':<28} {'contracte':>9} {'contr/s':>9} {'p50 ms':>8} "
+              f"{'p99 ms':>8} {'HTTP':>7} {'eșuate':>7}")
+    lines = [header, "-" * len(header)]
+    for row in rows:
+        lines.append(
+            f"{row['scenario']:<28} {row['contracts']:>9} {row['contracts_per_sec']:>9.1f} "
+            f"{row['p50_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['http_requests']:>7} "
+            f"{row['failed']:>7}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark offline al analizei de contracte")
+    parser.add_argument("--scales", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--scenario", choices=SCENARIOS, action="append",
+                        help="rulează doar scenariul dat (implicit ambele)")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="latența serverului mock per cerere HTTP, în secunde")
+    parser.add_argument("--etherscan-rate", type=float,
+                        help="cereri/secundă acceptate de Etherscan-ul mock")
+    parser.add_argument("--rpc-rate", type=float,
+                        help="cereri HTTP/secundă acceptate de nodul mock")
+    parser.add_argument("--client-rate", type=float, default=1000,
+                        help="limita de rată a clientului (ETHERSCAN_/RPC_RATE_LIMIT)")
+    parser.add_argument("--fixture", default=DEFAULT_FIXTURE)
+    parser.add_argument("--unique-code", action="store_true",
+                        help="alt cod runtime pentru fiecare contract (fără familii de clone)")
+    parser.add_argument("--json", help="salvează rezultatele și în acest fișier JSON")
+    args = parser.parse_args(argv)
+
+    rows = run_benchmark(args.scales, args.scenario or SCENARIOS, args.workers, args.latency,
+                         args.etherscan_rate, args.rpc_rate, args.client_rate, args.fixture,
+                         args.unique_code)
+    print(format_table(rows))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as handle:
+            json.dump(rows, handle, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
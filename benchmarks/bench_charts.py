@@ -0,0 +1,85 @@
+"""Compară graficele agregate cu cele cu un element per contract (payload și timp).
+
+Exemplu:
+    python benchmarks/bench_charts.py --contracts 1000 10000 50000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chain_backend import SUPPORTED_NETWORKS  # noqa: E402
+from chart_data import aggregate_results  # noqa: E402
+from gradio_vesting_app import (create_risk_distribution_chart,  # noqa: E402
+                                create_security_scores_chart,
+                                create_token_distribution_chart)
+from results_table import build_results_table  # noqa: E402
+from scoring import risk_level  # noqa: E402
+
+
+def make_results(size, seed=0):
+    rng = random.Random(seed)
+    results = []
+    for i in range(size):
+        score = rng.randint(0, 100)
+        results.append({
+            "name": f"Contract_{i + 1}", "network": rng.choice(SUPPORTED_NETWORKS),
+            "address": f"0x{i:040x}", "status": "success", "security_score": score,
+            "risk_level": risk_level(score), "token_decimals": 18,
+            "vested_amount": rng.randint(0, 10**24),
+        })
+    return results
+
+
+def per_contract_charts(table):
+    """Graficele originale: o bară / o felie pentru fiecare contract."""
+    import plotly.express as px
+
+    return [
+        px.bar(table, x="name", y="security_score", title="Scoruri de securitate"),
+        px.pie(table, values="vested_amount", names="name", title="Distribuția token-urilor"),
+        px.pie(table, names="risk_level", title="Distribuția nivelurilor de risc"),
+    ]
+
+
+def aggregated_charts(table):
+    aggregates = aggregate_results(table)
+    return [
+        create_security_scores_chart(table, aggregates),
+        create_token_distribution_chart(table, aggregates),
+        create_risk_distribution_chart(table, aggregates),
+    ]
+
+
+def measure(build, table, repeat):
+    """(cel mai bun timp de construire + serializare, octeți JSON) pentru cele trei grafice."""
+    best, size = float("inf"), 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = sum(len(fig.to_json()) for fig in build(table))
+        best = min(best, time.perf_counter() - start)
+    return best, size
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--contracts", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f"{'contracte':>10} {'per contract (s)':>17} {'payload (KB)':>13} "
+          f"{'agregat (s)':>12} {'payload (KB)':>13}")
+    for size in args.contracts:
+        table = build_results_table(make_results(size))
+        legacy_time, legacy_bytes = measure(per_contract_charts, table, args.repeat)
+        aggregated_time, aggregated_bytes = measure(aggregated_charts, table, args.repeat)
+        print(f"{size:>10} {legacy_time:>17.3f} {legacy_bytes / 1024:>13.1f} "
+              f"{aggregated_time:>12.3f} {aggregated_bytes / 1024:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Măsoară timpul de import al modulelor aplicației, fiecare într-un proces nou.
+
+Pentru fiecare modul raportează mediana timpului de import și dependențele
+grele (web3, pandas, plotly, ...) încărcate deja la import. Rândul
+`<dependențe grele>` arată costul pe care l-ar plăti un proces care le
+importă pe toate de la început.
+
+Exemplu:
+    python benchmarks/bench_imports.py --repeat 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ("web3", "eth_abi", "eth_utils", "pandas", "numpy", "plotly",
+                 "requests", "urllib3", "gradio")
+
+DEFAULT_MODULES = ("bulk_analyze", "web3_integration", "vesting_logic",
+                   "gradio_vesting_app", "event_indexer", "scoring")
+
+BASELINE = "<dependențe grele>"
+BASELINE_IMPORTS = ("web3", "pandas", "plotly.express", "requests")
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+for name in {imports!r}:
+    __import__(name)
+elapsed = time.perf_counter() - start
+heavy = sorted(m for m in {heavy!r} if m in sys.modules)
+print(json.dumps({{"seconds": elapsed, "heavy": heavy}}))
+"""
+
+
+def heavy_modules_before_start() -> List[str]:
+    """Dependențele grele încărcate deja de interpretor (ex. prin fișiere .pth)."""
+    return measure_once(())["heavy"]
+
+
+def measure_once(imports) -> Dict:
+    code = _PROBE.format(imports=tuple(imports), heavy=HEAVY_MODULES)
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def measure(imports, repeat: int) -> Dict:
+    runs = [measure_once(imports) for _ in range(repeat)]
+    return {
+        "seconds": statistics.median(run["seconds"] for run in runs),
+        "heavy": runs[-1]["heavy"],
+    }
+
+
+def run_benchmark(modules=DEFAULT_MODULES, repeat: int = 3,
+                  baseline: bool = True) -> List[Dict]:
+    # Modulele preîncărcate de interpretor nu sunt atribuite codului aplicației
+    preloaded = set(heavy_modules_before_start())
+    targets = [(module, (module,)) for module in modules]
+    if baseline:
+        targets.append((BASELINE, BASELINE_IMPORTS))
+    rows = []
+    for label, imports in targets:
+        result = measure(imports, repeat)
+        rows.append({
+            "module": label,
+            "import_ms": result["seconds"] * 1000,
+            "heavy": [m for m in result["heavy"] if m not in preloaded],
+        })
+    return rows
+
+
+def format_table(rows: List[Dict]) -> str:
+    header = f"{'modul':<22} {'import ms':>10}  dependențe grele încărcate"
+    lines = [header, "-" * len(header)]
+    for row in rows:
+        lines.append(f"{row['module']:<22} {row['import_ms']:>10.1f}  "
+                     f"{', '.join(row['heavy']) or '-'}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=list(DEFAULT_MODULES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-baseline", action="store_true",
+                        help=f"nu măsura rândul {BASELINE}")
+    parser.add_argument("--json", help="salvează rezultatele și în acest fișier JSON")
+    args = parser.parse_args(argv)
+
+    rows = run_benchmark(args.modules, args.repeat, not args.no_baseline)
+    print(format_table(rows))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as handle:
+            json.dump(rows, handle, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""Compară scorarea vectorizată cu bucla per contract pe un portofoliu sintetic.
+
+Exemplu:
+    python benchmarks/bench_scoring.py --contracts 20000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scoring import DEFAULT_WEIGHTS, risk_level, score_portfolio  # noqa: E402
+
+VOCABULARY = [
+    "vestedAmount", "releasable", "release", "released", "cliff", "duration",
+    "start", "beneficiary", "owner", "token", "transfer", "approve", "balanceOf",
+    "totalSupply", "allowance", "renounceOwnership", "transferOwnership",
+    "revoke", "revoked", "emergencyWithdraw", "getVestingSchedule", "claim",
+]
+
+
+def legacy_score(functions, verified):
+    """Bucla originală: fiecare funcție comparată cu fiecare cuvânt cheie."""
+    found = {name: False for name in DEFAULT_WEIGHTS}
+    for func in functions:
+        func_lower = func.lower()
+        for vesting_func in found.keys():
+            if vesting_func.lower() in func_lower:
+                found[vesting_func] = True
+
+    score = 0
+    for func in ["vestedAmount", "releasable", "release"]:
+        if found.get(func, False):
+            score += 20
+    for func in ["released", "cliff", "duration", "start"]:
+        if found.get(func, False):
+            score += 10
+    for func in ["beneficiary", "owner", "token"]:
+        if found.get(func, False):
+            score += 5
+    if verified:
+        score += 5
+    score = min(score, 100)
+    return score, risk_level(score)
+
+
+def make_portfolio(size, seed=0):
+    rng = random.Random(seed)
+    function_lists = [rng.sample(VOCABULARY, rng.randint(0, 15)) for _ in range(size)]
+    verified = [rng.random() < 0.8 for _ in range(size)]
+    return function_lists, verified
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--contracts", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f"{'contracte':>10} {'buclă (s)':>12} {'vectorizat (s)':>15} {'accelerare':>11}")
+    for size in args.contracts:
+        function_lists, verified = make_portfolio(size)
+
+        loop_time = vector_time = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            expected = [legacy_score(f, v) for f, v in zip(function_lists, verified)]
+            loop_time = min(loop_time, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            table = score_portfolio(function_lists, verified)
+            vector_time = min(vector_time, time.perf_counter() - start)
+
+        actual = list(zip(table["security_score"].tolist(), table["risk_level"].tolist()))
+        if actual != expected:
+            raise SystemExit("Scorurile vectorizate diferă de cele ale buclei")
+        print(f"{size:>10} {loop_time:>12.4f} {vector_time:>15.4f} {loop_time / vector_time:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
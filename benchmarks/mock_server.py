@@ -0,0 +1,219 @@
+"""Server HTTP local care imită Etherscan și un nod JSON-RPC, pentru benchmark-uri offline.
+
+Răspunsurile vin dintr-un fișier fixture (vezi `fixtures/token_vesting.json`):
+aceleași metadate `getsourcecode`/`getabi`, același cod runtime și aceleași
+valori `eth_call` (indexate după selectorul funcției) sunt servite pentru
+orice adresă. Apelurile `aggregate3` către Multicall3 sunt decodate și fiecare
+sub-apel primește răspunsul din fixture.
+
+Cu `unique_code`, codul runtime primește la final adresa cerută, astfel încât
+fiecare contract are alt bytecode (nicio familie de clone comună).
+
+Latența per cerere HTTP și limitele de rată sunt configurabile; la depășirea
+cotei Etherscan răspunde cu "Max rate limit reached", iar nodul RPC cu 429.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+from eth_abi.abi import default_codec
+
+from multicall import MULTICALL3_ADDRESS
+
+DEFAULT_FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                               "fixtures", "token_vesting.json")
+
+AGGREGATE3_SELECTOR = "0x82ad56cb"
+CHAIN_ID = 1
+
+
+class _ServerBucket:
+    """Limită de rată simplă pe partea de server; fără așteptare, doar refuz."""
+
+    def __init__(self, rate: Optional[float]) -> None:
+        self.rate = rate
+        self._tokens = rate or 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        if not self.rate:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class MockChainServer:
+    """Pornește serverul mock într-un thread; `url` este baza pentru ambele API-uri.
+
+    Etherscan răspunde pe `<url>/api`, nodul JSON-RPC pe `<url>/rpc`.
+    `requests` numără cererile per (serviciu, metodă/acțiune).
+    """
+
+    def __init__(self, fixture_path: str = DEFAULT_FIXTURE, latency: float = 0.0,
+                 etherscan_rate: Optional[float] = None,
+                 rpc_rate: Optional[float] = None, port: int = 0,
+                 unique_code: bool = False) -> None:
+        with open(fixture_path, encoding="utf-8") as handle:
+            self.fixture = json.load(handle)
+        self.latency = latency
+        self.unique_code = unique_code
+        self.etherscan_limit = _ServerBucket(etherscan_rate)
+        self.rpc_limit = _ServerBucket(rpc_rate)
+        self.requests: Counter = Counter()
+        self._counter_lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockChainServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever,
+                                        name="mock-chain", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "MockChainServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def count(self, key: str) -> None:
+        with self._counter_lock:
+            self.requests[key] += 1
+
+    def reset_counts(self) -> None:
+        with self._counter_lock:
+            self.requests.clear()
+
+    # -- Etherscan -----------------------------------------------------------
+
+    def etherscan_response(self, params: Dict[str, str]) -> Dict[str, Any]:
+        action = params.get("action", "")
+        self.count(f"etherscan:{action}")
+        if not self.etherscan_limit.allow():
+            return {"status": "0", "message": "NOTOK", "result": "Max rate limit reached"}
+        if action == "getsourcecode":
+            return {"status": "1", "message": "OK", "result": [self.fixture["getsourcecode"]]}
+        if action == "getabi":
+            return {"status": "1", "message": "OK", "result": self.fixture["getsourcecode"]["ABI"]}
+        if action == "getcontractcreation":
+            addresses = params.get("contractaddresses", "").split(",")
+            return {"status": "1", "message": "OK", "result": [
+                {**self.fixture["creation"], "contractAddress": a} for a in addresses if a
+            ]}
+        return {"status": "0", "message": "NOTOK", "result": f"Unsupported action {action}"}
+
+    # -- JSON-RPC ------------------------------------------------------------
+
+    def _call_result(self, data: str) -> Optional[str]:
+        return self.fixture["calls"].get(data[:10].lower())
+
+    def _aggregate3(self, data: str) -> str:
+        (calls,) = default_codec.decode(["(address,bool,bytes)[]"], bytes.fromhex(data[10:]))
+        results = []
+        for _, _, call_data in calls:
+            value = self._call_result("0x" + call_data.hex())
+            results.append((value is not None, bytes.fromhex(value[2:]) if value else b""))
+        return "0x" + default_codec.encode(["(bool,bytes)[]"], [results]).hex()
+
+    def rpc_result(self, method: str, params: list) -> Dict[str, Any]:
+        self.count(f"rpc:{method}")
+        block = self.fixture["block_number"]
+        if method == "web3_clientVersion":
+            return {"result": "MockChain/v1"}
+        if method == "eth_chainId":
+            return {"result": hex(CHAIN_ID)}
+        if method == "eth_blockNumber":
+            return {"result": hex(block)}
+        if method == "eth_getCode":
+            if self.unique_code:
+                return {"result": self.fixture["runtime_code"] + params[0][2:].lower()}
+            return {"result": self.fixture["runtime_code"]}
+        if method == "eth_getStorageAt":
+            return {"result": "0x" + "0" * 64}
+        if method == "eth_call":
+            tx = params[0]
+            data = tx.get("data") or tx.get("input") or "0x"
+            if tx.get("to", "").lower() == MULTICALL3_ADDRESS.lower() and data.startswith(AGGREGATE3_SELECTOR):
+                return {"result": self._aggregate3(data)}
+            value = self._call_result(data)
+            if value is None:
+                return {"error": {"code": 3, "message": "execution reverted"}}
+            return {"result": value}
+        if method == "eth_getTransactionByHash":
+            return {"result": {"hash": params[0],
+                               "blockNumber": hex(int(self.fixture["creation"]["blockNumber"]))}}
+        if method == "eth_getBlockByNumber":
+            number = params[0] if params[0] != "latest" else hex(block)
+            return {"result": {"number": number,
+                               "timestamp": hex(1_600_000_000 + 12 * int(number, 16))}}
+        if method == "eth_getLogs":
+            return {"result": []}
+        return {"error": {"code": -32601, "message": f"Method {method} not found"}}
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive, ca la serviciile reale; fără Nagle, care ar adăuga ~40 ms
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, payload: Any, status: int = 200) -> None:
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if server.latency:
+                    time.sleep(server.latency)
+                parsed = urlparse(self.path)
+                params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+                self._send_json(server.etherscan_response(params))
+
+            def do_POST(self):
+                if server.latency:
+                    time.sleep(server.latency)
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"null")
+                server.count("rpc:http_request")
+                if not server.rpc_limit.allow():
+                    self._send_json({"error": {"code": 429, "message": "Too Many Requests"}}, 429)
+                    return
+                items = payload if isinstance(payload, list) else [payload]
+                responses = [
+                    {"jsonrpc": "2.0", "id": item.get("id"),
+                     **server.rpc_result(item.get("method", ""), item.get("params") or [])}
+                    for item in items
+                ]
+                self._send_json(responses if isinstance(payload, list) else responses[0])
+
+        return Handler
@@ -0,0 +1,337 @@
+"""Rulare în linie de comandă a analizei pentru portofolii mari de contracte.
+
+Citește rânduri (address, name, beneficiary, network) din CSV sau JSONL, le
+analizează în grupuri cu `iter_analyze_contracts` și scrie fiecare rezultat,
+notat deja de analizor cu ponderile comune, în JSONL sau Parquet imediat ce
+este gata. Un fișier checkpoint
+păstrează contractele terminate, astfel încât o rulare întreruptă poate fi
+reluată fără a le analiza din nou. Rândurile cu coloana `network` completată
+sunt analizate pe rețeaua lor, în paralel cu celelalte rețele; restul pe
+rețeaua din `--network`.
+
+Exemplu:
+    python bulk_analyze.py portofoliu.csv -o rezultate.jsonl --workers 8
+"""
+
+import argparse
+import csv
+import functools
+import itertools
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from dotenv import load_dotenv
+
+from metrics import in_current_context, write_metrics
+from results_table import AMOUNT_FIELDS
+
+
+def iter_input_rows(path: str) -> Iterator[Dict[str, str]]:
+    """Citește leneș rândurile de intrare dintr-un fișier CSV sau JSONL."""
+    with open(path, newline="", encoding="utf-8") as handle:
+        if path.lower().endswith((".jsonl", ".ndjson")):
+            rows: Iterable[Dict[str, Any]] = (json.loads(line) for line in handle if line.strip())
+        else:
+            rows = csv.DictReader(handle)
+        for row in rows:
+            row = {str(k).strip().lower(): v for k, v in row.items() if k}
+            address = (row.get("address") or "").strip()
+            if not address:
+                continue
+            entry = {
+                "address": address,
+                "name": (row.get("name") or "").strip(),
+                "beneficiary": (row.get("beneficiary") or "").strip() or None,
+            }
+            network = (row.get("network") or "").strip().lower()
+            if network:
+                entry["network"] = network
+            yield entry
+
+
+def row_key(row: Dict[str, Any]) -> str:
+    """Cheia de checkpoint a unui rând: (rețeaua,) adresa contractului și a beneficiarului."""
+    key = f"{row['address'].lower()}|{(row.get('beneficiary') or '').lower()}"
+    return f"{row['network']}:{key}" if row.get("network") else key
+
+
+class Checkpoint:
+    """Fișier append-only cu cheile rândurilor deja scrise în output."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.done: Set[str] = set()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as handle:
+                self.done.update(line.strip() for line in handle if line.strip())
+        self._handle = open(path, "a", encoding="utf-8")
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.done
+
+    def add_all(self, keys: List[str]) -> None:
+        if not keys:
+            return
+        self._handle.write("".join(f"{key}\n" for key in keys))
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+        self.done.update(keys)
+
+    def close(self) -> None:
+        self._handle.close()
+
+
+class JsonlWriter:
+    """Scrie fiecare rezultat ca o linie JSON, imediat ce este disponibil.
+
+    Fișierul (și checkpoint-ul) este sincronizat pe disc la fiecare
+    `flush_rows` rânduri sau după `flush_interval` secunde, nu după fiecare
+    rând; la o întrerupere se reanalizează cel mult rândurile nesincronizate.
+    """
+
+    def __init__(self, path: str, flush_rows: int = 500, flush_interval: float = 5.0,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self._handle = open(path, "a", encoding="utf-8")
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self._clock = clock
+        self._flushed_at = clock()
+        self.pending = 0
+
+    def write(self, result: Dict[str, Any]) -> None:
+        self._handle.write(json.dumps(result, default=str) + "\n")
+        self.pending += 1
+
+    def flush_due(self) -> bool:
+        return self.pending >= self.flush_rows or (
+            self.pending > 0 and self._clock() - self._flushed_at >= self.flush_interval)
+
+    def flush(self) -> None:
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+        self.pending = 0
+        self._flushed_at = self._clock()
+
+    def close(self) -> None:
+        self.flush()
+        self._handle.close()
+
+
+class ParquetWriter:
+    """Scrie rezultatele ca fișiere `part-NNNNN.parquet` într-un director.
+
+    Fiecare fișier conține cel mult `rows_per_file` rânduri, așa că memoria
+    rămâne limitată, iar o rulare reluată adaugă fișiere noi lângă cele vechi.
+    Câmpurile imbricate (dict/list) sunt salvate ca JSON, iar sumele (întregi
+    uint256, care depășesc int64) ca text zecimal exact.
+    """
+
+    def __init__(self, path: str, rows_per_file: int = 5000) -> None:
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise SystemExit("Formatul parquet necesită pachetul `pyarrow` (pip install pyarrow).")
+        self.path = path
+        self.rows_per_file = rows_per_file
+        self._rows: List[Dict[str, Any]] = []
+        os.makedirs(path, exist_ok=True)
+        self._part = len([f for f in os.listdir(path) if f.endswith(".parquet")])
+
+    def write(self, result: Dict[str, Any]) -> None:
+        self._rows.append({
+            k: json.dumps(v, default=str) if isinstance(v, (dict, list))
+            else str(v) if k in AMOUNT_FIELDS and v is not None else v
+            for k, v in result.items()
+        })
+
+    def flush_due(self) -> bool:
+        return len(self._rows) >= self.rows_per_file
+
+    def flush(self) -> None:
+        if not self._rows:
+            return
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        # Rezultatele cu eroare nu au toate coloanele; completăm cu None
+        columns = list(dict.fromkeys(key for row in self._rows for key in row))
+        table = pa.Table.from_pylist([{c: row.get(c) for c in columns} for row in self._rows])
+        pq.write_table(table, os.path.join(self.path, f"part-{self._part:05d}.parquet"))
+        self._part += 1
+        self._rows = []
+
+    def close(self) -> None:
+        self.flush()
+
+
+def create_writer(output: str, fmt: Optional[str] = None):
+    fmt = fmt or ("parquet" if output.lower().endswith(".parquet") else "jsonl")
+    if fmt == "parquet":
+        return ParquetWriter(output)
+    return JsonlWriter(output)
+
+
+_DONE = object()
+
+
+def iter_overlapping_chunks(analyzer, chunks: Iterator[List[Dict[str, Any]]],
+                            workers: int) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """Generează perechi (rând de intrare, rezultat) pe măsură ce contractele sunt gata.
+
+    Fiecare grup rulează cu `iter_analyze_contracts` într-un thread propriu.
+    Grupul următor pornește când celor în curs le mai rămân cel mult
+    `workers` contracte, deci pool-ul nu stă nefolosit cât se termină coada
+    lentă a unui grup; în paralel rulează cel mult două grupuri. La o eroare
+    grupurile în curs sunt oprite, rezultatele deja terminate sunt generate,
+    apoi excepția este propagată.
+    """
+    results: "queue.Queue" = queue.Queue()
+    stop = threading.Event()
+    remaining: Dict[int, int] = {}
+    launched = itertools.count()
+
+    def run(chunk_id: int, chunk: List[Dict[str, Any]]) -> None:
+        try:
+            for i, result in analyzer.iter_analyze_contracts(chunk, workers, stop):
+                results.put((chunk_id, chunk[i], result))
+        except Exception as e:
+            results.put((chunk_id, None, e))
+        finally:
+            results.put((chunk_id, _DONE, None))
+
+    def launch() -> bool:
+        chunk = next(chunks, None)
+        if chunk is None:
+            return False
+        chunk_id = next(launched)
+        remaining[chunk_id] = len(chunk)
+        threading.Thread(target=in_current_context(run), args=(chunk_id, chunk),
+                         name=f"bulk-chunk-{chunk_id}", daemon=True).start()
+        return True
+
+    error: Optional[Exception] = None
+    more = launch()
+    try:
+        while remaining:
+            chunk_id, row, result = results.get()
+            if row is _DONE:
+                del remaining[chunk_id]
+            elif row is None:
+                error = error or result
+                stop.set()
+            else:
+                remaining[chunk_id] -= 1
+                yield row, result
+            if (more and error is None and len(remaining) < 2
+                    and sum(remaining.values()) <= workers):
+                more = launch()
+    finally:
+        stop.set()
+    if error is not None:
+        raise error
+
+
+def run_bulk_analysis(analyzer, input_path: str, output_path: str,
+                      fmt: Optional[str] = None, workers: int = 4,
+                      chunk_size: int = 200,
+                      checkpoint_path: Optional[str] = None) -> Dict[str, int]:
+    """Analizează toate rândurile din `input_path` care nu sunt deja în checkpoint.
+
+    Intrarea este citită în grupuri de `chunk_size` rânduri, deci memoria
+    folosită nu depinde de dimensiunea portofoliului. Fiecare rezultat este
+    scris imediat ce este gata; cheile intră în checkpoint doar după ce
+    rezultatele lor au fost sincronizate pe disc.
+    """
+    checkpoint = Checkpoint(checkpoint_path or f"{output_path}.checkpoint")
+    writer = create_writer(output_path, fmt)
+    stats = {"analyzed": 0, "skipped": 0, "errors": 0}
+    pending: List[str] = []
+
+    def commit() -> None:
+        writer.flush()
+        checkpoint.add_all(pending)
+        pending.clear()
+
+    def iter_chunks() -> Iterator[List[Dict[str, Any]]]:
+        rows = iter_input_rows(input_path)
+        while True:
+            batch = list(itertools.islice(rows, chunk_size))
+            if not batch:
+                return
+            chunk = [row for row in batch if row_key(row) not in checkpoint]
+            stats["skipped"] += len(batch) - len(chunk)
+            if chunk:
+                yield chunk
+
+    try:
+        for row, result in iter_overlapping_chunks(analyzer, iter_chunks(), workers):
+            result.setdefault("beneficiary", row["beneficiary"])
+            writer.write(result)
+            pending.append(row_key(row))
+            stats["analyzed"] += 1
+            if result.get("status") != "success":
+                stats["errors"] += 1
+            if writer.flush_due():
+                commit()
+                print(f"Analizate {stats['analyzed']} contracte "
+                      f"({stats['skipped']} reluate din checkpoint)", file=sys.stderr)
+    finally:
+        commit()
+        writer.close()
+        checkpoint.close()
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Analiză în masă a contractelor de vesting")
+    parser.add_argument("input", help="fișier CSV sau JSONL cu coloanele address, name, "
+                                      "beneficiary și (opțional) network")
+    parser.add_argument("-o", "--output", required=True,
+                        help="fișier .jsonl sau director .parquet pentru rezultate")
+    parser.add_argument("--format", choices=["jsonl", "parquet"],
+                        help="formatul de ieșire (implicit dedus din extensie)")
+    parser.add_argument("--network", default="mainnet",
+                        help="rețeaua rândurilor fără coloana network")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="contracte analizate în paralel")
+    parser.add_argument("--chunk-size", type=int, default=200,
+                        help="rânduri citite și analizate într-un grup")
+    parser.add_argument("--checkpoint", help="fișierul checkpoint (implicit <output>.checkpoint)")
+    parser.add_argument("--result-store",
+                        help="bază SQLite cu rezultate anterioare; contractele fără "
+                             "activitate nouă nu sunt analizate din nou")
+    parser.add_argument("--metrics",
+                        help="scrie la final timpii per etapă și contoarele "
+                             "(text Prometheus pentru .prom, altfel JSON)")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    from multi_network import MultiNetworkAnalyzer
+    from web3_integration import create_analyzer_instance
+
+    # Un analizor per rețea, creat la prima întâlnire a rețelei în fișier
+    analyzer = MultiNetworkAnalyzer(
+        functools.partial(create_analyzer_instance, result_store_path=args.result_store),
+        args.network,
+    )
+    if analyzer.analyzer(args.network) is None:
+        print("Nu s-a putut inițializa analizorul. Verifică cheile API.", file=sys.stderr)
+        return 1
+
+    try:
+        stats = run_bulk_analysis(analyzer, args.input, args.output, args.format,
+                                  args.workers, args.chunk_size, args.checkpoint)
+    finally:
+        if args.metrics:
+            write_metrics(args.metrics)
+    print(json.dumps(stats))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
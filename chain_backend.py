@@ -0,0 +1,377 @@
+"""Stratul comun de acces la lanț: provider RPC, Etherscan, cache ABI, batch și Multicall3.
+
+`VestingContractAnalyzer` (web3_integration) și `Web3Connector` (vesting_logic)
+folosesc același `ChainBackend`, astfel încât tabelele de rețele, obținerea
+ABI-ului și execuția apelurilor view există într-un singur loc.
+
+Providerul RPC se alege prin RPC_PROVIDER:
+- `infura` (implicit): endpoint-ul Infura al rețelei, cu INFURA_PROJECT_ID;
+- `rpc` (implicit când RPC_URL sau un RPC_URL_<REȚEA> este setat): URL-ul
+  JSON-RPC din RPC_URL_<REȚEA> (ex. RPC_URL_POLYGON);
+- `local`: un nod local sau un înlocuitor (anvil, hardhat, serverul mock din
+  `benchmarks/`), la LOCAL_NODE_URL.
+Alți provideri se adaugă cu `register_provider`.
+
+Un URL se referă la un singur lanț: variabilele generice (RPC_URL,
+LOCAL_NODE_URL, ETHERSCAN_API_URL) se aplică doar rețelei DEFAULT_NETWORK
+(implicit mainnet); celelalte rețele au nevoie de varianta `_<REȚEA>`. La
+conectare, `eth_chainId` al nodului trebuie să fie cel al rețelei.
+"""
+
+import os
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from abi_cache import AbiCache, get_abi_cache
+from abi_signatures import SignatureIndex, build_signature_index, resolve_call_args
+from etherscan_client import EtherscanClient
+from http_session import get_session
+from metrics import increment
+from multicall import EncodedCall, Multicall, decode_result, encode_call
+from proxy_resolver import DEFAULT_TTL as DEFAULT_PROXY_TTL, ProxyResolutionError, ProxyResolver
+from results_table import DEFAULT_DECIMALS
+from rpc_batch import JsonRpcBatcher
+
+ETHERSCAN_APIS = {
+    "mainnet": "https://api.etherscan.io/api",
+    "goerli": "https://api-goerli.etherscan.io/api",
+    "polygon": "https://api.polygonscan.com/api",
+}
+SUPPORTED_NETWORKS = tuple(ETHERSCAN_APIS)
+
+# eth_chainId așteptat de la nodul fiecărei rețele
+CHAIN_IDS = {
+    "mainnet": 1,
+    "goerli": 5,
+    "polygon": 137,
+}
+
+
+def default_network() -> str:
+    """Rețeaua căreia i se aplică variabilele generice (RPC_URL, ETHERSCAN_API_URL, ...)."""
+    return (os.getenv("DEFAULT_NETWORK") or "mainnet").lower()
+
+
+def network_setting(name: str, network: str) -> Optional[str]:
+    """Valoarea `<name>_<REȚEA>` sau, doar pentru rețeaua implicită, cea a lui `<name>`."""
+    value = os.getenv(f"{name}_{network.upper()}")
+    if value:
+        return value
+    return os.getenv(name) if network.lower() == default_network() else None
+
+
+def network_settings(name: str) -> Dict[str, str]:
+    """{rețea: valoare} pentru toate rețelele la care `<name>` se aplică."""
+    values = {network: network_setting(name, network) for network in SUPPORTED_NETWORKS}
+    return {network: value for network, value in values.items() if value}
+
+# decimals() pe un token ERC-20
+DECIMALS_SELECTOR = bytes.fromhex("313ce567")
+
+
+class Provider(ABC):
+    """Sursa endpoint-ului JSON-RPC pentru o rețea."""
+
+    name = "rpc"
+
+    @abstractmethod
+    def rpc_url(self, network: str) -> str:
+        """URL-ul JSON-RPC al rețelei; EnvironmentError dacă nu este configurat."""
+
+
+class InfuraProvider(Provider):
+    name = "infura"
+
+    URLS = {
+        "mainnet": "https://mainnet.infura.io/v3/{project_id}",
+        "goerli": "https://goerli.infura.io/v3/{project_id}",
+        "polygon": "https://polygon-mainnet.infura.io/v3/{project_id}",
+    }
+
+    def __init__(self, project_id: Optional[str]) -> None:
+        if not project_id:
+            raise EnvironmentError("INFURA_PROJECT_ID nu este setat")
+        self.project_id = project_id
+
+    def rpc_url(self, network: str) -> str:
+        return self.URLS[network].format(project_id=self.project_id)
+
+
+class JsonRpcProvider(Provider):
+    """URL-uri JSON-RPC oarecare, câte unul per rețea.
+
+    `urls` este un URL (pentru rețeaua implicită) sau {rețea: URL}; o rețea
+    fără URL este refuzată, nu citită de pe nodul altei rețele.
+    """
+
+    name = "rpc"
+    setting = "RPC_URL"
+
+    def __init__(self, urls: Union[str, Dict[str, str], None]) -> None:
+        if isinstance(urls, str):
+            urls = {default_network(): urls}
+        if not urls:
+            raise EnvironmentError(f"{self.setting} nu este setat")
+        self.urls = {network.lower(): url for network, url in urls.items()}
+
+    def rpc_url(self, network: str) -> str:
+        url = self.urls.get(network.lower())
+        if not url:
+            raise EnvironmentError(f"{self.setting}_{network.upper()} nu este setat")
+        return url
+
+
+class LocalNodeProvider(JsonRpcProvider):
+    """Nod local sau înlocuitor al acestuia (anvil, hardhat, serverul mock)."""
+
+    name = "local"
+    setting = "LOCAL_NODE_URL"
+    DEFAULT_URL = "http://127.0.0.1:8545"
+
+    def __init__(self, urls: Union[str, Dict[str, str], None] = None) -> None:
+        super().__init__(urls or self.DEFAULT_URL)
+
+
+PROVIDERS: Dict[str, Callable[[], Provider]] = {
+    "infura": lambda: InfuraProvider(os.getenv("INFURA_PROJECT_ID")),
+    "rpc": lambda: JsonRpcProvider(network_settings("RPC_URL")),
+    "local": lambda: LocalNodeProvider(network_settings("LOCAL_NODE_URL")),
+}
+
+
+def register_provider(name: str, factory: Callable[[], Provider]) -> None:
+    """Adaugă (sau înlocuiește) un provider selectabil prin RPC_PROVIDER."""
+    PROVIDERS[name.lower()] = factory
+
+
+def provider_from_env() -> Provider:
+    """Construiește providerul din RPC_PROVIDER (implicit `rpc` cu RPC_URL*, altfel `infura`)."""
+    kind = (os.getenv("RPC_PROVIDER")
+            or ("rpc" if os.getenv("RPC_URL") or network_settings("RPC_URL") else "infura")).lower()
+    factory = PROVIDERS.get(kind)
+    if factory is None:
+        raise ValueError(f"RPC_PROVIDER necunoscut: {kind} (disponibili: {', '.join(PROVIDERS)})")
+    return factory()
+
+
+class ChainBackend:
+    """Resursele de acces la lanț ale unei rețele, folosite de ambele analizoare.
+
+    Deține sesiunea HTTP (pool de conexiuni), clientul Etherscan, cache-ul de
+    ABI-uri și memoria `getsourcecode`, transportul batch JSON-RPC, Multicall3,
+    rezolvarea proxy-urilor și memoria `decimals()` a token-urilor. Dacă nodul nu răspunde la creare, `w3` și
+    `multicall` sunt None.
+    """
+
+    # Câte rezultate `getsourcecode` sunt păstrate în memorie
+    METADATA_MEMO_SIZE = 1024
+
+    def __init__(self, network: str = "mainnet", provider: Optional[Provider] = None,
+                 abi_cache: Optional[AbiCache] = None) -> None:
+        self.network = network.lower()
+        if self.network not in SUPPORTED_NETWORKS:
+            raise ValueError(f"Rețea nesuportată: {network}")
+        self.provider = provider or provider_from_env()
+        self.rpc_url = self.provider.rpc_url(self.network)
+        self.etherscan_key = os.getenv("ETHERSCAN_API_KEY")
+        self.etherscan_url = (network_setting("ETHERSCAN_API_URL", self.network)
+                              or ETHERSCAN_APIS[self.network])
+        self.session = get_session(self.network)
+        self.etherscan = EtherscanClient(self.etherscan_url, self.etherscan_key,
+                                         session=self.session)
+        # Un cache gol este fals (`__len__`), deci se compară explicit cu None
+        self.abi_cache = abi_cache if abi_cache is not None else get_abi_cache()
+        self.rpc_batcher = JsonRpcBatcher(
+            self.rpc_url, max_batch_size=int(os.getenv("RPC_MAX_BATCH_SIZE", "100")),
+            session=self.session
+        )
+        self.proxies = ProxyResolver(
+            self.rpc_batcher, ttl=float(os.getenv("PROXY_CACHE_TTL", DEFAULT_PROXY_TTL))
+        )
+        self._metadata: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._metadata_lock = threading.Lock()
+        # token -> decimals(); valoarea unui token nu se schimbă
+        self._decimals: Dict[str, int] = {}
+        self._decimals_lock = threading.Lock()
+        self.w3 = self._connect()
+        self.multicall = Multicall(self.w3, batcher=self.rpc_batcher) if self.w3 else None
+
+    def _connect(self):
+        # web3 se importă aici, nu la nivel de modul (~1 s)
+        from web3 import Web3
+        from rate_limiter import RateLimitedHTTPProvider
+
+        try:
+            w3 = Web3(RateLimitedHTTPProvider(self.rpc_url, session=self.session))
+            if not w3.is_connected():
+                raise ConnectionError("Nu s-a putut conecta la rețeaua Ethereum")
+            # Un URL configurat greșit nu trebuie să citească datele altei rețele
+            chain_id = w3.eth.chain_id
+            if chain_id != CHAIN_IDS[self.network]:
+                raise ConnectionError(f"Nodul raportează chainId {chain_id}, "
+                                      f"nu {CHAIN_IDS[self.network]} ({self.network})")
+            return w3
+        except Exception as e:
+            print(f"Eroare la conectarea Web3 ({self.provider.name}): {e}")
+            return None
+
+    # -- ABI și metadate -----------------------------------------------------
+
+    def fetch_contract_metadata(self, address: str) -> Optional[Dict[str, Any]]:
+        """Metadatele contractului (ABI, verificare, sursă, proxy) dintr-un singur `getsourcecode`
+
+        Rezultatul este memorat în proces, iar ABI-ul (sau rezultatul negativ
+        pentru contractele neverificate) ajunge în cache-ul persistent.
+        """
+        key = address.lower()
+        with self._metadata_lock:
+            if key in self._metadata:
+                self._metadata.move_to_end(key)
+                increment("cache_hits_total", cache="metadata")
+                return self._metadata[key]
+
+        try:
+            metadata = self.etherscan.get_contract_metadata(address)
+        except Exception as e:
+            print(f"Eroare la obținerea metadatelor contractului: {e}")
+            return None
+        if metadata is None:
+            print(f"Eroare Etherscan la getsourcecode pentru {address}")
+            return None
+
+        self.abi_cache.put(self.network, address, metadata["abi"])
+        with self._metadata_lock:
+            self._metadata[key] = metadata
+            while len(self._metadata) > self.METADATA_MEMO_SIZE:
+                self._metadata.popitem(last=False)
+        return metadata
+
+    def fetch_abi(self, address: str) -> Optional[List[Dict[str, Any]]]:
+        """ABI-ul contractului din cache sau de pe Etherscan; None dacă nu este verificat."""
+        found, abi = self.abi_cache.get(self.network, address)
+        if found:
+            return abi
+        metadata = self.fetch_contract_metadata(address)
+        return metadata["abi"] if metadata else None
+
+    def resolve_implementations(self, addresses: Sequence[str],
+                                codes: Optional[Dict[str, bytes]] = None
+                                ) -> Dict[str, Optional[str]]:
+        """Implementarea fiecărui proxy (EIP-1967, beacon, EIP-1167), într-un singur batch.
+
+        Adresele pentru care citirea a eșuat lipsesc din rezultat.
+        """
+        if self.proxies is None or self.w3 is None:
+            return {}
+        try:
+            return self.proxies.resolve_many(addresses, codes)
+        except Exception as e:
+            print(f"Eroare la rezolvarea proxy-urilor: {e}")
+            return {}
+
+    def resolve_implementation(self, address: str,
+                               code: Optional[bytes] = None) -> Optional[str]:
+        """Implementarea proxy-ului de la `address`, sau None dacă nu este proxy.
+
+        O citire eșuată ridică `ProxyResolutionError`, ca un proxy nerezolvat
+        să nu fie analizat (și scorat) după ABI-ul propriu.
+        """
+        if self.proxies is None:
+            return None
+        codes = {address.lower(): code} if code is not None else None
+        resolved = self.resolve_implementations([address], codes)
+        if address.lower() not in resolved:
+            raise ProxyResolutionError(f"Nu s-a putut determina implementarea proxy pentru {address}")
+        return resolved[address.lower()]
+
+    def fetch_logic_abi(self, address: str, implementation: Optional[str] = None
+                        ) -> Tuple[Optional[str], Optional[List[Dict[str, Any]]]]:
+        """ABI-ul codului executat la `address`: al implementării pentru proxy-uri.
+
+        Returnează (adresa al cărei ABI a fost folosit, ABI). ABI-ul
+        implementării este cache-uit sub adresa ei, deci toate proxy-urile care
+        o folosesc împart aceeași intrare; dacă implementarea nu este verificată
+        se revine la ABI-ul proxy-ului.
+        """
+        if implementation:
+            abi = self.fetch_abi(implementation)
+            if abi:
+                return implementation, abi
+        return address, self.fetch_abi(address)
+
+    def signature_index(self, address: str, abi: List[Dict[str, Any]]) -> SignatureIndex:
+        """Indexul de semnături salvat cu ABI-ul sau construit din acesta."""
+        signatures = self.abi_cache.get_signatures(self.network, address)
+        return signatures if signatures is not None else build_signature_index(abi)
+
+    # -- Apeluri view --------------------------------------------------------
+
+    def contract(self, address: str, abi: List[Dict[str, Any]]):
+        from web3 import Web3
+
+        if self.w3 is None:
+            raise ConnectionError("Nu există conexiune RPC")
+        return self.w3.eth.contract(address=Web3.to_checksum_address(address), abi=abi)
+
+    @staticmethod
+    def encode_view(contract, signatures: SignatureIndex, function_name: str,
+                    address: Optional[str] = None,
+                    prefer_address: bool = True) -> Optional[EncodedCall]:
+        """Codifică apelul view `function_name`, cu overload-ul ales din `signatures`.
+
+        Returnează None dacă ABI-ul nu are o variantă view/pure apelabilă.
+        """
+        args = resolve_call_args(signatures, function_name, address, prefer_address)
+        return encode_call(contract, function_name, args) if args is not None else None
+
+    def call_views(self, calls: Sequence[EncodedCall]) -> List[Tuple[bool, Any]]:
+        """Execută apelurile și returnează (succes, valoare decodată) pentru fiecare.
+
+        Toate apelurile pleacă printr-un singur `aggregate3` (Multicall3); dacă
+        acesta nu este disponibil, ca `eth_call` separate într-un batch JSON-RPC.
+        Un apel eșuat nu afectează restul.
+        """
+        if not calls:
+            return []
+        if self.multicall is not None:
+            try:
+                return self.multicall.aggregate(calls)
+            except Exception as e:
+                print(f"Multicall indisponibil, revin la batch eth_call: {e}")
+        if self.w3 is None or self.rpc_batcher is None:
+            return [(False, None)] * len(calls)
+        try:
+            raw = self.rpc_batcher.eth_call_many(calls)
+        except Exception as e:
+            print(f"Eroare la apelurile eth_call: {e}")
+            return [(False, None)] * len(calls)
+        return [decode_result(self.w3.codec, call, data is not None, data)
+                for call, data in zip(calls, raw)]
+
+    def token_decimals(self, tokens: Iterable[Optional[str]]) -> Dict[str, int]:
+        """`decimals()` pentru fiecare token, indexat după adresa cu litere mici.
+
+        Fiecare token este citit o singură dată per backend, iar toate
+        token-urile noi pleacă într-un singur apel agregat. Un token fără
+        `decimals()` (sau un apel eșuat) primește DEFAULT_DECIMALS, fără a fi
+        memorat.
+        """
+        from web3 import Web3
+
+        wanted = list(dict.fromkeys(token.lower() for token in tokens if token))
+        with self._decimals_lock:
+            found = {token: self._decimals[token] for token in wanted if token in self._decimals}
+        missing = [token for token in wanted if token not in found]
+        increment("cache_hits_total", len(found), cache="decimals")
+        increment("cache_misses_total", len(missing), cache="decimals")
+        if missing:
+            calls = [EncodedCall(Web3.to_checksum_address(token), DECIMALS_SELECTOR, ["uint8"])
+                     for token in missing]
+            for token, (ok, value) in zip(missing, self.call_views(calls)):
+                if ok and isinstance(value, int):
+                    found[token] = value
+            with self._decimals_lock:
+                self._decimals.update((token, found[token]) for token in missing if token in found)
+        return {token: found.get(token, DEFAULT_DECIMALS) for token in wanted}
@@ -0,0 +1,100 @@
+"""Agregarea rezultatelor înainte de desenare, pentru grafice de dimensiune constantă.
+
+Un grafic cu o bară sau o felie per contract produce un payload Plotly care
+crește liniar cu portofoliul și devine greu de randat la mii de contracte.
+Graficele primesc în schimb date agregate, de dimensiune fixă:
+- histograma scorurilor, pe intervale de `SCORE_BIN_WIDTH` puncte;
+- primele `top_n` contracte după o sumă, plus o intrare "Altele" cu restul;
+- numărul de contracte per (rețea, nivel de risc).
+
+`aggregate_results` calculează toate agregatele dintr-o singură grupare a
+tabelului columnar (`results_table.build_results_table`). pandas se importă
+abia la prima agregare.
+"""
+
+import os
+from typing import TYPE_CHECKING, Dict, Optional, Sequence
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Câte contracte apar individual în graficele de distribuție
+DEFAULT_TOP_N = int(os.getenv("CHART_TOP_N", "15"))
+SCORE_BIN_WIDTH = 10
+MAX_SCORE = 100
+OTHER_LABEL = "Altele"
+
+
+def score_bin_labels(width: int = SCORE_BIN_WIDTH) -> list:
+    """Etichetele intervalelor de scor, ex. `0-9`, ..., `90-100` (ultimul include 100)."""
+    starts = list(range(0, MAX_SCORE, width))
+    return [f"{s}-{s + width - 1}" for s in starts[:-1]] + [f"{starts[-1]}-{MAX_SCORE}"]
+
+
+def score_bins(scores: "pd.Series", width: int = SCORE_BIN_WIDTH) -> "pd.Series":
+    """Intervalul fiecărui scor, ca `category` ordonată."""
+    import numpy as np
+    import pandas as pd
+
+    labels = score_bin_labels(width)
+    index = np.clip(pd.to_numeric(scores, errors="coerce").fillna(0).to_numpy() // width,
+                    0, len(labels) - 1).astype(int)
+    return pd.Series(pd.Categorical.from_codes(index, categories=labels, ordered=True),
+                     index=scores.index)
+
+
+def score_histogram(table: "pd.DataFrame", score: str = "security_score",
+                    color: Optional[str] = None, width: int = SCORE_BIN_WIDTH) -> "pd.DataFrame":
+    """Numărul de contracte per interval de scor (și per valoare a coloanei `color`)."""
+    keys = [score_bins(table[score], width).rename("score_range")]
+    if color is not None:
+        keys.append(table[color])
+    counts = table.groupby(keys, observed=False).size()
+    frame = counts.rename("contracts").reset_index()
+    return frame if color is None else frame[frame["contracts"] > 0]
+
+
+def top_n_with_other(table: "pd.DataFrame", value: str, label: str,
+                     n: int = DEFAULT_TOP_N, other_label: str = OTHER_LABEL) -> "pd.DataFrame":
+    """Primele `n` rânduri după `value`, plus un rând cu suma celorlalte.
+
+    Rezultatul are coloanele `label`, `value` și `contracts` (câte contracte
+    reprezintă rândul); rândul "Altele" lipsește dacă nu rămâne nimic.
+    """
+    import pandas as pd
+
+    values = pd.to_numeric(table[value], errors="coerce").fillna(0.0)
+    top_index = values.nlargest(n).index
+    top = pd.DataFrame({label: table[label].loc[top_index].astype(str).to_numpy(),
+                        value: values.loc[top_index].to_numpy(), "contracts": 1})
+    rest = len(values) - len(top_index)
+    if rest > 0:
+        other = pd.DataFrame({label: [f"{other_label} ({rest})"],
+                              value: [values.sum() - top[value].sum()], "contracts": [rest]})
+        top = pd.concat([top, other], ignore_index=True)
+    return top
+
+
+def aggregate_results(table: "pd.DataFrame", top_n: int = DEFAULT_TOP_N,
+                      value: str = "vested_amount", label: str = "name",
+                      by: Sequence[str] = ("network", "risk_level")) -> Dict[str, "pd.DataFrame"]:
+    """Toate agregatele graficelor, dintr-o singură grupare a tabelului.
+
+    Returnează `scores` (interval de scor x nivel de risc), `rollup` (rețea x
+    nivel de risc) și `top` (primele `top_n` contracte după `value` + "Altele").
+    Coloanele din `by` care lipsesc din tabel sunt ignorate.
+    """
+    by = [column for column in by if column in table.columns]
+    keys = [table[column].astype(object).fillna("-") for column in by]
+    keys.append(score_bins(table["security_score"]).rename("score_range"))
+    cube = table.groupby(keys, observed=True).size().rename("contracts").reset_index()
+
+    risk = [c for c in by if c == "risk_level"]
+    scores = cube.groupby(["score_range", *risk], observed=True)["contracts"].sum().reset_index()
+    rollup = (cube.groupby(by, observed=True)["contracts"].sum().reset_index()
+              if by else cube.iloc[0:0])
+    return {
+        "scores": scores,
+        "rollup": rollup,
+        "top": top_n_with_other(table, value, label, top_n),
+    }
@@ -0,0 +1,166 @@
+"""Indexul familiilor de clone: rezultatul analizei statice, indexat după hash-ul codului runtime.
+
+Portofoliile de `VestingWallet` create dintr-un factory (clone EIP-1167 sau
+contracte cu bytecode identic) au același cod runtime, deci același ABI,
+aceleași funcții și același scor. După analiza completă a primului membru al
+unei familii, ceilalți refolosesc profilul salvat aici și nu mai cer nimic de
+la Etherscan; rămân doar apelurile per instanță (cantitățile de token-uri).
+
+Cheia include și adresa implementării: proxy-urile EIP-1967 au de obicei
+același bytecode, dar logica lor diferă după implementarea din slot. O
+intrare este salvată doar pentru un ABI obținut și o implementare rezolvată
+(un proxy nerezolvat nu ajunge aici, vezi `ChainBackend.resolve_implementation`).
+Intrările expiră după `ttl` (o implementare neverificată poate fi verificată
+ulterior), iar cele scrise cu alt `PROFILE_VERSION` sunt recalculate.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Callable, Dict, List, Optional
+
+from metrics import increment
+
+DEFAULT_CLONE_INDEX_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "vesting_analyzer", "clone_index.sqlite3"
+)
+DEFAULT_TTL = 30 * 24 * 3600
+# Se incrementează când se schimbă conținutul profilului
+PROFILE_VERSION = 1
+
+Profile = Dict[str, Any]
+
+
+def code_hash(code: bytes, implementation: Optional[str] = None) -> str:
+    """Cheia familiei: sha256 peste codul runtime și adresa implementării (dacă există)."""
+    digest = hashlib.sha256(bytes(code))
+    if implementation:
+        digest.update(bytes.fromhex(implementation.lower()[2:]))
+    return digest.hexdigest()
+
+
+class CloneIndex:
+    """Profilurile (ABI, funcții, clasificare, scor) indexate după (rețea, hash cod).
+
+    Un profil este un dict cu cheile `abi_address`, `abi`, `functions`,
+    `vesting_functions`, `is_verified`, `security_score` și `weights`
+    (ponderile cu care a fost calculat scorul).
+    """
+
+    def __init__(self, path: str = DEFAULT_CLONE_INDEX_PATH, ttl: float = DEFAULT_TTL,
+                 clock: Callable[[], float] = time.time) -> None:
+        self.path = path
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Un singur calcul în curs per familie (vezi `get_or_compute`): familie ->
+        # [lacăt, câte thread-uri îl folosesc]; intrarea dispare cu ultimul thread
+        self._family_locks: Dict[str, List[Any]] = {}
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS clone_families ("
+                " network TEXT NOT NULL,"
+                " code_hash TEXT NOT NULL,"
+                " abi_address TEXT NOT NULL,"
+                " abi BLOB NOT NULL,"
+                " profile TEXT NOT NULL,"
+                " stored_at REAL NOT NULL DEFAULT 0,"
+                " version INTEGER NOT NULL DEFAULT 0,"
+                " PRIMARY KEY (network, code_hash))"
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(clone_families)")}
+            for column in ("stored_at REAL", "version INTEGER"):
+                if column.split()[0] not in columns:
+                    self._conn.execute(f"ALTER TABLE clone_families ADD COLUMN {column}"
+                                       " NOT NULL DEFAULT 0")
+
+    def _load(self, network: str, key: str) -> Optional[Profile]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT abi_address, abi, profile FROM clone_families"
+                " WHERE network = ? AND code_hash = ? AND version = ? AND stored_at >= ?",
+                (network.lower(), key, PROFILE_VERSION, self._clock() - self.ttl),
+            ).fetchone()
+        if row is None:
+            return None
+        abi_address, blob, profile = row
+        return {**json.loads(profile), "abi_address": abi_address,
+                "abi": json.loads(zlib.decompress(blob))}
+
+    def get(self, network: str, key: str) -> Optional[Profile]:
+        profile = self._load(network, key)
+        increment("cache_hits_total" if profile is not None else "cache_misses_total",
+                  cache="clone")
+        return profile
+
+    def put(self, network: str, key: str, profile: Profile) -> None:
+        stored = {k: v for k, v in profile.items() if k not in ("abi_address", "abi")}
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO clone_families"
+                " (network, code_hash, abi_address, abi, profile, stored_at, version)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (network.lower(), key, profile["abi_address"].lower(),
+                 zlib.compress(json.dumps(profile["abi"]).encode()), json.dumps(stored),
+                 self._clock(), PROFILE_VERSION),
+            )
+
+    def get_or_compute(self, network: str, key: str,
+                       compute: Callable[[], Profile]) -> Profile:
+        """Profilul salvat sau, la prima întâlnire a familiei, cel calculat de `compute`.
+
+        Analizele concurente ale aceleiași familii așteaptă primul calcul în
+        loc să repete cererile Etherscan. O excepție din `compute` nu salvează
+        nimic și este propagată.
+        """
+        profile = self._load(network, key)
+        if profile is None:
+            family = f"{network.lower()}:{key}"
+            with self._lock:
+                entry = self._family_locks.setdefault(family, [threading.Lock(), 0])
+                entry[1] += 1
+            try:
+                with entry[0]:
+                    profile = self._load(network, key)
+                    if profile is None:
+                        increment("cache_misses_total", cache="clone")
+                        profile = compute()
+                        self.put(network, key, profile)
+                        return profile
+            finally:
+                with self._lock:
+                    entry[1] -= 1
+                    if not entry[1]:
+                        del self._family_locks[family]
+        increment("cache_hits_total", cache="clone")
+        return profile
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM clone_families").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM clone_families")
+
+
+_indexes: Dict[str, CloneIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_clone_index(path: Optional[str] = None) -> CloneIndex:
+    """Returnează indexul partajat, configurat prin CLONE_INDEX_PATH și CLONE_INDEX_TTL."""
+    path = path or os.getenv("CLONE_INDEX_PATH") or DEFAULT_CLONE_INDEX_PATH
+    with _indexes_lock:
+        index = _indexes.get(path)
+        if index is None:
+            ttl = float(os.getenv("CLONE_INDEX_TTL", DEFAULT_TTL))
+            index = _indexes[path] = CloneIndex(path, ttl=ttl)
+        return index
@@ -0,0 +1,81 @@
+"""Client Etherscan comun, cu limitare de rată și backoff adaptiv."""
+
+import json
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from http_session import create_session
+from metrics import increment
+from rate_limiter import get_rate_limiter
+
+if TYPE_CHECKING:
+    import requests
+
+
+class EtherscanClient:
+    """Trimite cereri către API-ul Etherscan respectând cota configurată."""
+
+    def __init__(self, api_url: str, api_key: str = None,
+                 session: Optional["requests.Session"] = None,
+                 max_retries: int = 5) -> None:
+        self.api_url = api_url
+        self.api_key = api_key
+        self.session = session or create_session()
+        self.max_retries = max_retries
+        self.rate_limiter = get_rate_limiter(api_url, "etherscan")
+
+    @staticmethod
+    def is_rate_limited(data: Dict[str, Any]) -> bool:
+        """Detectează mesajul "Max rate limit reached" din răspunsurile Etherscan."""
+        if data.get("status") == "1":
+            return False
+        result = data.get("result")
+        return isinstance(result, str) and "rate limit" in result.lower()
+
+    def get(self, **params: Any) -> Dict[str, Any]:
+        """Execută o cerere GET și returnează răspunsul JSON decodat.
+
+        La depășirea cotei rata limitatorului este redusă și cererea este
+        reîncercată de cel mult `max_retries` ori.
+        """
+        params = {**params, "apikey": self.api_key}
+        for _ in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            response = self.session.get(self.api_url, params=params)
+            response.raise_for_status()
+            data = response.json()
+            if not self.is_rate_limited(data):
+                self.rate_limiter.record_success()
+                return data
+            self.rate_limiter.backoff()
+            increment("etherscan_retries_total")
+        return data
+
+    def get_contract_metadata(self, address: str) -> Optional[Dict[str, Any]]:
+        """Obține printr-un singur apel `getsourcecode` ABI-ul, starea de
+        verificare, metadatele sursei și informațiile de proxy.
+
+        Returnează None dacă cererea a eșuat; pentru un contract neverificat
+        `abi` este None și `is_verified` este False.
+        """
+        data = self.get(module="contract", action="getsourcecode", address=address)
+        if data.get("status") != "1" or not data.get("result"):
+            return None
+
+        entry = data["result"][0]
+        is_verified = len(entry.get("SourceCode", "")) > 0
+        abi = None
+        if is_verified:
+            try:
+                abi = json.loads(entry.get("ABI", ""))
+            except ValueError:
+                abi = None
+        return {
+            "abi": abi,
+            "is_verified": is_verified,
+            "contract_name": entry.get("ContractName", ""),
+            "compiler_version": entry.get("CompilerVersion", ""),
+            "optimization_used": entry.get("OptimizationUsed") == "1",
+            "license": entry.get("LicenseType", ""),
+            "is_proxy": entry.get("Proxy") == "1",
+            "implementation": entry.get("Implementation") or None,
+        }
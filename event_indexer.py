@@ -0,0 +1,402 @@
+"""Indexator local pentru istoricul de eliberări ale contractelor de vesting.
+
+Scanează cu `eth_getLogs` evenimentele `TokensReleased`, `ERC20Released` și
+`EtherReleased` emise de contracte, plus transferurile ERC-20 către și de la
+ele, și le salvează într-un index SQLite. Pentru fiecare contract se reține
+ultimul bloc indexat, deci rulările ulterioare scanează doar blocurile noi.
+Se indexează doar blocurile confirmate (cel puțin `DEFAULT_CONFIRMATIONS` sub
+vârful lanțului), ca un bloc reorganizat să nu rămână în index și să fie
+scanat din nou în varianta lui finală.
+
+Intervalul de blocuri este împărțit în segmente scanate în paralel. Fiecare
+segment își ajustează dimensiunea ferestrei: o înjumătățește când nodul
+refuză un răspuns prea mare și o dublează cât timp răspunsurile sunt mici.
+Limitarea de rată și timeout-urile nu micșorează fereastra: limitatorul RPC
+își reduce rata, iar aceeași fereastră este reîncercată.
+
+Exemplu:
+    python event_indexer.py adrese.txt --workers 8 --export evenimente.parquet
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from dotenv import load_dotenv
+
+from rpc_batch import JsonRpcError
+from vesting_history import DEFAULT_CONFIRMATIONS
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+DEFAULT_EVENT_INDEX_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "vesting_analyzer", "events.sqlite3"
+)
+
+# keccak al semnăturilor evenimentelor indexate
+RELEASE_TOPICS = {
+    "0xc7798891864187665ac6dd119286e44ec13f014527aeeb2b8eb3fd413df93179": "TokensReleased",
+    "0xc0e523490dd523c33b1878c9eb14ff46991e3f5b2cd33710918618f2a39cba1b": "ERC20Released",
+    "0xda9d4e5f101b8b9b1c5b76d0c5a9f7923571acfc02376aa076b75a8c080c956b": "EtherReleased",
+}
+TRANSFER_TOPIC = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+
+# Câte adrese intră într-un filtru `eth_getLogs`
+ADDRESS_CHUNK_SIZE = 100
+
+# Mesajele cu care providerii refuză un rezultat `eth_getLogs` prea mare
+# (geth/Infura, Alchemy, Polygon/BSC, Ankr, QuickNode)
+RESULT_LIMIT_MARKERS = ("query returned more than", "log response size exceeded",
+                        "exceed maximum block range", "block range is too",
+                        "eth_getlogs is limited to")
+# Infura folosește -32005 și pentru depășirea cotei, deci mesajul decide întâi
+RESULT_LIMIT_CODES = (-32005,)
+# Erori trecătoare: se reîncearcă aceeași fereastră, după reducerea ratei
+TRANSIENT_MARKERS = ("rate limit", "request rate exceeded", "request count exceeded",
+                     "too many requests", "timeout", "timed out")
+TRANSIENT_RETRIES = 3
+
+
+class LogLimitExceeded(Exception):
+    """Nodul a refuzat intervalul cerut pentru că rezultatul ar fi prea mare."""
+
+
+def is_transient_error(error: Exception) -> bool:
+    message = str(error).lower()
+    return getattr(error, "code", None) == 429 or any(m in message for m in TRANSIENT_MARKERS)
+
+
+def is_result_limit_error(error: Exception) -> bool:
+    if is_transient_error(error):
+        return False
+    if getattr(error, "code", None) in RESULT_LIMIT_CODES:
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in RESULT_LIMIT_MARKERS)
+
+
+def _address_topic(address: str) -> str:
+    return "0x" + address.lower()[2:].rjust(64, "0")
+
+
+def _topic_address(topic: str) -> str:
+    return "0x" + topic[-40:].lower()
+
+
+def _data_words(data: str) -> List[str]:
+    data = (data or "0x")[2:]
+    return [data[i:i + 64] for i in range(0, len(data), 64)]
+
+
+def decode_log(log: Dict[str, Any], contracts: Iterable[str]) -> List[Dict[str, Any]]:
+    """Transformă un log într-un rând de index pentru fiecare contract implicat."""
+    topics = [t.lower() for t in log.get("topics", [])]
+    if not topics:
+        return []
+    emitter = log.get("address", "").lower()
+    words = _data_words(log.get("data", "0x"))
+    base = {
+        "block_number": int(log["blockNumber"], 16),
+        "tx_hash": log.get("transactionHash", ""),
+        "log_index": int(log.get("logIndex", "0x0"), 16),
+    }
+    members = set(contracts)
+
+    event = RELEASE_TOPICS.get(topics[0])
+    if event is not None:
+        if emitter not in members or not words:
+            return []
+        token = None
+        if event != "EtherReleased":
+            # `ERC20Released` are tokenul indexat; `TokensReleased` îl are în date
+            token = _topic_address(topics[1]) if len(topics) > 1 else _topic_address(words[0])
+        return [{**base, "contract": emitter, "event": event, "token": token,
+                 "sender": emitter, "recipient": None, "amount": str(int(words[-1], 16))}]
+
+    if topics[0] == TRANSFER_TOPIC and len(topics) >= 3 and words:
+        sender, recipient = _topic_address(topics[1]), _topic_address(topics[2])
+        row = {**base, "event": "Transfer", "token": emitter, "sender": sender,
+               "recipient": recipient, "amount": str(int(words[0], 16))}
+        return [{**row, "contract": c} for c in dict.fromkeys((sender, recipient)) if c in members]
+    return []
+
+
+class EventIndex:
+    """Stocarea SQLite a log-urilor indexate și a ultimului bloc scanat per contract."""
+
+    def __init__(self, path: str = DEFAULT_EVENT_INDEX_PATH) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS logs ("
+                " network TEXT NOT NULL,"
+                " contract TEXT NOT NULL,"
+                " block_number INTEGER NOT NULL,"
+                " tx_hash TEXT NOT NULL,"
+                " log_index INTEGER NOT NULL,"
+                " event TEXT NOT NULL,"
+                " token TEXT,"
+                " sender TEXT,"
+                " recipient TEXT,"
+                # uint256 nu încape în INTEGER; suma se păstrează ca text zecimal
+                " amount TEXT NOT NULL,"
+                " PRIMARY KEY (network, contract, tx_hash, log_index))"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS logs_by_block ON logs (network, contract, block_number)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cursors ("
+                " network TEXT NOT NULL,"
+                " contract TEXT NOT NULL,"
+                " last_block INTEGER NOT NULL,"
+                " PRIMARY KEY (network, contract))"
+            )
+
+    def cursors(self, network: str, contracts: Iterable[str]) -> Dict[str, int]:
+        """Returnează ultimul bloc indexat pentru contractele deja scanate."""
+        contracts = [c.lower() for c in contracts]
+        found: Dict[str, int] = {}
+        with self._lock:
+            for start in range(0, len(contracts), 500):
+                chunk = contracts[start:start + 500]
+                rows = self._conn.execute(
+                    "SELECT contract, last_block FROM cursors WHERE network = ?"
+                    f" AND contract IN ({','.join('?' * len(chunk))})",
+                    (network, *chunk),
+                ).fetchall()
+                found.update(rows)
+        return found
+
+    def add_logs(self, network: str, rows: Sequence[Dict[str, Any]]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO logs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(network, r["contract"], r["block_number"], r["tx_hash"], r["log_index"],
+                  r["event"], r["token"], r["sender"], r["recipient"], r["amount"])
+                 for r in rows],
+            )
+
+    def advance(self, network: str, contracts: Iterable[str], block_number: int) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO cursors VALUES (?, ?, ?) ON CONFLICT (network, contract)"
+                " DO UPDATE SET last_block = MAX(last_block, excluded.last_block)",
+                [(network, c.lower(), block_number) for c in contracts],
+            )
+
+    def history(self, network: str, contract: str) -> "pd.DataFrame":
+        """Log-urile unui contract, în ordinea blocurilor."""
+        import pandas as pd
+
+        with self._lock:
+            return pd.read_sql_query(
+                "SELECT block_number, tx_hash, log_index, event, token, sender, recipient, amount"
+                " FROM logs WHERE network = ? AND contract = ?"
+                " ORDER BY block_number, log_index",
+                self._conn, params=(network, contract.lower()),
+            )
+
+    def export_parquet(self, network: str, path: str) -> None:
+        """Scrie toate log-urile rețelei într-un fișier Parquet (necesită `pyarrow`)."""
+        import pandas as pd
+
+        with self._lock:
+            frame = pd.read_sql_query(
+                "SELECT * FROM logs WHERE network = ? ORDER BY contract, block_number, log_index",
+                self._conn, params=(network,),
+            )
+        frame.to_parquet(path, index=False)
+
+
+class EventIndexer:
+    """Scanează log-urile contractelor și actualizează un `EventIndex`."""
+
+    def __init__(self, batcher, index: EventIndex, network: str,
+                 initial_chunk: int = 2000, max_chunk: int = 100000,
+                 target_results: int = 2000, max_workers: int = 4,
+                 confirmations: int = DEFAULT_CONFIRMATIONS) -> None:
+        self.batcher = batcher
+        self.index = index
+        self.network = network.lower()
+        self.initial_chunk = initial_chunk
+        self.max_chunk = max_chunk
+        self.target_results = target_results
+        self.max_workers = max(int(max_workers), 1)
+        self.confirmations = confirmations
+
+    def _fetch_logs(self, addresses: List[str], from_block: int,
+                    to_block: int) -> List[Dict[str, Any]]:
+        window = {"fromBlock": hex(from_block), "toBlock": hex(to_block)}
+        topics = [_address_topic(a) for a in addresses]
+        # Cele trei filtre pleacă într-un singur batch JSON-RPC
+        results = self.batcher.call_many([
+            ("eth_getLogs", [{**window, "address": addresses,
+                              "topics": [list(RELEASE_TOPICS)]}]),
+            ("eth_getLogs", [{**window, "topics": [TRANSFER_TOPIC, topics]}]),
+            ("eth_getLogs", [{**window, "topics": [TRANSFER_TOPIC, None, topics]}]),
+        ])
+        logs: List[Dict[str, Any]] = []
+        for result in results:
+            if isinstance(result, JsonRpcError):
+                if is_result_limit_error(result):
+                    raise LogLimitExceeded(str(result))
+                raise result
+            logs.extend(result or [])
+        return logs
+
+    def scan_segment(self, addresses: List[str], from_block: int,
+                     to_block: int) -> List[Dict[str, Any]]:
+        """Scanează un interval cu fereastră adaptivă; returnează rândurile decodate."""
+        rows: List[Dict[str, Any]] = []
+        size = self.initial_chunk
+        block = from_block
+        retries = 0
+        while block <= to_block:
+            stop = min(block + size - 1, to_block)
+            try:
+                logs = self._fetch_logs(addresses, block, stop)
+            except LogLimitExceeded:
+                if size == 1:
+                    raise
+                size = max(size // 2, 1)
+                continue
+            except JsonRpcError as e:
+                if not is_transient_error(e) or retries >= TRANSIENT_RETRIES:
+                    raise
+                retries += 1
+                rate_limiter = getattr(self.batcher, "rate_limiter", None)
+                if rate_limiter is not None:
+                    rate_limiter.backoff()
+                continue
+            retries = 0
+            for log in logs:
+                rows.extend(decode_log(log, addresses))
+            block = stop + 1
+            if len(logs) < self.target_results // 2:
+                size = min(size * 2, self.max_chunk)
+            elif len(logs) > self.target_results:
+                size = max(size // 2, 1)
+        return rows
+
+    def _segments(self, from_block: int, to_block: int) -> List[Tuple[int, int]]:
+        total = to_block - from_block + 1
+        count = min(self.max_workers, max(total // self.initial_chunk, 1))
+        step = -(-total // count)
+        return [(start, min(start + step - 1, to_block))
+                for start in range(from_block, to_block + 1, step)]
+
+    def update(self, contracts: Iterable[str], head_block: int,
+               start_blocks: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+        """Indexează log-urile noi până la `head_block - confirmations` inclusiv.
+
+        Contractele fără cursor încep de la blocul din `start_blocks`
+        (ex. blocul de creare) sau de la 0. Cursorul unui grup avansează doar
+        dacă toate segmentele lui au fost scanate; log-urile salvate deja
+        sunt ignorate la o nouă scanare.
+        """
+        to_block = head_block - self.confirmations
+        contracts = list(dict.fromkeys(c.lower() for c in contracts))
+        start_blocks = {k.lower(): v for k, v in (start_blocks or {}).items()}
+        cursors = self.index.cursors(self.network, contracts)
+
+        groups: Dict[int, List[str]] = {}
+        for contract in contracts:
+            if contract in cursors:
+                from_block = cursors[contract] + 1
+            else:
+                from_block = start_blocks.get(contract, 0)
+            if from_block <= to_block:
+                groups.setdefault(from_block, []).append(contract)
+
+        tasks = []
+        for from_block, members in groups.items():
+            for start in range(0, len(members), ADDRESS_CHUNK_SIZE):
+                chunk = members[start:start + ADDRESS_CHUNK_SIZE]
+                for segment in self._segments(from_block, to_block):
+                    tasks.append((tuple(chunk), segment))
+
+        stats = {"contracts": len(contracts), "scanned": 0, "logs": 0, "errors": 0}
+        failed = set()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self.scan_segment, list(chunk), *segment): chunk
+                for chunk, segment in tasks
+            }
+            for future in as_completed(futures):
+                try:
+                    rows = future.result()
+                except Exception as e:
+                    print(f"Eroare la scanarea log-urilor: {e}")
+                    failed.update(futures[future])
+                    stats["errors"] += 1
+                    continue
+                self.index.add_logs(self.network, rows)
+                stats["logs"] += len(rows)
+
+        done = [c for members in groups.values() for c in members if c not in failed]
+        self.index.advance(self.network, done, to_block)
+        stats["scanned"] = len(done)
+        return stats
+
+
+_indexes: Dict[str, EventIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_event_index(path: Optional[str] = None) -> EventIndex:
+    """Returnează indexul partajat, configurat prin EVENT_INDEX_PATH."""
+    path = path or os.getenv("EVENT_INDEX_PATH") or DEFAULT_EVENT_INDEX_PATH
+    with _indexes_lock:
+        index = _indexes.get(path)
+        if index is None:
+            index = _indexes[path] = EventIndex(path)
+        return index
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Indexează istoricul de eliberări al contractelor")
+    parser.add_argument("addresses", nargs="+",
+                        help="adrese de contracte sau un fișier text cu câte o adresă pe linie")
+    parser.add_argument("--network", default="mainnet")
+    parser.add_argument("--index", help="baza SQLite a indexului (implicit EVENT_INDEX_PATH)")
+    parser.add_argument("--workers", type=int, default=4, help="segmente scanate în paralel")
+    parser.add_argument("--export", help="scrie log-urile rețelei într-un fișier .parquet")
+    args = parser.parse_args(argv)
+
+    addresses: List[str] = []
+    for item in args.addresses:
+        if os.path.isfile(item):
+            with open(item, encoding="utf-8") as handle:
+                addresses.extend(line.strip() for line in handle if line.strip())
+        else:
+            addresses.append(item)
+
+    load_dotenv()
+    from web3_integration import create_analyzer_instance
+
+    analyzer = create_analyzer_instance(args.network)
+    if analyzer is None:
+        print("Nu s-a putut inițializa analizorul. Verifică cheile API.", file=sys.stderr)
+        return 1
+
+    index = get_event_index(args.index)
+    stats = analyzer.index_release_history(addresses, index, args.workers)
+    if args.export:
+        index.export_parquet(analyzer.network, args.export)
+    print(json.dumps(stats))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
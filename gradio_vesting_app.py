@@ -1,18 +1,28 @@
-import pandas as pd
-import plotly.express as px
+"""Rapoarte, grafice și tabele pentru rezultatele analizei.
+
+Funcțiile primesc tabelul columnar al rulării (`results_table.build_results_table`),
+construit o singură dată și folosit de toate ieșirile; o listă de rezultate
+este transformată în tabel la intrare. Graficele desenează agregate de
+dimensiune fixă (`chart_data.aggregate_results`), nu câte un element per
+contract.
+
+pandas și plotly se importă abia la construirea primului grafic, astfel încât
+procesele care nu afișează nimic (CLI, workeri) nu plătesc costul lor.
+"""
+
+from chart_data import aggregate_results, score_bin_labels
+from results_table import as_results_table
 
 
 def generate_summary_report(results):
     """Returnează un scurt raport sumar pentru rezultatele analizelor."""
-    if not results:
+    table = as_results_table(results)
+    if table.empty:
         return "Nu au fost returnate rezultate."
 
-    total = len(results)
-    avg_score = sum(r.get("security_score", 0) for r in results) / total
-    risk_counts = {}
-    for r in results:
-        risk = r.get("risk_level", "NECUNOSCUT")
-        risk_counts[risk] = risk_counts.get(risk, 0) + 1
+    total = len(table)
+    avg_score = table["security_score"].mean()
+    risk_counts = table["risk_level"].astype(object).fillna("NECUNOSCUT").value_counts(sort=False)
 
     lines = [
         f"Contracte analizate: {total}",
@@ -25,50 +35,104 @@ def generate_summary_report(results):
     return "\n".join(lines)
 
 
-def create_security_scores_chart(results):
-    """Generează un grafic cu scorurile de securitate pentru fiecare contract."""
-    df = pd.DataFrame(results)
-    if df.empty:
+def _chart_aggregates(table, aggregates):
+    """Agregatele primite (calculate o dată per rulare) sau calculate acum din tabel."""
+    return aggregates if aggregates is not None else aggregate_results(table)
+
+
+def create_security_scores_chart(results, aggregates=None):
+    """Generează histograma scorurilor de securitate, colorată după nivelul de risc.
+
+    Numărul de bare este fix (un interval de scor x nivel de risc), oricâte
+    contracte ar avea rularea.
+    """
+    import plotly.express as px
+
+    table = as_results_table(results)
+    if table.empty:
         return px.bar(title="Fără date")
-    fig = px.bar(df, x="name", y="security_score", title="Scoruri de securitate")
-    fig.update_layout(yaxis_range=[0, 100])
+    scores = _chart_aggregates(table, aggregates)["scores"]
+    color = "risk_level" if "risk_level" in scores.columns else None
+    fig = px.bar(scores, x="score_range", y="contracts", color=color,
+                 category_orders={"score_range": score_bin_labels()},
+                 labels={"score_range": "Scor de securitate", "contracts": "Contracte",
+                         "risk_level": "Nivel de risc"},
+                 title="Scoruri de securitate")
     return fig
 
 
-def create_token_distribution_chart(results):
-    """Generează un grafic cu distribuția token-urilor vesting."""
-    df = pd.DataFrame(results)
-    if df.empty:
+def create_token_distribution_chart(results, aggregates=None):
+    """Generează un grafic cu distribuția token-urilor vesting.
+
+    Apar individual primele `CHART_TOP_N` contracte; restul sunt însumate
+    într-o singură felie "Altele".
+    """
+    import plotly.express as px
+
+    table = as_results_table(results)
+    if table.empty:
         return px.pie(title="Fără date")
-    values = "vested_amount" if "vested_amount" in df.columns else df.columns[0]
-    fig = px.pie(df, values=values, names="name", title="Distribuția token-urilor")
+    # Sumele sunt în unități de token, convertite cu `decimals()` fiecărui token
+    top = _chart_aggregates(table, aggregates)["top"]
+    fig = px.pie(top, values="vested_amount", names="name", title="Distribuția token-urilor")
     return fig
 
 
-def create_risk_distribution_chart(results):
-    """Generează un grafic cu distribuția nivelurilor de risc."""
-    df = pd.DataFrame(results)
-    if df.empty:
+def create_risk_distribution_chart(results, aggregates=None):
+    """Generează un grafic cu distribuția nivelurilor de risc (pe rețele, dacă sunt mai multe)."""
+    import plotly.express as px
+
+    table = as_results_table(results)
+    if table.empty:
         return px.pie(title="Fără date")
-    fig = px.pie(df, names="risk_level", title="Distribuția nivelurilor de risc")
+    rollup = _chart_aggregates(table, aggregates)["rollup"]
+    title = "Distribuția nivelurilor de risc"
+    if "network" in rollup.columns and rollup["network"].nunique() > 1:
+        return px.sunburst(rollup, path=["network", "risk_level"], values="contracts",
+                           title=title)
+    fig = px.pie(rollup, names="risk_level", values="contracts", title=title)
     return fig
 
 
-def create_detailed_table(results):
-    """Returnează un DataFrame cu informații detaliate despre contracte."""
-    df = pd.DataFrame(results)
+def create_vesting_curve_chart(history):
+    """Generează graficul în timp al sumelor vested și released pentru fiecare contract."""
+    import pandas as pd
+    import plotly.express as px
+
+    df = pd.DataFrame(history)
     if df.empty:
+        return px.line(title="Fără date")
+    x = "timestamp" if "timestamp" in df.columns and df["timestamp"].notna().any() else "block_number"
+    metrics = [c for c in ("vested_amount", "released_amount") if c in df.columns]
+    long_df = df.melt(id_vars=["name", x], value_vars=metrics,
+                      var_name="metric", value_name="amount").dropna(subset=["amount"])
+    fig = px.line(long_df, x=x, y="amount", color="name", line_dash="metric",
+                  markers=True, title="Evoluția sumelor vested și released")
+    return fig
+
+
+def create_detailed_table(results):
+    """Returnează un DataFrame cu informații detaliate despre contracte.
+
+    Lângă sumele în unități de token sunt afișate și sumele exacte, în unitățile
+    de bază, ca text zecimal (depășesc precizia float și int64).
+    """
+    import pandas as pd
+
+    table = as_results_table(results)
+    if table.empty:
         return pd.DataFrame()
+    amounts = ["vested_amount", "released_amount", "releasable_amount"]
     columns = [
         "name",
+        "network",
         "address",
         "security_score",
         "risk_level",
-        "vested_amount",
-        "released_amount",
-        "releasable_amount",
-    ]
-    for col in columns:
-        if col not in df.columns:
-            df[col] = None
-    return df[columns]
+        "token",
+        "token_decimals",
+    ] + amounts
+    detailed = table[columns].copy()
+    for name in amounts:
+        detailed[f"{name}_raw"] = table[f"{name}_raw"].map(str)
+    return detailed
@@ -0,0 +1,90 @@
+"""Sesiuni HTTP partajate (connection pooling, keep-alive, timeout implicit, retry cu jitter)."""
+
+import os
+import threading
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Optional
+
+if TYPE_CHECKING:
+    import requests
+    from urllib3.util.retry import Retry
+
+DEFAULT_POOL_SIZE = 20
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_RETRIES = 3
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+@lru_cache(maxsize=None)
+def _session_class() -> type:
+    # requests se importă abia la crearea primei sesiuni
+    import requests
+
+    class TimeoutSession(requests.Session):
+        """`requests.Session` care aplică un timeout implicit fiecărei cereri."""
+
+        def __init__(self, timeout: float = DEFAULT_TIMEOUT) -> None:
+            super().__init__()
+            self.timeout = timeout
+
+        def request(self, method, url, **kwargs):
+            kwargs.setdefault("timeout", self.timeout)
+            return super().request(method, url, **kwargs)
+
+    return TimeoutSession
+
+
+def __getattr__(name: str):
+    if name == "TimeoutSession":
+        return _session_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _retry_policy(retries: int) -> "Retry":
+    from urllib3.util.retry import Retry
+
+    options = dict(
+        total=retries,
+        backoff_factor=0.5,
+        status_forcelist=RETRY_STATUSES,
+        # Citirile JSON-RPC trimise prin POST sunt idempotente
+        allowed_methods=frozenset({"GET", "POST"}),
+        raise_on_status=False,
+    )
+    try:
+        return Retry(backoff_jitter=0.5, **options)
+    except TypeError:  # urllib3 < 2 nu are backoff_jitter
+        return Retry(**options)
+
+
+def create_session(pool_size: Optional[int] = None, timeout: Optional[float] = None,
+                   retries: Optional[int] = None) -> "requests.Session":
+    """Creează o sesiune cu pool de conexiuni, gzip și retry cu backoff."""
+    pool_size = pool_size or int(os.getenv("HTTP_POOL_SIZE", DEFAULT_POOL_SIZE))
+    timeout = timeout or float(os.getenv("HTTP_TIMEOUT", DEFAULT_TIMEOUT))
+    if retries is None:
+        retries = int(os.getenv("HTTP_RETRIES", DEFAULT_RETRIES))
+
+    from requests.adapters import HTTPAdapter
+
+    session = _session_class()(timeout)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                          max_retries=_retry_policy(retries))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Accept-Encoding"] = "gzip, deflate"
+    return session
+
+
+_sessions: Dict[str, "requests.Session"] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(network: str) -> "requests.Session":
+    """Returnează sesiunea partajată a rețelei, folosită pentru Etherscan și RPC."""
+    key = network.lower()
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = _sessions[key] = create_session()
+        return session
@@ -0,0 +1,224 @@
+"""Măsurători de durată per etapă și contoare, exportabile ca JSON sau text Prometheus.
+
+Etapele analizei sunt cronometrate cu `span("nume")`, iar evenimentele
+(hit-uri de cache, reîncercări, așteptări impuse de limitatorul de rată) sunt
+numărate cu `increment`. Valorile se acumulează în registrul global
+`METRICS`, exportat ca JSON sau Prometheus.
+
+Defalcarea unei singure rulări folosește un colector propriu (`Metrics`),
+activ în contextul rulării (`record_run` / `iter_recorded`): `span` și
+`increment` scriu și în el, iar rulările concurente (alți utilizatori, o
+rulare bulk în același proces) nu își amestecă valorile. Contextul nu trece
+singur în thread-urile noi; pool-urile îl transmit cu `in_current_context`.
+"""
+
+import contextvars
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+LabelSet = Tuple[Tuple[str, str], ...]
+MetricKey = Tuple[str, LabelSet]
+
+PROMETHEUS_PREFIX = "vesting_"
+
+
+def _key(name: str, labels: Dict[str, str]) -> MetricKey:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_key(name: str, labels: LabelSet) -> str:
+    if not labels:
+        return name
+    return name + "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}"
+
+
+class Metrics:
+    """Registru thread-safe de durate per etapă și contoare etichetate."""
+
+    def __init__(self, clock=time.perf_counter) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        # etapă -> [număr, total secunde, maxim secunde]
+        self._spans: Dict[str, list] = {}
+        self._counters: Dict[MetricKey, float] = {}
+
+    def observe(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            entry = self._spans.setdefault(stage, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+
+    @contextmanager
+    def span(self, stage: str) -> Iterator[None]:
+        """Cronometrează blocul `with`, inclusiv când acesta aruncă o excepție."""
+        start = self._clock()
+        try:
+            yield
+        finally:
+            self.observe(stage, self._clock() - start)
+
+    def increment(self, name: str, value: float = 1, **labels: str) -> None:
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Copie a valorilor curente, serializabilă în JSON."""
+        with self._lock:
+            return {
+                "spans": {
+                    stage: {"count": count, "total": total, "max": maximum}
+                    for stage, (count, total, maximum) in self._spans.items()
+                },
+                "counters": {
+                    _format_key(name, labels): value
+                    for (name, labels), value in self._counters.items()
+                },
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._spans.clear()
+            self._counters.clear()
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2, sort_keys=True)
+
+    def to_prometheus(self) -> str:
+        """Formatul text de expunere Prometheus."""
+        with self._lock:
+            spans = dict(self._spans)
+            counters = dict(self._counters)
+
+        lines = []
+        if spans:
+            metric = f"{PROMETHEUS_PREFIX}stage_seconds"
+            lines.append(f"# TYPE {metric} summary")
+            for stage, (count, total, _) in sorted(spans.items()):
+                lines.append(f'{metric}_sum{{stage="{stage}"}} {total:.6f}')
+                lines.append(f'{metric}_count{{stage="{stage}"}} {count}')
+        for name in sorted({name for name, _ in counters}):
+            metric = f"{PROMETHEUS_PREFIX}{name}"
+            lines.append(f"# TYPE {metric} counter")
+            for (counter, labels), value in sorted(counters.items()):
+                if counter == name:
+                    lines.append(f"{_format_key(metric, labels)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+def diff(before: Dict, after: Dict) -> Dict[str, Dict]:
+    """Diferența dintre două instantanee `Metrics.snapshot()` (valorile unei rulări)."""
+    spans = {}
+    for stage, values in after["spans"].items():
+        old = before["spans"].get(stage, {"count": 0, "total": 0.0})
+        count = values["count"] - old["count"]
+        if count:
+            spans[stage] = {"count": count, "total": values["total"] - old["total"]}
+    counters = {
+        name: value - before["counters"].get(name, 0)
+        for name, value in after["counters"].items()
+        if value != before["counters"].get(name, 0)
+    }
+    return {"spans": spans, "counters": counters}
+
+
+def format_breakdown(run: Dict[str, Dict], title: str = "Per-stage timings") -> str:
+    """Tabel Markdown cu timpul total și mediu per etapă, urmat de contoare."""
+    if not run["spans"] and not run["counters"]:
+        return ""
+    lines = [f"**{title}**", "", "| Stage | Calls | Total (s) | Mean (ms) |",
+             "|---|---:|---:|---:|"]
+    for stage, values in sorted(run["spans"].items(), key=lambda item: -item[1]["total"]):
+        mean_ms = values["total"] / values["count"] * 1000
+        lines.append(f"| {stage} | {values['count']} | {values['total']:.2f} | {mean_ms:.1f} |")
+    if run["counters"]:
+        lines.append("")
+        lines.extend(f"- {name}: {value:g}" for name, value in sorted(run["counters"].items()))
+    return "\n".join(lines)
+
+
+def write_metrics(path: str, registry: Optional[Metrics] = None) -> None:
+    """Scrie metricile în `path`: text Prometheus pentru `.prom`, altfel JSON."""
+    registry = registry or METRICS
+    content = registry.to_prometheus() if path.endswith(".prom") else registry.to_json()
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write(content)
+
+
+METRICS = Metrics()
+
+# Colectorul rulării curente (None în afara unei rulări)
+_current_run: "contextvars.ContextVar[Optional[Metrics]]" = contextvars.ContextVar(
+    "metrics_run", default=None
+)
+
+
+@contextmanager
+def record_run(run: Metrics) -> Iterator[Metrics]:
+    """Activează colectorul `run` în contextul curent, pe durata blocului `with`."""
+    token = _current_run.set(run)
+    try:
+        yield run
+    finally:
+        _current_run.reset(token)
+
+
+def iter_recorded(items: Iterable[T], run: Metrics) -> Iterator[T]:
+    """Parcurge `items` cu `run` activ la fiecare pas.
+
+    Pentru generatoarele consumate pas cu pas (ex. de Gradio, din thread-uri
+    diferite): colectorul este activat doar cât durează fiecare `next`, nu
+    rămâne setat în contextul apelantului între pași.
+    """
+    iterator = iter(items)
+    try:
+        while True:
+            with record_run(run):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            with record_run(run):
+                close()
+
+
+def in_current_context(fn: Callable[..., T]) -> Callable[..., T]:
+    """`fn` rulată într-o copie a contextului curent (cu colectorul rulării), în alt thread.
+
+    Fiecare sarcină trimisă unui pool are nevoie de propria copie.
+    """
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        return context.run(fn, *args, **kwargs)
+    return run
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """Cronometrează blocul `with` în registrul global și în colectorul rulării."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        METRICS.observe(stage, seconds)
+        run = _current_run.get()
+        if run is not None:
+            run.observe(stage, seconds)
+
+
+def increment(name: str, value: float = 1, **labels: str) -> None:
+    METRICS.increment(name, value, **labels)
+    run = _current_run.get()
+    if run is not None:
+        run.increment(name, value, **labels)
@@ -0,0 +1,213 @@
+"""Analiza într-o singură rulare a contractelor de pe mai multe rețele.
+
+Fiecare adresă poate fi precedată de rețeaua ei (`polygon:0x...`); adresele
+fără etichetă aparțin rețelei implicite. Contractele sunt grupate pe rețea,
+iar fiecare grup rulează într-un thread propriu, pe analizorul "cald" al
+rețelei lui, cu sesiunea HTTP, limitatoarele de rată și pool-ul de workeri
+ale acestuia. Rezultatele sunt generate pe măsură ce apar, din toate
+rețelele, deci un portofoliu cross-chain durează cât cea mai lentă rețea,
+nu cât suma lor.
+"""
+
+import queue
+import threading
+from datetime import datetime
+from typing import (Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence,
+                    Tuple, TypeVar)
+
+from analyzer_registry import get_analyzer
+from chain_backend import SUPPORTED_NETWORKS
+from metrics import in_current_context
+
+T = TypeVar("T")
+
+# Marchează terminarea unui grup în coada de rezultate
+_DONE = object()
+
+
+def split_network_tag(entry: str, default_network: str = "mainnet") -> Tuple[str, str]:
+    """Returnează (rețea, adresă) pentru `rețea:adresă` sau o adresă simplă."""
+    entry = entry.strip()
+    network, sep, address = entry.partition(":")
+    if not sep:
+        return default_network.lower(), entry
+    network = network.strip().lower()
+    if network not in SUPPORTED_NETWORKS:
+        raise ValueError(f"Rețea nesuportată: {network}")
+    return network, address.strip()
+
+
+def group_by_network(items: Iterable[T], network_of: Callable[[T], Optional[str]],
+                     default_network: str = "mainnet") -> Dict[str, List[T]]:
+    """Grupează elementele după rețea, păstrând ordinea de intrare în fiecare grup."""
+    groups: Dict[str, List[T]] = {}
+    for item in items:
+        network = (network_of(item) or default_network).lower()
+        groups.setdefault(network, []).append(item)
+    return groups
+
+
+class _StopSignal:
+    """Oprirea unei rulări: setată local sau prin evenimentul primit de la apelant."""
+
+    def __init__(self, cancel_event: Optional[threading.Event] = None) -> None:
+        self._stop = threading.Event()
+        self._cancel = cancel_event
+
+    def set(self) -> None:
+        self._stop.set()
+
+    def is_set(self) -> bool:
+        return self._stop.is_set() or (self._cancel is not None and self._cancel.is_set())
+
+
+def iter_by_network(groups: Dict[str, Sequence[T]],
+                    run: Callable[[str, Sequence[T], Any], Iterable[Tuple[int, Any]]],
+                    cancel_event: Optional[threading.Event] = None
+                    ) -> Iterator[Tuple[str, int, Any]]:
+    """Rulează `run(rețea, elemente, stop)` pentru fiecare grup, în paralel.
+
+    `run` generează perechi (index în grup, rezultat); aici sunt generate
+    triplete (rețea, index în grup, rezultat), în ordinea finalizării. `stop`
+    are `is_set()` și poate fi transmis mai departe ca `cancel_event`; este
+    setat la `cancel_event` sau la închiderea generatorului. O excepție
+    dintr-un grup oprește doar acel grup; elementele lui rămase nu apar în
+    rezultat.
+    """
+    stop = _StopSignal(cancel_event)
+    results: "queue.Queue" = queue.Queue()
+
+    def worker(network: str, items: Sequence[T]) -> None:
+        produced = None
+        try:
+            produced = iter(run(network, items, stop))
+            for local_index, result in produced:
+                results.put((network, local_index, result))
+                if stop.is_set():
+                    break
+        except Exception as e:
+            print(f"Eroare la analiza contractelor de pe {network}: {e}")
+        finally:
+            close = getattr(produced, "close", None)
+            if close is not None:
+                close()
+            results.put(_DONE)
+
+    threads = [
+        # Fiecare thread preia contextul apelantului (colectorul metricilor rulării)
+        threading.Thread(target=in_current_context(worker), args=(network, items),
+                         name=f"network-{network}", daemon=True)
+        for network, items in groups.items() if items
+    ]
+    for thread in threads:
+        thread.start()
+    remaining = len(threads)
+    try:
+        while remaining:
+            item = results.get()
+            if item is _DONE:
+                remaining -= 1
+                continue
+            yield item
+    finally:
+        stop.set()
+
+
+def error_result(contract_data: Dict[str, Any], network: str, message: str) -> Dict[str, Any]:
+    """Rezultatul unui contract care nu a putut fi analizat, în forma `analyze_contract`."""
+    address = contract_data.get("address", "")
+    return {
+        "name": contract_data.get("name") or f"Contract_{address[:8]}",
+        "address": address,
+        "network": network,
+        "status": "error",
+        "error": message,
+        "timestamp": datetime.now().isoformat(),
+        "security_score": 0,
+        "risk_level": "ERROR",
+    }
+
+
+class MultiNetworkAnalyzer:
+    """Aceeași interfață ca `VestingContractAnalyzer`, pentru intrări de pe mai multe rețele.
+
+    Intrările pot avea cheia `network` (implicit `default_network`). Pentru
+    fiecare rețea se folosește analizorul din registrul global creat cu
+    `factory(rețea)`; rezultatele primesc câmpul `network`.
+    """
+
+    def __init__(self, factory: Callable[[str], Any],
+                 default_network: str = "mainnet") -> None:
+        self.factory = factory
+        self.default_network = default_network.lower()
+
+    def analyzer(self, network: str) -> Any:
+        return get_analyzer(network, self.factory)
+
+    def iter_analyze_contracts(self, contracts_data: List[Dict[str, Any]],
+                               max_workers: int = 1,
+                               cancel_event: Optional[threading.Event] = None
+                               ) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Generează perechi (index, rezultat) din toate rețelele, pe măsură ce sunt gata
+
+        Fiecare rețea are propriul pool de `max_workers` thread-uri. Contractele
+        unei rețele fără analizor (ex. nod indisponibil) primesc un rezultat
+        cu eroare.
+        """
+        groups = group_by_network(range(len(contracts_data)),
+                                  lambda i: contracts_data[i].get("network"),
+                                  self.default_network)
+
+        def run(network: str, indices: Sequence[int], stop) -> Iterable[Tuple[int, Dict]]:
+            analyzer = self.analyzer(network)
+            if analyzer is None:
+                return ()
+            return analyzer.iter_analyze_contracts([contracts_data[i] for i in indices],
+                                                   max_workers, stop)
+
+        pending = {network: set(indices) for network, indices in groups.items()}
+        for network, local_index, result in iter_by_network(groups, run, cancel_event):
+            i = groups[network][local_index]
+            pending[network].discard(i)
+            result["network"] = network
+            yield i, result
+
+        if cancel_event is not None and cancel_event.is_set():
+            return
+        for network, indices in pending.items():
+            for i in sorted(indices):
+                yield i, error_result(contracts_data[i], network,
+                                      f"Nu s-a putut analiza contractul pe rețeaua {network}")
+
+    def analyze_multiple_contracts(self, contracts_data: List[Dict[str, Any]],
+                                   progress_callback=None,
+                                   max_workers: int = 1) -> List[Dict[str, Any]]:
+        """Analizează toate contractele; rezultatele păstrează ordinea de intrare"""
+        total = len(contracts_data)
+        results: List[Optional[Dict[str, Any]]] = [None] * total
+        if progress_callback:
+            networks = {(c.get("network") or self.default_network).lower() for c in contracts_data}
+            progress_callback(0.0, f"Analizez {total} contracte pe {len(networks)} rețele...")
+
+        for done, (i, result) in enumerate(self.iter_analyze_contracts(contracts_data,
+                                                                       max_workers), start=1):
+            results[i] = result
+            if progress_callback:
+                label = result.get("name") or result.get("address", "")[:10]
+                progress_callback(done / total, f"Analizat {label} ({done}/{total})")
+
+        self.score_results(results)
+        if progress_callback:
+            progress_callback(1.0, "Analiza completă!")
+        return results
+
+    def score_results(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Scorarea vectorizată a rezultatelor, câte o trecere per rețea (vezi
+        `VestingContractAnalyzer.score_results`)."""
+        groups = group_by_network([r for r in results if r], lambda r: r.get("network"),
+                                  self.default_network)
+        for network, rows in groups.items():
+            analyzer = self.analyzer(network)
+            if analyzer is not None:
+                analyzer.score_results(rows)
+        return results
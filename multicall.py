@@ -0,0 +1,134 @@
+"""Agregarea apelurilor view într-un singur `eth_call` prin contractul Multicall3."""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from abi_signatures import collapse_if_tuple
+
+# Multicall3 are aceeași adresă pe mainnet, testnet-uri și Polygon
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+MULTICALL3_ABI = [
+    {
+        "type": "function",
+        "name": "aggregate3",
+        "stateMutability": "view",
+        "inputs": [
+            {
+                "name": "calls",
+                "type": "tuple[]",
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "allowFailure", "type": "bool"},
+                    {"name": "callData", "type": "bytes"},
+                ],
+            }
+        ],
+        "outputs": [
+            {
+                "name": "returnData",
+                "type": "tuple[]",
+                "components": [
+                    {"name": "success", "type": "bool"},
+                    {"name": "returnData", "type": "bytes"},
+                ],
+            }
+        ],
+    }
+]
+
+
+class EncodedCall:
+    """Un apel view gata de agregat: adresa țintă, calldata și tipurile returnate."""
+
+    __slots__ = ("target", "data", "output_types")
+
+    def __init__(self, target: str, data: bytes, output_types: List[str]) -> None:
+        self.target = target
+        self.data = data
+        self.output_types = output_types
+
+
+def find_function_abi(abi: Sequence[Dict[str, Any]], name: str,
+                      arity: int) -> Optional[Dict[str, Any]]:
+    """Găsește intrarea ABI a funcției `name` cu `arity` parametri."""
+    for item in abi:
+        if (item.get("type") == "function" and item.get("name") == name
+                and len(item.get("inputs", [])) == arity):
+            return item
+    return None
+
+
+def encode_call(contract, name: str, args: Tuple = ()) -> Optional[EncodedCall]:
+    """Codifică apelul `name(*args)` pe `contract`; None dacă ABI-ul nu îl conține."""
+    fn_abi = find_function_abi(contract.abi, name, len(args))
+    if fn_abi is None:
+        return None
+    try:
+        data = getattr(contract.functions, name)(*args)._encode_transaction_data()
+    except Exception:
+        return None
+    output_types = [collapse_if_tuple(o) for o in fn_abi.get("outputs", [])]
+    return EncodedCall(contract.address, bytes.fromhex(data[2:]), output_types)
+
+
+class Multicall:
+    """Execută liste de `EncodedCall` prin `aggregate3`, tolerând eșecurile individuale."""
+
+    def __init__(self, w3, address: str = MULTICALL3_ADDRESS,
+                 max_calls: int = 300, batcher=None) -> None:
+        self.w3 = w3
+        self.max_calls = max_calls
+        self.batcher = batcher
+        self.contract = w3.eth.contract(address=address, abi=MULTICALL3_ABI)
+
+    def aggregate(self, calls: Sequence[EncodedCall],
+                  block_identifier: Any = "latest") -> List[Tuple[bool, Any]]:
+        """Returnează (succes, valoare decodată) pentru fiecare apel, în ordine.
+
+        Apelurile sunt trimise în grupuri de cel mult `max_calls`. Cu un
+        `batcher` (`rpc_batch.JsonRpcBatcher`) toate grupurile pleacă într-un
+        singur batch JSON-RPC, ca `eth_call` brut (fără cererea `eth_chainId`
+        pe care web3 o face înaintea fiecărui `.call()`); altfel fiecare grup
+        este un round trip.
+        """
+        chunks = [calls[start:start + self.max_calls]
+                  for start in range(0, len(calls), self.max_calls)]
+        if self.batcher is not None:
+            raw_chunks = self._aggregate_batched(chunks, block_identifier)
+        else:
+            raw_chunks = [
+                self.contract.functions.aggregate3(
+                    [(c.target, True, c.data) for c in chunk]
+                ).call(block_identifier=block_identifier)
+                for chunk in chunks
+            ]
+
+        results: List[Tuple[bool, Any]] = []
+        for chunk, raw in zip(chunks, raw_chunks):
+            for call, (success, return_data) in zip(chunk, raw):
+                results.append(decode_result(self.w3.codec, call, success, return_data))
+        return results
+
+    def _aggregate_batched(self, chunks, block_identifier) -> List[List[Tuple[bool, bytes]]]:
+        aggregate_calls = [
+            encode_call(self.contract, "aggregate3", ([(c.target, True, c.data) for c in chunk],))
+            for chunk in chunks
+        ]
+        raw_chunks = []
+        for chunk, data in zip(chunks, self.batcher.eth_call_many(aggregate_calls, block_identifier)):
+            if data is None:
+                raise ValueError("aggregate3 a eșuat în batch")
+            raw_chunks.append(self.w3.codec.decode(["(bool,bytes)[]"], data)[0])
+        return raw_chunks
+
+
+def decode_result(codec, call: EncodedCall, success: bool,
+                  return_data: Optional[bytes]) -> Tuple[bool, Any]:
+    """Decodează datele returnate de un apel; (False, None) dacă apelul a eșuat."""
+    if not success or not return_data:
+        return False, None
+    try:
+        values = codec.decode(call.output_types, return_data)
+    except Exception:
+        return False, None
+    return True, values[0] if len(values) == 1 else values
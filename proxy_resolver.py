@@ -0,0 +1,156 @@
+"""Detectarea contractelor proxy și rezolvarea adresei implementării.
+
+Sunt recunoscute:
+- proxy-urile EIP-1967 (TransparentUpgradeableProxy, UUPS), după slotul de implementare;
+- proxy-urile beacon EIP-1967, prin apelul `implementation()` pe beacon;
+- proxy-urile OpenZeppelin vechi (zeppelinos), după slotul lor de implementare;
+- clonele EIP-1167 (minimal proxy), care au adresa implementării în bytecode.
+
+Sloturile (și codul, când nu este deja cunoscut) tuturor adreselor se citesc
+într-un singur batch JSON-RPC. Rezultatele sunt memorate cu TTL, pentru că
+un proxy poate fi actualizat; ABI-ul implementării ajunge în cache-ul de
+ABI-uri sub adresa implementării, deci este comun tuturor proxy-urilor care
+o folosesc.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from metrics import increment
+from rpc_batch import JsonRpcError
+
+# bytes32(uint256(keccak256("eip1967.proxy.implementation")) - 1)
+IMPLEMENTATION_SLOT = "0x360894a13ba1a3210667c828492db98dca3e2076cc3735a920a3ca505d382bbc"
+# bytes32(uint256(keccak256("eip1967.proxy.beacon")) - 1)
+BEACON_SLOT = "0xa3f0ad74e5423aebfd80d3ef4346578335a9a72aeaee59ff6cb3582b35133d50"
+# keccak256("org.zeppelinos.proxy.implementation")
+LEGACY_IMPLEMENTATION_SLOT = "0x7050c9e0f4ca769c69bd3a8ef740bc37934f8e2c036e5a723fd8ee048ed3f8c3"
+SLOTS = (IMPLEMENTATION_SLOT, BEACON_SLOT, LEGACY_IMPLEMENTATION_SLOT)
+
+# implementation() pe contractul beacon
+BEACON_IMPLEMENTATION_SELECTOR = "0x5c60da1b"
+
+MINIMAL_PROXY_PREFIX = bytes.fromhex("363d3d373d3d3d363d73")
+MINIMAL_PROXY_SUFFIX = bytes.fromhex("5af43d82803e903d91602b57fd5bf3")
+
+DEFAULT_TTL = 3600.0
+
+
+class ProxyResolutionError(Exception):
+    """Nodul nu a putut citi sloturile proxy: nu se știe dacă adresa este proxy."""
+
+
+def minimal_proxy_target(code: Optional[bytes]) -> Optional[str]:
+    """Adresa implementării unei clone EIP-1167, sau None pentru alt bytecode."""
+    if (not code or len(code) != len(MINIMAL_PROXY_PREFIX) + 20 + len(MINIMAL_PROXY_SUFFIX)
+            or not code.startswith(MINIMAL_PROXY_PREFIX) or not code.endswith(MINIMAL_PROXY_SUFFIX)):
+        return None
+    start = len(MINIMAL_PROXY_PREFIX)
+    return "0x" + code[start:start + 20].hex()
+
+
+def word_to_address(word) -> Optional[str]:
+    """Adresa din ultimii 20 de octeți ai unui cuvânt de 32 de octeți; None dacă este zero."""
+    if not isinstance(word, str) or not word.startswith("0x"):
+        return None
+    value = word[2:].rjust(64, "0")[-40:]
+    if not value.strip("0"):
+        return None
+    return "0x" + value.lower()
+
+
+class ProxyResolver:
+    """Rezolvă în grup implementările proxy-urilor, cu memorie TTL per adresă."""
+
+    def __init__(self, batcher, ttl: float = DEFAULT_TTL,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.batcher = batcher
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        # adresă -> (momentul rezolvării, implementare sau None)
+        self._resolved: Dict[str, Tuple[float, Optional[str]]] = {}
+
+    def _remember(self, address: str, implementation: Optional[str]) -> None:
+        with self._lock:
+            self._resolved[address] = (self._clock(), implementation)
+
+    def resolve_many(self, addresses: Iterable[str],
+                     codes: Optional[Dict[str, bytes]] = None) -> Dict[str, Optional[str]]:
+        """Returnează {adresă cu litere mici: implementare sau None}.
+
+        `codes` (indexat după adresa cu litere mici) evită citirea din nou a
+        codului runtime. Adresele pentru care nodul a răspuns cu eroare lipsesc
+        din rezultat și nu sunt memorate.
+        """
+        codes = codes or {}
+        resolved: Dict[str, Optional[str]] = {}
+        pending: List[str] = []
+        now = self._clock()
+        for address in dict.fromkeys(a.lower() for a in addresses if a):
+            with self._lock:
+                cached = self._resolved.get(address)
+            if cached is not None and now - cached[0] < self.ttl:
+                resolved[address] = cached[1]
+                continue
+            code = codes.get(address)
+            target = minimal_proxy_target(code)
+            if target or code == b"":
+                # Clonă EIP-1167 sau adresă fără cod: nu e nevoie de RPC
+                resolved[address] = target
+                self._remember(address, target)
+            else:
+                pending.append(address)
+        increment("cache_hits_total", len(resolved), cache="proxy")
+        increment("cache_misses_total", len(pending), cache="proxy")
+        if pending:
+            resolved.update(self._resolve_pending(pending, codes))
+        return resolved
+
+    def _resolve_pending(self, pending: List[str],
+                         codes: Dict[str, bytes]) -> Dict[str, Optional[str]]:
+        requests = []
+        plans = []
+        for address in pending:
+            plan = {"code": None}
+            if address not in codes:
+                plan["code"] = len(requests)
+                requests.append(("eth_getCode", [address, "latest"]))
+            plan["slots"] = len(requests)
+            requests.extend(("eth_getStorageAt", [address, slot, "latest"]) for slot in SLOTS)
+            plans.append(plan)
+        responses = self.batcher.call_many(requests)
+
+        resolved: Dict[str, Optional[str]] = {}
+        beacons: Dict[str, str] = {}
+        for address, plan in zip(pending, plans):
+            code = codes.get(address)
+            if plan["code"] is not None:
+                raw = responses[plan["code"]]
+                code = bytes.fromhex(raw[2:]) if isinstance(raw, str) else None
+            target = minimal_proxy_target(code)
+            if target:
+                resolved[address] = target
+                continue
+            slots = responses[plan["slots"]:plan["slots"] + len(SLOTS)]
+            if any(isinstance(value, JsonRpcError) for value in slots):
+                continue
+            implementation, beacon, legacy = (word_to_address(value) for value in slots)
+            if beacon and not implementation:
+                beacons[address] = beacon
+                continue
+            resolved[address] = implementation or legacy
+
+        if beacons:
+            results = self.batcher.call_many([
+                ("eth_call", [{"to": beacon, "data": BEACON_IMPLEMENTATION_SELECTOR}, "latest"])
+                for beacon in beacons.values()
+            ])
+            for address, result in zip(beacons, results):
+                if not isinstance(result, JsonRpcError):
+                    resolved[address] = word_to_address(result)
+
+        for address, implementation in resolved.items():
+            self._remember(address, implementation)
+        return resolved
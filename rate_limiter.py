@@ -0,0 +1,138 @@
+"""Limitare de rată token-bucket, partajată între apelurile Etherscan și RPC."""
+
+import os
+import threading
+import time
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+from metrics import increment
+
+
+# Valori implicite (apeluri/secundă, burst) per tip de endpoint; pot fi
+# suprascrise prin variabilele de mediu <PREFIX>_RATE_LIMIT și <PREFIX>_BURST.
+DEFAULT_LIMITS: Dict[str, Tuple[float, int]] = {
+    "etherscan": (5.0, 5),
+    "rpc": (10.0, 10),
+}
+
+
+class TokenBucket:
+    """Token bucket thread-safe cu backoff adaptiv (AIMD).
+
+    `backoff()` înjumătățește rata curentă când serverul raportează depășirea
+    cotei, iar `record_success()` o readuce treptat spre rata configurată.
+    """
+
+    def __init__(self, rate: float, burst: int = 1,
+                 min_rate: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep,
+                 name: str = "") -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.name = name
+        self.base_rate = float(rate)
+        self.rate = float(rate)
+        self.burst = max(int(burst), 1)
+        self.min_rate = min_rate if min_rate is not None else self.base_rate / 16
+        self._tokens = float(self.burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Blochează până sunt disponibile `tokens`; returnează timpul așteptat.
+
+        O cerere mai mare decât `burst` (ex. un batch JSON-RPC) este plătită în
+        tranșe de cel mult `burst` token-uri, deci costă cât apelurile separate.
+        """
+        waited = 0.0
+        remaining = float(tokens)
+        while remaining > 0:
+            part = min(remaining, self.burst)
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                if self._tokens >= part:
+                    self._tokens -= part
+                    remaining -= part
+                    continue
+                delay = (part - self._tokens) / self.rate
+            self._sleep(delay)
+            waited += delay
+        if waited:
+            increment("rate_limit_waits_total", limiter=self.name)
+            increment("rate_limit_wait_seconds_total", waited, limiter=self.name)
+        return waited
+
+    def backoff(self) -> None:
+        """Reduce rata la jumătate și golește bucket-ul după un răspuns de tip rate limit."""
+        increment("rate_limit_backoffs_total", limiter=self.name)
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = 0.0
+            self._updated = self._clock()
+
+    def record_success(self) -> None:
+        """Crește aditiv rata, până la valoarea configurată."""
+        if self.rate >= self.base_rate:
+            return
+        with self._lock:
+            self.rate = min(self.base_rate, self.rate + self.base_rate / 20)
+
+
+_limiters: Dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def _configured_limits(kind: str) -> Tuple[float, int]:
+    rate, burst = DEFAULT_LIMITS.get(kind, DEFAULT_LIMITS["rpc"])
+    prefix = kind.upper()
+    rate = float(os.getenv(f"{prefix}_RATE_LIMIT", rate))
+    burst = int(os.getenv(f"{prefix}_BURST", burst))
+    return rate, burst
+
+
+def get_rate_limiter(url: str, kind: str = "rpc") -> TokenBucket:
+    """Returnează limitatorul partajat pentru host-ul din `url`."""
+    key = f"{kind}:{urlparse(url).netloc or url}"
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            rate, burst = _configured_limits(kind)
+            limiter = _limiters[key] = TokenBucket(rate, burst, name=kind)
+        return limiter
+
+
+@lru_cache(maxsize=None)
+def _provider_class() -> type:
+    # web3 se importă abia la prima conexiune RPC (importul durează ~1 s)
+    from web3 import Web3
+
+    class RateLimitedHTTPProvider(Web3.HTTPProvider):
+        """HTTPProvider care consumă un token din limitatorul RPC înaintea fiecărei cereri."""
+
+        def __init__(self, endpoint_uri: str, *args, **kwargs) -> None:
+            super().__init__(endpoint_uri, *args, **kwargs)
+            self.rate_limiter = get_rate_limiter(endpoint_uri, "rpc")
+
+        def make_request(self, method, params):
+            self.rate_limiter.acquire()
+            return super().make_request(method, params)
+
+    return RateLimitedHTTPProvider
+
+
+def __getattr__(name: str):
+    if name == "RateLimitedHTTPProvider":
+        return _provider_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
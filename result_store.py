@@ -0,0 +1,187 @@
+"""Stocare a rezultatelor de analiză fixate pe bloc, pentru re-analiză incrementală.
+
+Fiecare rezultat este salvat sub cheia (rețea, contract, beneficiar, bloc).
+La o rulare ulterioară, contractele fără activitate on-chain după blocul
+salvat sunt servite din stocare; doar cele cu activitate nouă sunt analizate
+din nou. Activitatea este detectată cu câteva cereri `eth_getLogs` grupate
+într-un singur batch JSON-RPC pentru tot portofoliul: evenimente emise de
+contract (ex. `ERC20Released`) și transferuri ERC-20 către/de la contract.
+
+Sumele vested/releasable ale unui program liniar cresc și fără tranzacții,
+de aceea rezultatele mai vechi de `max_age` secunde sunt recalculate oricum.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from metrics import increment
+
+DEFAULT_RESULT_STORE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "vesting_analyzer", "results.sqlite3"
+)
+DEFAULT_MAX_AGE = 24 * 3600
+
+# keccak("Transfer(address,address,uint256)")
+TRANSFER_TOPIC = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+
+# Câte adrese intră într-un filtru `eth_getLogs`
+LOG_FILTER_CHUNK_SIZE = 100
+
+
+class ResultStore:
+    """Rezultate de analiză indexate după (rețea, contract, beneficiar, bloc)."""
+
+    def __init__(self, path: str = DEFAULT_RESULT_STORE_PATH,
+                 max_age: float = DEFAULT_MAX_AGE,
+                 clock: Callable[[], float] = time.time) -> None:
+        self.path = path
+        self.max_age = max_age
+        self._clock = clock
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " network TEXT NOT NULL,"
+                " contract TEXT NOT NULL,"
+                " beneficiary TEXT NOT NULL,"
+                " block_number INTEGER NOT NULL,"
+                " stored_at REAL NOT NULL,"
+                " result TEXT NOT NULL,"
+                " PRIMARY KEY (network, contract, beneficiary, block_number))"
+            )
+
+    @staticmethod
+    def _key(network: str, contract: str, beneficiary: Optional[str]) -> Tuple[str, str, str]:
+        return network.lower(), contract.lower(), (beneficiary or "").lower()
+
+    def latest(self, network: str, contract: str,
+               beneficiary: Optional[str] = None) -> Optional[Tuple[int, float, Dict[str, Any]]]:
+        """Returnează (bloc, momentul salvării, rezultat) pentru cel mai recent rezultat."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT block_number, stored_at, result FROM results"
+                " WHERE network = ? AND contract = ? AND beneficiary = ?"
+                " ORDER BY block_number DESC LIMIT 1",
+                self._key(network, contract, beneficiary),
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], row[1], json.loads(row[2])
+
+    def is_fresh(self, stored_at: float) -> bool:
+        return self._clock() - stored_at <= self.max_age
+
+    def put(self, network: str, contract: str, beneficiary: Optional[str],
+            block_number: int, result: Dict[str, Any]) -> None:
+        """Salvează rezultatul calculat la `block_number` și șterge versiunile mai vechi."""
+        key = self._key(network, contract, beneficiary)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                (*key, block_number, self._clock(), json.dumps(result, default=str)),
+            )
+            self._conn.execute(
+                "DELETE FROM results WHERE network = ? AND contract = ? AND beneficiary = ?"
+                " AND block_number < ?",
+                (*key, block_number),
+            )
+
+
+def _topic_for(address: str) -> str:
+    return "0x" + address.lower()[2:].rjust(64, "0")
+
+
+def _address_from_topic(topic: str) -> str:
+    return "0x" + topic[-40:].lower()
+
+
+def find_active_contracts(batcher, since_blocks: Dict[str, int], to_block: int) -> Set[str]:
+    """Returnează contractele (litere mici) cu activitate după blocul lor din `since_blocks`.
+
+    Dacă o cerere eșuează, toate contractele din grupul respectiv sunt
+    considerate active, astfel încât nu este servit un rezultat învechit.
+    """
+    addresses = [a.lower() for a in since_blocks]
+    calls: List[Tuple[str, List[Any]]] = []
+    groups: List[List[str]] = []
+    for start in range(0, len(addresses), LOG_FILTER_CHUNK_SIZE):
+        chunk = addresses[start:start + LOG_FILTER_CHUNK_SIZE]
+        from_block = hex(min(since_blocks[a] for a in chunk) + 1)
+        window = {"fromBlock": from_block, "toBlock": hex(to_block)}
+        topics = [_topic_for(a) for a in chunk]
+        for log_filter in (
+            {**window, "address": chunk},
+            {**window, "topics": [TRANSFER_TOPIC, topics]},
+            {**window, "topics": [TRANSFER_TOPIC, None, topics]},
+        ):
+            calls.append(("eth_getLogs", [log_filter]))
+            groups.append(chunk)
+
+    active: Set[str] = set()
+    for chunk, logs in zip(groups, batcher.call_many(calls)):
+        if not isinstance(logs, list):
+            active.update(chunk)
+            continue
+        members = set(chunk)
+        for log in logs:
+            block = int(log.get("blockNumber", "0x0"), 16)
+            touched = {log.get("address", "").lower()}
+            topics = log.get("topics", [])
+            if topics and topics[0] == TRANSFER_TOPIC:
+                touched.update(_address_from_topic(t) for t in topics[1:3])
+            for address in touched & members:
+                if block > since_blocks[address]:
+                    active.add(address)
+    return active
+
+
+def split_reusable(store: ResultStore, batcher, network: str,
+                   contracts_data: Iterable[Dict[str, Any]],
+                   block_number: int) -> Dict[int, Dict[str, Any]]:
+    """Găsește intrările care pot fi servite din `store` fără o nouă analiză.
+
+    Returnează {index: rezultat salvat}, cu `cached` = True și `block_number`
+    setat la blocul la care a fost calculat rezultatul.
+    """
+    candidates: Dict[int, Tuple[str, int, Dict[str, Any]]] = {}
+    since_blocks: Dict[str, int] = {}
+    for i, contract_data in enumerate(contracts_data):
+        address = contract_data.get("address", "")
+        if not address:
+            continue
+        stored = store.latest(network, address, contract_data.get("beneficiary"))
+        if stored is None or not store.is_fresh(stored[1]):
+            continue
+        key = address.lower()
+        candidates[i] = (key, stored[0], stored[2])
+        since_blocks[key] = min(stored[0], since_blocks.get(key, stored[0]))
+
+    if not candidates:
+        return {}
+    stale = {a for a, block in since_blocks.items() if block < block_number}
+    active = find_active_contracts(
+        batcher, {a: since_blocks[a] for a in stale}, block_number
+    ) if stale else set()
+
+    reusable = {}
+    for i, (key, block, result) in candidates.items():
+        if key in active:
+            continue
+        reusable[i] = {**result, "cached": True, "block_number": block}
+    increment("cache_hits_total", len(reusable), cache="results")
+    return reusable
+
+
+def get_result_store(path: Optional[str] = None) -> Optional[ResultStore]:
+    """Creează stocarea configurată prin RESULT_STORE_PATH; None dacă este dezactivată."""
+    path = path or os.getenv("RESULT_STORE_PATH")
+    if not path:
+        return None
+    return ResultStore(path, max_age=float(os.getenv("RESULT_STORE_MAX_AGE", DEFAULT_MAX_AGE)))
@@ -0,0 +1,80 @@
+"""Sume exacte de token-uri și tabelul columnar al rezultatelor unei rulări.
+
+Sumele citite din contracte (`vested_amount`, `released_amount`, ...) rămân
+întregi exacți, în unitățile de bază ale token-ului; `token_decimals` spune
+câte zecimale are token-ul (`decimals()`, implicit 18 ca pentru ETH).
+Conversia în unități de token se face o singură dată, la construirea
+tabelului.
+
+`build_results_table` transformă lista de rezultate într-un DataFrame
+compact (categorii pentru textele repetate, întregi mici pentru scoruri),
+folosit ca atare de raportul sumar, de grafice și de `create_detailed_table`.
+pandas se importă abia la construirea tabelului.
+"""
+
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Union
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+DEFAULT_DECIMALS = 18
+
+# Sumele din rezultate, ca întregi exacți în unitățile de bază ale token-ului
+AMOUNT_FIELDS = ("vested_amount", "released_amount", "releasable_amount", "total_supply")
+
+# Coloanele text cu puține valori distincte, stocate ca `category`
+CATEGORY_COLUMNS = ("network", "status", "risk_level")
+
+TABLE_COLUMNS = ("name", "network", "address", "status", "security_score", "risk_level",
+                 "token", "token_decimals") + AMOUNT_FIELDS
+
+
+def to_units(raw: Optional[int], decimals: Optional[int] = DEFAULT_DECIMALS) -> float:
+    """Suma `raw` (unități de bază) în unități de token, pentru afișare."""
+    if raw is None:
+        return 0.0
+    decimals = DEFAULT_DECIMALS if decimals is None else decimals
+    return float(Decimal(int(raw)).scaleb(-int(decimals)))
+
+
+def build_results_table(results: Sequence[Dict[str, Any]]) -> "pd.DataFrame":
+    """Tabelul columnar al rezultatelor, construit într-o singură trecere.
+
+    Sumele sunt convertite în unități de token (float) cu zecimalele fiecărui
+    rând; valorile exacte rămân disponibile în coloanele `<sumă>_raw`.
+    """
+    import numpy as np
+    import pandas as pd
+
+    columns: Dict[str, List[Any]] = {name: [] for name in TABLE_COLUMNS}
+    raw: Dict[str, List[int]] = {name: [] for name in AMOUNT_FIELDS}
+    for result in results:
+        decimals = result.get("token_decimals")
+        for name in TABLE_COLUMNS:
+            if name in AMOUNT_FIELDS:
+                value = int(result.get(name) or 0)
+                raw[name].append(value)
+                columns[name].append(to_units(value, decimals))
+            else:
+                columns[name].append(result.get(name))
+
+    table = pd.DataFrame({
+        **{name: pd.Series(values, dtype="category") if name in CATEGORY_COLUMNS
+           else values for name, values in columns.items()},
+        **{f"{name}_raw": pd.Series(values, dtype=object) for name, values in raw.items()},
+    })
+    table["security_score"] = (pd.to_numeric(table["security_score"], errors="coerce")
+                               .fillna(0).astype(np.int16))
+    table["token_decimals"] = (pd.to_numeric(table["token_decimals"], errors="coerce")
+                               .fillna(DEFAULT_DECIMALS).astype(np.int16))
+    return table
+
+
+def as_results_table(data: Union["pd.DataFrame", Sequence[Dict[str, Any]]]) -> "pd.DataFrame":
+    """Returnează tabelul primit ca atare sau îl construiește din lista de rezultate."""
+    import pandas as pd
+
+    if isinstance(data, pd.DataFrame):
+        return data
+    return build_results_table(data or [])
@@ -0,0 +1,137 @@
+"""Transport JSON-RPC cu cereri batch pentru citirile independente (eth_getCode, eth_call)."""
+
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+from http_session import create_session
+from metrics import increment
+from rate_limiter import get_rate_limiter
+
+if TYPE_CHECKING:
+    import requests
+
+RpcRequest = Tuple[str, Sequence[Any]]
+
+
+class JsonRpcError(Exception):
+    """Eroare returnată de nod pentru o cerere individuală din batch."""
+
+    def __init__(self, error: Any) -> None:
+        if isinstance(error, dict):
+            self.code = error.get("code")
+            message = error.get("message", str(error))
+        else:
+            self.code = None
+            message = str(error)
+        super().__init__(message)
+
+
+class BatchRejected(JsonRpcError):
+    """Nodul a respins batch-ul în întregime (HTTP 4xx sau răspuns care nu este listă)."""
+
+
+class JsonRpcBatcher:
+    """Trimite liste de cereri JSON-RPC ca array-uri batch de cel mult `max_batch_size`.
+
+    Dacă nodul respinge un batch (HTTP 4xx precum 413, răspuns care nu este
+    listă sau răspunsuri lipsă), batch-ul este împărțit în două și reîncercat,
+    până la cereri individuale. O cădere de transport (conexiune, timeout,
+    HTTP 5xx după reîncercările sesiunii) nu este împărțită: fiecare cerere din
+    batch primește eroarea. Rezultatul fiecărei cereri este fie valoarea
+    `result`, fie o instanță `JsonRpcError`.
+    """
+
+    def __init__(self, url: str, max_batch_size: int = 100, timeout: float = 30,
+                 session: Optional["requests.Session"] = None) -> None:
+        self.url = url
+        self.max_batch_size = max(int(max_batch_size), 1)
+        self.timeout = timeout
+        self.session = session or create_session()
+        self.rate_limiter = get_rate_limiter(url, "rpc")
+
+    def call_many(self, calls: Sequence[RpcRequest]) -> List[Any]:
+        """Execută cererile `(metodă, parametri)` și returnează rezultatele în aceeași ordine."""
+        results: List[Any] = []
+        for start in range(0, len(calls), self.max_batch_size):
+            results.extend(self._send(list(calls[start:start + self.max_batch_size])))
+        return results
+
+    def _post(self, payload: List[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+        # Providerii taxează fiecare metodă din batch, nu cererea HTTP
+        self.rate_limiter.acquire(len(payload))
+        response = self.session.post(self.url, json=payload, timeout=self.timeout)
+        if response.status_code == 429:
+            self.rate_limiter.backoff()
+        elif 400 <= response.status_code < 500:
+            raise BatchRejected(f"HTTP {response.status_code}: {response.text[:200]}")
+        response.raise_for_status()
+        try:
+            data = response.json()
+        except ValueError:
+            raise BatchRejected(f"invalid JSON response: {response.text[:200]}")
+        if not isinstance(data, list):
+            raise BatchRejected(data.get("error", data) if isinstance(data, dict) else data)
+        return {item.get("id"): item for item in data if isinstance(item, dict)}
+
+    def _send(self, chunk: List[RpcRequest]) -> List[Any]:
+        payload = [
+            {"jsonrpc": "2.0", "id": i, "method": method, "params": list(params)}
+            for i, (method, params) in enumerate(chunk)
+        ]
+        try:
+            by_id = self._post(payload)
+        except BatchRejected as e:
+            if len(chunk) == 1:
+                return [e]
+            increment("rpc_batch_retries_total")
+            middle = len(chunk) // 2
+            return self._send(chunk[:middle]) + self._send(chunk[middle:])
+        except Exception as e:
+            # Nodul nu a răspuns; jumătățile ar eșua la fel, deci nu se împarte
+            increment("rpc_batch_failures_total")
+            error = JsonRpcError(str(e))
+            return [error] * len(chunk)
+
+        results: List[Any] = []
+        missing = []
+        for i in range(len(chunk)):
+            item = by_id.get(i)
+            if item is None:
+                missing.append(i)
+                results.append(None)
+            elif "error" in item:
+                results.append(JsonRpcError(item["error"]))
+            else:
+                results.append(item.get("result"))
+        if len(missing) == len(chunk):
+            if len(chunk) == 1:
+                return [JsonRpcError("missing response")]
+            increment("rpc_batch_retries_total")
+            middle = len(chunk) // 2
+            return self._send(chunk[:middle]) + self._send(chunk[middle:])
+        if missing:
+            increment("rpc_batch_retries_total")
+            retried = self._send([chunk[i] for i in missing])
+            for i, value in zip(missing, retried):
+                results[i] = value
+        return results
+
+    def get_codes(self, addresses: Sequence[str],
+                  block_identifier: Any = "latest") -> Dict[str, bytes]:
+        """Returnează codul runtime pentru fiecare adresă citită cu succes."""
+        results = self.call_many([("eth_getCode", [a, block_identifier]) for a in addresses])
+        return {
+            address: bytes.fromhex(result[2:])
+            for address, result in zip(addresses, results)
+            if isinstance(result, str)
+        }
+
+    def eth_call_many(self, calls: Sequence[Any],
+                      block_identifier: Any = "latest") -> List[Optional[bytes]]:
+        """Execută o listă de `multicall.EncodedCall`; None pentru apelurile eșuate."""
+        if not isinstance(block_identifier, str):
+            block_identifier = hex(block_identifier)
+        results = self.call_many([
+            ("eth_call", [{"to": c.target, "data": "0x" + c.data.hex()}, block_identifier])
+            for c in calls
+        ])
+        return [bytes.fromhex(r[2:]) if isinstance(r, str) else None for r in results]
@@ -0,0 +1,155 @@
+"""Clasificarea funcțiilor de vesting și scorul de securitate, pentru portofolii întregi.
+
+Listele de funcții ale tuturor contractelor sunt transformate într-o matrice
+booleană de caracteristici (contract x funcție de vesting), iar scorurile și
+nivelurile de risc se calculează într-o singură trecere vectorizată, cu un
+tabel de ponderi configurabil. `classify_functions` și `security_score`
+aplică aceleași reguli pentru un singur contract, fără costul pandas; numpy
+și pandas se importă abia la prima scorare vectorizată.
+
+O funcție de vesting este prezentă dacă numele ei apare, fără diferență între
+majuscule și minuscule, în numele unei funcții din ABI (ex. `release` se
+potrivește și cu `released`).
+"""
+
+import json
+import os
+from itertools import chain
+from typing import TYPE_CHECKING, Dict, Iterable, Mapping, Optional, Sequence
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+# Ponderea fiecărei funcții de vesting în scor
+DEFAULT_WEIGHTS: Dict[str, int] = {
+    # Funcții critice
+    "vestedAmount": 20,
+    "releasable": 20,
+    "release": 20,
+    # Funcții importante
+    "released": 10,
+    "cliff": 10,
+    "duration": 10,
+    "start": 10,
+    # Funcții auxiliare
+    "beneficiary": 5,
+    "owner": 5,
+    "token": 5,
+}
+VERIFIED_BONUS = 5
+MAX_SCORE = 100
+
+# (scor minim, nivel de risc), în ordine descrescătoare; sub ultimul prag: HIGH
+RISK_THRESHOLDS = ((80, "LOW"), (40, "MEDIUM"))
+DEFAULT_RISK_LEVEL = "HIGH"
+
+
+def load_weights(path: Optional[str] = None) -> Dict[str, int]:
+    """Returnează tabelul de ponderi, suprascris din fișierul JSON `SCORING_WEIGHTS`."""
+    weights = dict(DEFAULT_WEIGHTS)
+    path = path or os.getenv("SCORING_WEIGHTS")
+    if path:
+        with open(path, encoding="utf-8") as handle:
+            weights.update({str(k): int(v) for k, v in json.load(handle).items()})
+    return weights
+
+
+def classify_functions(functions: Iterable[str],
+                       features: Iterable[str] = DEFAULT_WEIGHTS) -> Dict[str, bool]:
+    """Marchează funcțiile de vesting prezente în lista de funcții a unui contract."""
+    names = [f.lower() for f in functions if f]
+    return {feature: any(feature.lower() in name for name in names) for feature in features}
+
+
+def security_score(found: Mapping[str, bool], verified: bool = True,
+                   weights: Optional[Mapping[str, int]] = None) -> int:
+    """Scorul unui singur contract, pe baza funcțiilor găsite."""
+    weights = DEFAULT_WEIGHTS if weights is None else weights
+    score = sum(weight for feature, weight in weights.items() if found.get(feature, False))
+    if verified:
+        score += VERIFIED_BONUS
+    return min(score, MAX_SCORE)
+
+
+def risk_level(score: int) -> str:
+    for threshold, level in RISK_THRESHOLDS:
+        if score >= threshold:
+            return level
+    return DEFAULT_RISK_LEVEL
+
+
+def feature_matrix(function_lists: Sequence[Iterable[str]],
+                   features: Iterable[str] = DEFAULT_WEIGHTS) -> "pd.DataFrame":
+    """Construiește matricea booleană contract x funcție de vesting.
+
+    Potrivirea pe subșiruri se face o singură dată pentru fiecare nume unic
+    de funcție din portofoliu, apoi rezultatul este distribuit contractelor.
+    """
+    import numpy as np
+    import pandas as pd
+
+    features = list(features)
+    function_lists = [list(functions) for functions in function_lists]
+    matrix = np.zeros((len(function_lists), len(features)), dtype=bool)
+
+    lengths = np.fromiter(map(len, function_lists), dtype=np.int64, count=len(function_lists))
+    flat = list(chain.from_iterable(function_lists))
+    if flat and features:
+        codes, uniques = pd.factorize(np.array(flat, dtype=object))
+        lowered = [str(name).lower() for name in uniques]
+        # Ultimul rând (fals) corespunde codului -1 al valorilor lipsă
+        unique_hits = np.zeros((len(lowered) + 1, len(features)), dtype=bool)
+        for j, feature in enumerate(features):
+            key = feature.lower()
+            unique_hits[:-1, j] = [key in name for name in lowered]
+        hits = unique_hits[codes]
+
+        # Funcțiile fiecărui contract sunt consecutive în `flat`
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        nonempty = lengths > 0
+        matrix[nonempty] = np.logical_or.reduceat(hits, starts[nonempty], axis=0)
+
+    return pd.DataFrame(matrix, columns=features)
+
+
+def score_matrix(features: "pd.DataFrame", verified: Optional[Sequence[bool]] = None,
+                 weights: Optional[Mapping[str, int]] = None) -> "np.ndarray":
+    """Calculează scorurile pentru toate rândurile matricei de caracteristici."""
+    import numpy as np
+
+    weights = DEFAULT_WEIGHTS if weights is None else weights
+    vector = np.array([weights.get(column, 0) for column in features.columns], dtype=np.int64)
+    scores = features.to_numpy(dtype=np.int64) @ vector
+    if verified is None:
+        scores += VERIFIED_BONUS
+    else:
+        scores += np.asarray(verified, dtype=bool) * VERIFIED_BONUS
+    return np.minimum(scores, MAX_SCORE)
+
+
+def risk_levels(scores: "np.ndarray") -> "np.ndarray":
+    import numpy as np
+
+    return np.select(
+        [scores >= threshold for threshold, _ in RISK_THRESHOLDS],
+        [level for _, level in RISK_THRESHOLDS],
+        default=DEFAULT_RISK_LEVEL,
+    )
+
+
+def score_portfolio(function_lists: Sequence[Iterable[str]],
+                    verified: Optional[Sequence[bool]] = None,
+                    weights: Optional[Mapping[str, int]] = None) -> "pd.DataFrame":
+    """Clasifică și notează un portofoliu întreg într-o singură trecere.
+
+    Returnează câte un rând per contract, cu o coloană booleană pentru fiecare
+    funcție de vesting, plus `security_score` și `risk_level`.
+    """
+    weights = DEFAULT_WEIGHTS if weights is None else weights
+    table = feature_matrix(function_lists, weights)
+    scores = score_matrix(table, verified, weights)
+    table["security_score"] = scores
+    table["risk_level"] = risk_levels(scores)
+    return table
+
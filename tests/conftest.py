@@ -1,2 +1,79 @@
 import os
 os.environ.setdefault('PYTEST_DISABLE_PLUGIN_AUTOLOAD', '1')
+
+import random
+import threading
+
+import pytest
+
+
+class FakeEtherscan:
+    def __init__(self, metadata):
+        self.metadata = metadata
+        self.calls = 0
+
+    def get_contract_metadata(self, address):
+        self.calls += 1
+        return self.metadata
+
+
+@pytest.fixture
+def fake_etherscan():
+    """Clasa FakeEtherscan: `fake_etherscan(metadata)` numără cererile getsourcecode."""
+    return FakeEtherscan
+
+
+@pytest.fixture
+def make_backend():
+    """Fabrică de ChainBackend fără conexiune, cu atributele date."""
+    from collections import OrderedDict
+    from chain_backend import ChainBackend
+
+    def make(**attributes):
+        # Starea unui backend al cărui nod nu a răspuns, fără rețea la creare
+        backend = ChainBackend.__new__(ChainBackend)
+        backend.network = "mainnet"
+        backend.abi_cache = None
+        backend.etherscan = None
+        backend.rpc_batcher = None
+        backend.proxies = None
+        backend.w3 = None
+        backend.multicall = None
+        backend._metadata = OrderedDict()
+        backend._metadata_lock = threading.Lock()
+        backend._decimals = {}
+        backend._decimals_lock = threading.Lock()
+        for name, value in attributes.items():
+            setattr(backend, name, value)
+        return backend
+
+    return make
+
+
+@pytest.fixture
+def make_analyzer(make_backend):
+    """Fabrică de VestingContractAnalyzer peste un backend fals, cu analiza per contract simulată.
+
+    `make_analyzer(backend=..., clone_index=...)` trece dublurile prin
+    constructorul real; implicit backend-ul nu are conexiune, iar indexul de
+    clone este în memorie.
+    """
+    import web3_integration
+    from clone_index import CloneIndex
+    from scoring import DEFAULT_WEIGHTS
+
+    def make(backend=None, clone_index=None):
+        analyzer = web3_integration.VestingContractAnalyzer(
+            backend=backend if backend is not None else make_backend(),
+            clone_index=clone_index if clone_index is not None else CloneIndex(":memory:"),
+        )
+        analyzer.score_weights = dict(DEFAULT_WEIGHTS)
+
+        def fake_analyze(address, name="", beneficiary_address=None, prefetched=None):
+            threading.Event().wait(random.random() / 100)
+            return {"address": address, "name": name, "status": "success"}
+
+        analyzer.analyze_contract = fake_analyze
+        return analyzer
+
+    return make
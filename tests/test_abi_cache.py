@@ -0,0 +1,64 @@
+from abi_cache import AbiCache
+
+ABI = [{"type": "function", "name": "vestedAmount", "inputs": [], "outputs": []}]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_cache(tmp_path, **kwargs):
+    clock = FakeClock()
+    return AbiCache(str(tmp_path / "abi.sqlite3"), clock=clock, **kwargs), clock
+
+
+def test_roundtrip_is_case_insensitive_and_persistent(tmp_path):
+    cache, clock = make_cache(tmp_path)
+    cache.put("Mainnet", "0xABC", ABI)
+
+    assert cache.get("mainnet", "0xabc") == (True, ABI)
+    reopened = AbiCache(str(tmp_path / "abi.sqlite3"), clock=clock)
+    assert reopened.get("mainnet", "0xabc") == (True, ABI)
+
+
+def test_negative_entries_expire_sooner(tmp_path):
+    cache, clock = make_cache(tmp_path, ttl=100, negative_ttl=10)
+    cache.put("mainnet", "0x1", ABI)
+    cache.put("mainnet", "0x2", None)
+
+    assert cache.get("mainnet", "0x2") == (True, None)
+    clock.now += 50
+    assert cache.get("mainnet", "0x2") == (False, None)
+    assert cache.get("mainnet", "0x1") == (True, ABI)
+    clock.now += 100
+    assert cache.get("mainnet", "0x1") == (False, None)
+
+
+def test_lru_eviction(tmp_path):
+    cache, clock = make_cache(tmp_path, max_entries=2)
+    cache.put("mainnet", "0x1", ABI)
+    clock.now += 1
+    cache.put("mainnet", "0x2", ABI)
+    clock.now += 1
+    cache.get("mainnet", "0x1")
+    clock.now += 1
+    cache.put("mainnet", "0x3", ABI)
+
+    assert len(cache) == 2
+    assert cache.get("mainnet", "0x2") == (False, None)
+    assert cache.get("mainnet", "0x1")[0]
+
+
+def test_signature_index_is_stored_with_abi(tmp_path):
+    cache, _ = make_cache(tmp_path)
+    cache.put("mainnet", "0x1", ABI)
+    cache.put("mainnet", "0x2", None)
+
+    assert cache.get_signatures("mainnet", "0x1") == {
+        "vestedAmount": [{"inputs": [], "outputs": [], "stateMutability": "nonpayable"}]
+    }
+    assert cache.get_signatures("mainnet", "0x2") is None
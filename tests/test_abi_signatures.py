@@ -0,0 +1,33 @@
+from abi_signatures import build_signature_index, resolve_call_args
+
+ABI = [
+    {"type": "function", "name": "released", "stateMutability": "view",
+     "inputs": [], "outputs": [{"type": "uint256"}]},
+    {"type": "function", "name": "released", "stateMutability": "view",
+     "inputs": [{"name": "token", "type": "address"}], "outputs": [{"type": "uint256"}]},
+    {"type": "function", "name": "vestedAmount", "stateMutability": "view",
+     "inputs": [{"name": "timestamp", "type": "uint64"}], "outputs": [{"type": "uint256"}]},
+    {"type": "function", "name": "release", "stateMutability": "nonpayable",
+     "inputs": [], "outputs": []},
+    {"type": "function", "name": "totalSupply", "constant": True,
+     "inputs": [], "outputs": [{"type": "uint256"}]},
+]
+
+
+def test_index_records_overloads_and_legacy_constant():
+    index = build_signature_index(ABI)
+
+    assert [o["inputs"] for o in index["released"]] == [[], ["address"]]
+    assert index["totalSupply"][0]["stateMutability"] == "view"
+
+
+def test_resolve_call_args_picks_overload_without_probing():
+    index = build_signature_index(ABI)
+
+    assert resolve_call_args(index, "released", "0xbb") == ("0xbb",)
+    assert resolve_call_args(index, "released", "0xbb", prefer_address=False) == ()
+    assert resolve_call_args(index, "released") == ()
+    assert resolve_call_args(index, "vestedAmount", "0xbb") is None
+    assert resolve_call_args(index, "release") is None
+    assert resolve_call_args(index, "totalSupply", "0xbb") == ()
+    assert resolve_call_args(index, "missing") is None
@@ -0,0 +1,71 @@
+from analyzer_registry import AnalyzerRegistry
+
+
+class FakeEth:
+    def __init__(self):
+        self.up = True
+
+    @property
+    def block_number(self):
+        if not self.up:
+            raise ConnectionError("down")
+        return 1
+
+
+class FakeW3:
+    def __init__(self):
+        self.eth = FakeEth()
+
+
+class FakeAnalyzer:
+    created = 0
+
+    def __init__(self, network):
+        FakeAnalyzer.created += 1
+        self.network = network
+        self.w3 = FakeW3()
+
+
+def test_registry_reuses_and_lazily_recreates_analyzers():
+    registry = AnalyzerRegistry(health_check_interval=0)
+    FakeAnalyzer.created = 0
+
+    first = registry.get("Mainnet", FakeAnalyzer)
+    assert registry.get("mainnet", FakeAnalyzer) is first
+    assert registry.get("polygon", FakeAnalyzer) is not first
+    assert FakeAnalyzer.created == 2
+
+    first.w3.eth.up = False
+    registry.check_all()
+    replacement = registry.get("mainnet", FakeAnalyzer)
+    assert replacement is not first
+    assert FakeAnalyzer.created == 3
+
+
+def test_registry_does_not_cache_failed_creation():
+    registry = AnalyzerRegistry(health_check_interval=0)
+    calls = []
+
+    def factory(network):
+        calls.append(network)
+        return None
+
+    assert registry.get("mainnet", factory) is None
+    assert registry.get("mainnet", factory) is None
+    assert calls == ["mainnet", "mainnet"]
+
+
+def test_registry_does_not_cache_analyzer_without_connection():
+    from types import SimpleNamespace
+
+    registry = AnalyzerRegistry(health_check_interval=0)
+    created = []
+
+    def factory(network):
+        # ca VestingAnalyzer când ChainBackend nu s-a putut conecta
+        created.append(SimpleNamespace(web3_conn=SimpleNamespace(w3=None)))
+        return created[-1]
+
+    assert registry.get("mainnet", factory) is None
+    assert registry.get("mainnet", factory) is None
+    assert len(created) == 2
@@ -0,0 +1,51 @@
+from benchmarks.bench_analyzer import SCENARIOS, LatencyRecorder, run_benchmark
+
+
+def test_offline_benchmark_runs_against_mock_server():
+    rows = run_benchmark([3], workers=2)
+
+    assert [row["scenario"] for row in rows] == list(SCENARIOS)
+    for row in rows:
+        assert row["contracts"] == 3
+        assert row["failed"] == 0
+        assert row["contracts_per_sec"] > 0
+        assert row["p99_ms"] >= row["p50_ms"] > 0
+
+    full, connector = rows
+    # contractele mock au același cod: o singură analiză statică pentru toată familia
+    assert full["requests"]["etherscan:getsourcecode"] == 1
+    # cele trei contracte încap într-un singur apel getcontractcreation
+    assert full["requests"]["etherscan:getcontractcreation"] == 1
+    # legătura nu mai este verificată per contract, doar la crearea analizorului
+    assert full["requests"].get("rpc:web3_clientVersion", 0) <= 1
+    # vestedAmount, released și token() pleacă într-un singur aggregate3 per contract,
+    # iar decimals() al token-ului comun se citește o singură dată
+    assert connector["requests"]["rpc:eth_call"] == 3 + 1
+
+
+def test_unique_code_analyzes_every_contract():
+    (row,) = run_benchmark([3], scenarios=("analyze_multiple_contracts",), workers=2,
+                           unique_code=True)
+
+    assert row["failed"] == 0
+    assert row["requests"]["etherscan:getsourcecode"] == 3
+
+
+def test_latency_recorder_counts_failed_calls():
+    class Connector:
+        def get_vesting_data(self, address):
+            if address == "bad":
+                raise ValueError("Unable to fetch contract ABI")
+            return {}
+
+    connector = Connector()
+    recorder = LatencyRecorder(connector, "get_vesting_data")
+    for address in ("good", "bad", "good"):
+        try:
+            connector.get_vesting_data(address)
+        except ValueError:
+            pass
+    recorder.restore()
+
+    assert len(recorder.samples) == 3
+    assert recorder.failures == 1
@@ -0,0 +1,110 @@
+import json
+import threading
+
+import pytest
+
+import bulk_analyze
+
+
+class FakeAnalyzer:
+    def __init__(self, fail_after=None):
+        self.analyzed = []
+        self.fail_after = fail_after
+
+    def iter_analyze_contracts(self, contracts_data, max_workers=1, cancel_event=None):
+        for i, data in enumerate(contracts_data):
+            if self.fail_after is not None and len(self.analyzed) >= self.fail_after:
+                raise RuntimeError("crash")
+            self.analyzed.append(data["address"])
+            yield i, {"address": data["address"], "name": data["name"], "status": "success",
+                      "creation_info": {"txHash": "0x1"}}
+
+
+def write_csv(path, count):
+    lines = ["Address,Name,Beneficiary"]
+    lines += [f"0x{i:040x},C{i}," for i in range(count)]
+    path.write_text("\n".join(lines) + "\n")
+
+
+def test_iter_input_rows_reads_csv_and_jsonl(tmp_path):
+    csv_path = tmp_path / "in.csv"
+    csv_path.write_text("address,name,beneficiary\n0xA,First,0xB\n,,\n")
+    jsonl_path = tmp_path / "in.jsonl"
+    jsonl_path.write_text('{"address": "0xC"}\n\n')
+
+    assert list(bulk_analyze.iter_input_rows(str(csv_path))) == [
+        {"address": "0xA", "name": "First", "beneficiary": "0xB"}
+    ]
+    assert list(bulk_analyze.iter_input_rows(str(jsonl_path))) == [
+        {"address": "0xC", "name": "", "beneficiary": None}
+    ]
+
+
+def test_resume_skips_contracts_already_written(tmp_path):
+    input_path = tmp_path / "in.csv"
+    output_path = tmp_path / "out.jsonl"
+    write_csv(input_path, 7)
+
+    crashing = FakeAnalyzer(fail_after=4)
+    with pytest.raises(RuntimeError):
+        bulk_analyze.run_bulk_analysis(crashing, str(input_path), str(output_path),
+                                       chunk_size=3)
+
+    resumed = FakeAnalyzer()
+    stats = bulk_analyze.run_bulk_analysis(resumed, str(input_path), str(output_path),
+                                           chunk_size=3)
+
+    lines = [json.loads(line) for line in output_path.read_text().splitlines()]
+    assert len(resumed.analyzed) == 3
+    assert stats == {"analyzed": 3, "skipped": 4, "errors": 0}
+    assert sorted(r["address"] for r in lines) == [f"0x{i:040x}" for i in range(7)]
+
+
+def test_next_chunk_starts_while_the_slow_tail_finishes(tmp_path):
+    tail_released = threading.Event()
+
+    class SlowTailAnalyzer(FakeAnalyzer):
+        def iter_analyze_contracts(self, contracts_data, max_workers=1, cancel_event=None):
+            for i, data in enumerate(contracts_data):
+                if data["address"] == f"0x{2:040x}":
+                    # ultimul contract al primului grup așteaptă grupul următor
+                    assert tail_released.wait(5)
+                elif data["address"] == f"0x{3:040x}":
+                    tail_released.set()
+                self.analyzed.append(data["address"])
+                yield i, {"address": data["address"], "status": "success"}
+
+    input_path = tmp_path / "in.csv"
+    output_path = tmp_path / "out.jsonl"
+    write_csv(input_path, 6)
+    analyzer = SlowTailAnalyzer()
+
+    stats = bulk_analyze.run_bulk_analysis(analyzer, str(input_path), str(output_path),
+                                           workers=1, chunk_size=3)
+
+    assert stats == {"analyzed": 6, "skipped": 0, "errors": 0}
+    assert analyzer.analyzed.index(f"0x{3:040x}") < analyzer.analyzed.index(f"0x{2:040x}")
+    lines = [json.loads(line) for line in output_path.read_text().splitlines()]
+    assert sorted(r["address"] for r in lines) == [f"0x{i:040x}" for i in range(6)]
+
+
+def test_jsonl_writer_syncs_by_row_count_or_interval(tmp_path, monkeypatch):
+    syncs = []
+    monkeypatch.setattr(bulk_analyze.os, "fsync", syncs.append)
+    now = [0.0]
+    writer = bulk_analyze.JsonlWriter(str(tmp_path / "out.jsonl"), flush_rows=3,
+                                      flush_interval=5.0, clock=lambda: now[0])
+
+    for _ in range(2):
+        writer.write({"status": "success"})
+    assert not writer.flush_due()
+    writer.write({"status": "success"})
+    assert writer.flush_due()
+    writer.flush()
+
+    writer.write({"status": "success"})
+    assert not writer.flush_due()
+    now[0] += 5
+    assert writer.flush_due()
+    writer.close()
+    assert len(syncs) == 2
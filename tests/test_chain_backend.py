@@ -0,0 +1,150 @@
+from types import SimpleNamespace
+
+import pytest
+from eth_abi import encode
+from eth_abi.abi import default_codec
+
+import chain_backend
+from chain_backend import (ChainBackend, InfuraProvider, JsonRpcProvider, LocalNodeProvider,
+                           provider_from_env, register_provider)
+from multicall import EncodedCall
+
+
+@pytest.fixture
+def clean_env(monkeypatch):
+    for name in ("RPC_PROVIDER", "RPC_URL", "INFURA_PROJECT_ID", "LOCAL_NODE_URL",
+                 "ETHERSCAN_API_URL", "DEFAULT_NETWORK"):
+        monkeypatch.delenv(name, raising=False)
+        for network in chain_backend.SUPPORTED_NETWORKS:
+            monkeypatch.delenv(f"{name}_{network.upper()}", raising=False)
+    return monkeypatch
+
+
+def test_provider_defaults_to_infura_and_to_rpc_url_when_set(clean_env):
+    clean_env.setenv("INFURA_PROJECT_ID", "pid")
+    provider = provider_from_env()
+    assert isinstance(provider, InfuraProvider)
+    assert provider.rpc_url("polygon") == "https://polygon-mainnet.infura.io/v3/pid"
+
+    clean_env.setenv("RPC_URL", "http://node:8545")
+    provider = provider_from_env()
+    assert isinstance(provider, JsonRpcProvider)
+    assert provider.rpc_url("mainnet") == "http://node:8545"
+
+
+def test_generic_urls_apply_only_to_the_default_network(clean_env):
+    clean_env.setenv("RPC_URL", "http://node:8545")
+    clean_env.setenv("RPC_URL_POLYGON", "http://polygon:8545")
+    provider = provider_from_env()
+    assert provider.rpc_url("polygon") == "http://polygon:8545"
+    with pytest.raises(EnvironmentError, match="RPC_URL_GOERLI"):
+        provider.rpc_url("goerli")
+
+    clean_env.setenv("DEFAULT_NETWORK", "goerli")
+    assert provider_from_env().rpc_url("goerli") == "http://node:8545"
+    with pytest.raises(EnvironmentError):
+        provider_from_env().rpc_url("mainnet")
+
+    clean_env.setenv("ETHERSCAN_API_URL", "http://scan/api")
+    assert chain_backend.network_setting("ETHERSCAN_API_URL", "goerli") == "http://scan/api"
+    assert chain_backend.network_setting("ETHERSCAN_API_URL", "polygon") is None
+
+
+def test_node_of_another_chain_is_refused(clean_env):
+    from benchmarks.mock_server import MockChainServer
+
+    with MockChainServer() as server:
+        provider = JsonRpcProvider({"polygon": f"{server.url}/rpc", "mainnet": f"{server.url}/rpc"})
+        assert ChainBackend("polygon", provider=provider).w3 is None
+        assert ChainBackend("mainnet", provider=provider).w3 is not None
+
+
+def test_local_provider_and_missing_configuration(clean_env):
+    clean_env.setenv("RPC_PROVIDER", "local")
+    assert provider_from_env().rpc_url("mainnet") == LocalNodeProvider.DEFAULT_URL
+
+    clean_env.setenv("RPC_PROVIDER", "infura")
+    with pytest.raises(EnvironmentError):
+        provider_from_env()
+    clean_env.setenv("RPC_PROVIDER", "nope")
+    with pytest.raises(ValueError):
+        provider_from_env()
+
+
+def test_registered_provider_is_selectable(clean_env):
+    class Fixed(JsonRpcProvider):
+        name = "fixed"
+
+    clean_env.setattr(chain_backend, "PROVIDERS", dict(chain_backend.PROVIDERS))
+    register_provider("Fixed", lambda: Fixed("http://fixed"))
+    clean_env.setenv("RPC_PROVIDER", "fixed")
+    assert provider_from_env().rpc_url("mainnet") == "http://fixed"
+
+
+def test_explicit_empty_abi_cache_is_kept(clean_env):
+    from abi_cache import AbiCache
+    from benchmarks.mock_server import MockChainServer
+
+    cache = AbiCache(":memory:")
+    with MockChainServer() as server:
+        backend = ChainBackend("mainnet", provider=JsonRpcProvider(f"{server.url}/rpc"),
+                               abi_cache=cache)
+    assert backend.abi_cache is cache
+
+
+def test_provider_must_implement_rpc_url():
+    class Incomplete(chain_backend.Provider):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_unsupported_network_is_rejected():
+    with pytest.raises(ValueError):
+        ChainBackend("solana", provider=JsonRpcProvider("http://node"))
+
+
+class FakeBatcher:
+    def __init__(self, results):
+        self.results = results
+        self.batches = []
+
+    def eth_call_many(self, calls, block_identifier="latest"):
+        self.batches.append(list(calls))
+        return self.results
+
+
+def test_call_views_falls_back_to_one_batch_without_multicall(make_backend):
+    calls = [EncodedCall("0xaa", b"\x01", ["uint256"]), EncodedCall("0xaa", b"\x02", ["uint256"])]
+    batcher = FakeBatcher([encode(["uint256"], [7]), None])
+    backend = make_backend(w3=SimpleNamespace(codec=default_codec), rpc_batcher=batcher)
+
+    assert backend.call_views(calls) == [(True, 7), (False, None)]
+    assert len(batcher.batches) == 1
+
+
+def test_call_views_without_connection_reports_failures(make_backend):
+    calls = [EncodedCall("0xaa", b"\x01", ["uint256"])]
+    assert make_backend().call_views(calls) == [(False, None)]
+    assert make_backend().call_views([]) == []
+
+
+def test_token_decimals_are_read_once_per_token(make_backend):
+    import threading
+
+    batcher = FakeBatcher([encode(["uint8"], [6]), None])
+    backend = make_backend(w3=SimpleNamespace(codec=default_codec), rpc_batcher=batcher,
+                           _decimals={}, _decimals_lock=threading.Lock())
+
+    usdc, nodec = "0x" + "a0" * 20, "0x" + "b1" * 20
+
+    assert backend.token_decimals([usdc.upper().replace("0X", "0x"), None, nodec]) == {
+        usdc: 6, nodec: 18
+    }
+    batcher.results = [None]
+    assert backend.token_decimals([usdc, nodec]) == {usdc: 6, nodec: 18}
+    # USDC vine din memorie; doar tokenul fără decimals() este cerut din nou
+    assert [[call.target.lower() for call in batch] for batch in batcher.batches] == [
+        [usdc, nodec], [nodec]
+    ]
@@ -0,0 +1,65 @@
+from chart_data import aggregate_results, score_bin_labels, score_histogram, top_n_with_other
+from gradio_vesting_app import (create_risk_distribution_chart, create_security_scores_chart,
+                                create_token_distribution_chart)
+from results_table import build_results_table
+from vesting_logic import generate_security_chart, generate_token_chart
+
+
+def make_table(size, networks=("mainnet",)):
+    return build_results_table([
+        {"name": f"C{i}", "network": networks[i % len(networks)], "address": f"0x{i:040x}",
+         "status": "success", "security_score": i % 101,
+         "risk_level": "LOW" if i % 101 >= 80 else "HIGH", "vested_amount": (i + 1) * 10**18}
+        for i in range(size)
+    ])
+
+
+def test_score_histogram_covers_fixed_bins():
+    assert score_bin_labels()[0] == "0-9"
+    assert score_bin_labels()[-1] == "90-100"
+    table = make_table(101)
+
+    bins = score_histogram(table)
+
+    assert list(bins["score_range"].astype(str)) == score_bin_labels()
+    assert bins["contracts"].tolist() == [10] * 9 + [11]
+
+
+def test_top_n_keeps_the_total_in_an_other_bucket():
+    table = make_table(50)
+
+    top = top_n_with_other(table, "vested_amount", "name", n=3)
+
+    assert top["name"].tolist() == ["C49", "C48", "C47", "Altele (47)"]
+    assert top["contracts"].tolist() == [1, 1, 1, 47]
+    assert top["vested_amount"].sum() == table["vested_amount"].sum()
+    assert len(top_n_with_other(table.head(2), "vested_amount", "name", n=3)) == 2
+
+
+def test_aggregates_and_charts_do_not_grow_with_the_portfolio():
+    small, large = make_table(200, ("mainnet", "polygon")), make_table(5000, ("mainnet", "polygon"))
+    sizes = []
+    for table in (small, large):
+        aggregates = aggregate_results(table, top_n=5)
+        assert aggregates["scores"]["contracts"].sum() == len(table)
+        assert set(aggregates["rollup"]["network"]) == {"mainnet", "polygon"}
+        assert aggregates["rollup"]["contracts"].sum() == len(table)
+        assert len(aggregates["top"]) == 6
+        charts = (create_security_scores_chart(table, aggregates),
+                  create_token_distribution_chart(table, aggregates),
+                  create_risk_distribution_chart(table, aggregates))
+        sizes.append(sum(len(chart.to_json()) for chart in charts))
+
+    assert abs(sizes[0] - sizes[1]) < 0.05 * sizes[0]
+
+
+def test_vesting_logic_charts_use_the_same_aggregates():
+    rows = [{"Contract": f"C{i}", "Vested": float(i), "Security Score": i % 101}
+            for i in range(500)]
+
+    security = generate_security_chart(rows)
+    tokens = generate_token_chart(rows)
+
+    assert sum(security.data[0].y) == 500
+    assert len(tokens.data[0].labels) <= 16
+    assert tokens.data[0].labels[-1].startswith("Other")
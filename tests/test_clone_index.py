@@ -0,0 +1,112 @@
+import threading
+
+from clone_index import CloneIndex, code_hash
+
+ABI = [{"type": "function", "name": "release", "inputs": [], "outputs": []}]
+
+
+def make_profile(**overrides):
+    profile = {"abi_address": "0xIMPL", "abi": ABI, "functions": ["release"],
+               "vesting_functions": {"release": True}, "is_verified": True,
+               "security_score": 25, "weights": {"release": 20}}
+    profile.update(overrides)
+    return profile
+
+
+def test_code_hash_includes_implementation():
+    code = bytes.fromhex("6080604052")
+
+    assert code_hash(code) == code_hash(bytearray(code))
+    assert code_hash(code, "0x" + "11" * 20) != code_hash(code, "0x" + "22" * 20)
+    assert code_hash(code, "0x" + "11" * 20) != code_hash(code)
+
+
+def test_profile_round_trip(tmp_path):
+    index = CloneIndex(str(tmp_path / "clones.sqlite3"))
+    index.put("MAINNET", "abc", make_profile())
+
+    reopened = CloneIndex(str(tmp_path / "clones.sqlite3"))
+    profile = reopened.get("mainnet", "abc")
+    assert profile["abi"] == ABI
+    assert profile["abi_address"] == "0ximpl"
+    assert profile["vesting_functions"] == {"release": True}
+    assert reopened.get("polygon", "abc") is None
+
+
+def test_concurrent_members_compute_family_once():
+    index = CloneIndex(":memory:")
+    started = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.wait(0.05)
+        return make_profile()
+
+    threads = [threading.Thread(target=index.get_or_compute, args=("mainnet", "abc", compute))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(index) == 1
+
+
+def test_failed_compute_is_not_stored():
+    index = CloneIndex(":memory:")
+
+    def compute():
+        raise ValueError("Nu s-a putut obține ABI-ul contractului")
+
+    try:
+        index.get_or_compute("mainnet", "abc", compute)
+    except ValueError:
+        pass
+    assert len(index) == 0
+    assert index.get_or_compute("mainnet", "abc", make_profile)["security_score"] == 25
+
+
+def test_analyzer_rescores_cached_profile_with_current_weights(make_analyzer):
+    analyzer = make_analyzer(clone_index=CloneIndex(":memory:"))
+    analyzer.score_weights = {"release": 50}
+    code = bytes.fromhex("6080604052")
+    analyzer.clone_index.put("mainnet", code_hash(code), make_profile())
+
+    profile = analyzer.get_contract_profile("0x" + "33" * 20, code)
+
+    assert profile["abi"] == ABI
+    assert profile["security_score"] == 55
+    assert profile["weights"] == {"release": 50}
+
+
+def test_entries_expire_and_old_versions_are_ignored(tmp_path):
+    import sqlite3
+
+    now = [1000.0]
+    path = str(tmp_path / "clones.sqlite3")
+    index = CloneIndex(path, ttl=60, clock=lambda: now[0])
+    index.put("mainnet", "abc", make_profile())
+    assert index.get("mainnet", "abc") is not None
+
+    now[0] += 61
+    assert index.get("mainnet", "abc") is None
+
+    index.put("mainnet", "abc", make_profile())
+    with sqlite3.connect(path) as conn:
+        conn.execute("UPDATE clone_families SET version = 0")
+    assert index.get("mainnet", "abc") is None
+
+
+def test_family_locks_are_released_after_compute():
+    index = CloneIndex(":memory:")
+
+    for key in ("a", "b", "c"):
+        index.get_or_compute("mainnet", key, make_profile)
+    try:
+        index.get_or_compute("mainnet", "d", lambda: 1 / 0)
+    except ZeroDivisionError:
+        pass
+
+    assert index._family_locks == {}
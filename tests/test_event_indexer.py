@@ -0,0 +1,159 @@
+import threading
+
+from event_indexer import (RELEASE_TOPICS, TRANSFER_TOPIC, EventIndex, EventIndexer,
+                           decode_log, is_result_limit_error)
+from rpc_batch import JsonRpcError
+
+VESTING = "0x" + "a" * 40
+TOKEN = "0x" + "7" * 40
+BENEFICIARY = "0x" + "b" * 40
+ERC20_RELEASED = next(t for t, name in RELEASE_TOPICS.items() if name == "ERC20Released")
+
+
+def topic(address):
+    return "0x" + address[2:].rjust(64, "0")
+
+
+def word(value):
+    return f"{value:064x}"
+
+
+class FakeLogsNode:
+    def __init__(self, logs, max_span):
+        self.logs = logs
+        self.max_span = max_span
+        self.windows = []
+        self._lock = threading.Lock()
+
+    def call_many(self, calls):
+        results = []
+        for method, (log_filter,) in calls:
+            start, end = int(log_filter["fromBlock"], 16), int(log_filter["toBlock"], 16)
+            with self._lock:
+                self.windows.append((start, end))
+            if end - start + 1 > self.max_span:
+                results.append(JsonRpcError({"code": -32005, "message": "query returned more than 10000 results"}))
+                continue
+            wanted = log_filter.get("topics", [None])
+            results.append([
+                log for log in self.logs
+                if start <= int(log["blockNumber"], 16) <= end and self._matches(log, log_filter, wanted)
+            ])
+        return results
+
+    @staticmethod
+    def _matches(log, log_filter, wanted):
+        if "address" in log_filter and log["address"] not in log_filter["address"]:
+            return False
+        for position, expected in enumerate(wanted):
+            if expected is None:
+                continue
+            options = expected if isinstance(expected, list) else [expected]
+            if position >= len(log["topics"]) or log["topics"][position] not in options:
+                return False
+        return True
+
+
+def release_log(block, amount, log_index=0):
+    return {"address": VESTING, "blockNumber": hex(block), "logIndex": hex(log_index),
+            "transactionHash": f"0x{block:064x}", "topics": [ERC20_RELEASED, topic(TOKEN)],
+            "data": "0x" + word(amount)}
+
+
+def transfer_log(block, sender, recipient, amount, log_index=1):
+    return {"address": TOKEN, "blockNumber": hex(block), "logIndex": hex(log_index),
+            "transactionHash": f"0x{block:064x}",
+            "topics": [TRANSFER_TOPIC, topic(sender), topic(recipient)],
+            "data": "0x" + word(amount)}
+
+
+def test_decode_log_handles_release_and_transfer():
+    release = decode_log(release_log(10, 2 ** 200), [VESTING])
+    assert release[0]["event"] == "ERC20Released"
+    assert release[0]["token"] == TOKEN
+    assert release[0]["amount"] == str(2 ** 200)
+
+    transfer = decode_log(transfer_log(10, VESTING, BENEFICIARY, 5), [VESTING])
+    assert [(r["contract"], r["recipient"]) for r in transfer] == [(VESTING, BENEFICIARY)]
+    assert decode_log(transfer_log(10, BENEFICIARY, TOKEN, 5), [VESTING]) == []
+
+
+def test_update_shrinks_windows_and_resumes_from_cursor(tmp_path):
+    logs = [release_log(1500, 100), transfer_log(1500, VESTING, BENEFICIARY, 100),
+            transfer_log(800, BENEFICIARY, VESTING, 1000)]
+    node = FakeLogsNode(logs, max_span=300)
+    index = EventIndex(str(tmp_path / "events.sqlite3"))
+    indexer = EventIndexer(node, index, "mainnet", initial_chunk=1000, max_workers=2,
+                           confirmations=0)
+
+    stats = indexer.update([VESTING], 1999, start_blocks={VESTING: 500})
+
+    assert stats == {"contracts": 1, "scanned": 1, "logs": 3, "errors": 0}
+    assert index.cursors("mainnet", [VESTING]) == {VESTING: 1999}
+    history = index.history("mainnet", VESTING)
+    assert list(history["block_number"]) == [800, 1500, 1500]
+    assert min(start for start, _ in node.windows) == 500
+
+    node.logs.append(release_log(2100, 50))
+    node.windows.clear()
+    indexer.update([VESTING], 2200)
+
+    assert min(start for start, _ in node.windows) == 2000
+    assert len(index.history("mainnet", VESTING)) == 4
+
+
+def test_update_stops_below_the_confirmation_depth(tmp_path):
+    node = FakeLogsNode([release_log(1000, 1), release_log(1990, 2)], max_span=10**6)
+    index = EventIndex(str(tmp_path / "events.sqlite3"))
+    indexer = EventIndexer(node, index, "mainnet", confirmations=64)
+
+    indexer.update([VESTING], 2000, start_blocks={VESTING: 0})
+
+    # blocul 1990 poate fi încă reorganizat: nu este indexat, iar cursorul rămâne sub el
+    assert index.cursors("mainnet", [VESTING]) == {VESTING: 1936}
+    assert list(index.history("mainnet", VESTING)["block_number"]) == [1000]
+    assert max(end for _, end in node.windows) == 1936
+
+    indexer.update([VESTING], 2100)
+    assert list(index.history("mainnet", VESTING)["block_number"]) == [1000, 1990]
+
+
+def test_only_result_size_errors_shrink_the_window():
+    assert is_result_limit_error(JsonRpcError({"code": -32005, "message": "query returned more than 10000 results"}))
+    assert is_result_limit_error(JsonRpcError({"code": -32602, "message": "Log response size exceeded."}))
+    # Infura raportează depășirea cotei tot cu -32005
+    assert not is_result_limit_error(JsonRpcError({"code": -32005, "message": "project ID request rate exceeded"}))
+    assert not is_result_limit_error(JsonRpcError({"code": 429, "message": "Too Many Requests"}))
+    assert not is_result_limit_error(JsonRpcError("Read timed out. (read timeout=30)"))
+
+
+def test_rate_limited_window_is_retried_after_backoff(tmp_path):
+    class Limiter:
+        backoffs = 0
+
+        def backoff(self):
+            self.backoffs += 1
+
+    class ThrottledNode(FakeLogsNode):
+        throttled = 1
+
+        def call_many(self, calls):
+            if self.throttled:
+                self.throttled -= 1
+                with self._lock:
+                    self.windows.append(None)
+                return [JsonRpcError({"code": -32005, "message": "daily request count exceeded"})] * len(calls)
+            return super().call_many(calls)
+
+    node = ThrottledNode([release_log(1000, 1)], max_span=10**6)
+    node.rate_limiter = Limiter()
+    index = EventIndex(str(tmp_path / "events.sqlite3"))
+    indexer = EventIndexer(node, index, "mainnet", max_workers=1, initial_chunk=5000,
+                           confirmations=0)
+
+    indexer.update([VESTING], 2000, start_blocks={VESTING: 0})
+
+    assert node.rate_limiter.backoffs == 1
+    # fereastra nu a fost micșorată: aceeași cerere a fost repetată
+    assert node.windows[1:] == [(0, 2000)] * 3
+    assert list(index.history("mainnet", VESTING)["block_number"]) == [1000]
@@ -0,0 +1,56 @@
+import requests
+
+import http_session
+
+
+def test_adapter_pool_and_retry_policy(monkeypatch):
+    monkeypatch.delenv("HTTP_POOL_SIZE", raising=False)
+    monkeypatch.setenv("HTTP_RETRIES", "5")
+
+    session = http_session.create_session(pool_size=7)
+    adapter = session.get_adapter("https://api.etherscan.io")
+
+    assert adapter is session.get_adapter("http://127.0.0.1:8545")
+    assert adapter._pool_connections == 7 and adapter._pool_maxsize == 7
+    retry = adapter.max_retries
+    assert retry.total == 5
+    assert retry.backoff_factor == 0.5
+    assert set(retry.status_forcelist) == set(http_session.RETRY_STATUSES)
+    assert retry.allowed_methods == frozenset({"GET", "POST"})
+    # urllib3 < 2 nu are backoff_jitter; politica rămâne validă fără el
+    assert getattr(retry, "backoff_jitter", 0.5) == 0.5
+    assert session.headers["Accept-Encoding"] == "gzip, deflate"
+
+
+def test_default_timeout_is_applied_unless_given(monkeypatch):
+    seen = []
+    monkeypatch.setattr(requests.Session, "request",
+                        lambda self, method, url, **kwargs: seen.append(kwargs.get("timeout")))
+
+    session = http_session.create_session(timeout=3.5)
+    session.get("http://node")
+    session.post("http://node", json=[], timeout=1)
+
+    assert seen == [3.5, 1]
+
+
+def test_environment_configures_pool_and_timeout(monkeypatch):
+    monkeypatch.setenv("HTTP_POOL_SIZE", "3")
+    monkeypatch.setenv("HTTP_TIMEOUT", "2.5")
+    monkeypatch.setenv("HTTP_RETRIES", "0")
+
+    session = http_session.create_session()
+
+    assert session.timeout == 2.5
+    assert session.get_adapter("https://node")._pool_maxsize == 3
+    assert session.get_adapter("https://node").max_retries.total == 0
+
+
+def test_one_shared_session_per_network(monkeypatch):
+    monkeypatch.setattr(http_session, "_sessions", {})
+
+    mainnet = http_session.get_session("Mainnet")
+
+    assert http_session.get_session("mainnet") is mainnet
+    assert http_session.get_session("polygon") is not mainnet
+    assert isinstance(mainnet, http_session.TimeoutSession)
@@ -0,0 +1,37 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ("web3", "eth_abi", "pandas", "numpy", "plotly", "requests", "gradio")
+
+
+def loaded_heavy_modules(statement):
+    code = (f"import json, sys\nbefore = set(sys.modules)\n{statement}\n"
+            f"print(json.dumps([m for m in {HEAVY!r} if m in sys.modules and m not in before]))")
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+@pytest.mark.parametrize("module", [
+    "bulk_analyze", "web3_integration", "vesting_logic", "gradio_vesting_app",
+    "event_indexer", "scoring", "web3_connector",
+])
+def test_import_does_not_load_heavy_dependencies(module):
+    assert loaded_heavy_modules(f"import {module}") == []
+
+
+def test_scoring_single_contract_stays_light():
+    statement = ("from scoring import classify_functions, security_score\n"
+                 "security_score(classify_functions(['release', 'vestedAmount']), True)")
+    assert loaded_heavy_modules(statement) == []
+
+
+def test_chart_loads_plotting_dependencies_on_first_use():
+    statement = ("from gradio_vesting_app import create_security_scores_chart\n"
+                 "create_security_scores_chart([{'name': 'A', 'security_score': 50}])")
+    assert {"pandas", "plotly"} <= set(loaded_heavy_modules(statement))
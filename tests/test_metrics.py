@@ -0,0 +1,117 @@
+import pytest
+
+import metrics
+from rate_limiter import TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_spans_and_counters_export():
+    clock = FakeClock()
+    registry = metrics.Metrics(clock=clock)
+
+    with registry.span("abi_fetch"):
+        clock.now += 0.25
+    with pytest.raises(ValueError):
+        with registry.span("abi_fetch"):
+            clock.now += 0.75
+            raise ValueError("boom")
+    registry.increment("cache_hits_total", cache="abi")
+    registry.increment("cache_hits_total", 2, cache="abi")
+
+    snapshot = registry.snapshot()
+    assert snapshot["spans"]["abi_fetch"] == {"count": 2, "total": 1.0, "max": 0.75}
+    assert snapshot["counters"] == {'cache_hits_total{cache="abi"}': 3}
+
+    text = registry.to_prometheus()
+    assert 'vesting_stage_seconds_count{stage="abi_fetch"} 2' in text
+    assert 'vesting_cache_hits_total{cache="abi"} 3' in text
+
+
+def test_run_breakdown_only_contains_the_run():
+    clock = FakeClock()
+    registry = metrics.Metrics(clock=clock)
+    with registry.span("get_code"):
+        clock.now += 1
+    before = registry.snapshot()
+
+    with registry.span("token_amounts"):
+        clock.now += 0.5
+    registry.increment("etherscan_retries_total")
+    run = metrics.diff(before, registry.snapshot())
+
+    assert run == {"spans": {"token_amounts": {"count": 1, "total": 0.5}},
+                   "counters": {"etherscan_retries_total": 1}}
+    assert "| token_amounts | 1 | 0.50 | 500.0 |" in metrics.format_breakdown(run)
+
+
+def test_rate_limit_waits_are_counted():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, burst=1, clock=clock, sleep=clock.sleep, name="test")
+    before = metrics.METRICS.snapshot()
+
+    bucket.acquire()
+    bucket.acquire()
+
+    counters = metrics.diff(before, metrics.METRICS.snapshot())["counters"]
+    assert counters['rate_limit_waits_total{limiter="test"}'] == 1
+    assert counters['rate_limit_wait_seconds_total{limiter="test"}'] == pytest.approx(0.5)
+
+
+def test_concurrent_runs_collect_only_their_own_spans():
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    barrier = threading.Barrier(2)
+    runs = {}
+
+    def analysis(name):
+        # lucrul unei rulări se face pe un pool, ca în `_run_analysis`
+        def stage():
+            barrier.wait(timeout=5)
+            with metrics.span(f"stage_{name}"):
+                metrics.increment("contracts_total", run=name)
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pool.submit(metrics.in_current_context(stage)).result()
+
+    def run_analysis(name):
+        run = runs[name] = metrics.Metrics()
+        with metrics.record_run(run):
+            analysis(name)
+
+    threads = [threading.Thread(target=run_analysis, args=(name,)) for name in "ab"]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for name in "ab":
+        snapshot = runs[name].snapshot()
+        assert list(snapshot["spans"]) == [f"stage_{name}"]
+        assert list(snapshot["counters"]) == [f'contracts_total{{run="{name}"}}']
+    assert {"stage_a", "stage_b"} <= set(metrics.METRICS.snapshot()["spans"])
+
+
+def test_iter_recorded_activates_the_run_only_while_stepping():
+    run = metrics.Metrics()
+
+    def steps():
+        for i in range(2):
+            with metrics.span("step"):
+                yield i
+
+    for _ in metrics.iter_recorded(steps(), run):
+        with metrics.span("outside"):
+            pass
+
+    assert list(run.snapshot()["spans"]) == ["step"]
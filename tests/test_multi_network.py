@@ -0,0 +1,59 @@
+import threading
+
+import pytest
+
+from analyzer_registry import clear_analyzers
+from multi_network import MultiNetworkAnalyzer, split_network_tag
+
+
+def test_split_network_tag():
+    assert split_network_tag(" 0xabc ", "Mainnet") == ("mainnet", "0xabc")
+    assert split_network_tag("Polygon: 0xabc") == ("polygon", "0xabc")
+    with pytest.raises(ValueError):
+        split_network_tag("solana:0xabc")
+
+
+class FakeNetworkAnalyzer:
+    def __init__(self, network, barrier):
+        self.network = network
+        self.barrier = barrier
+
+    def iter_analyze_contracts(self, contracts_data, max_workers=1, cancel_event=None):
+        # Fiecare rețea așteaptă ca cealaltă să fi pornit: rețelele rulează în paralel
+        self.barrier.wait(timeout=5)
+        for i, data in enumerate(contracts_data):
+            yield i, {"address": data["address"], "status": "success",
+                      "analyzed_on": self.network}
+
+    def score_results(self, results):
+        for result in results:
+            result["scored_on"] = self.network
+        return results
+
+
+def test_networks_run_in_parallel_and_merge_in_input_order():
+    barrier = threading.Barrier(2)
+
+    def factory(network):
+        return FakeNetworkAnalyzer(network, barrier) if network != "goerli" else None
+
+    contracts = [
+        {"address": "0x1"},
+        {"address": "0x2", "network": "polygon"},
+        {"address": "0x3", "network": "goerli", "name": "G"},
+        {"address": "0x4"},
+    ]
+    try:
+        results = MultiNetworkAnalyzer(factory, "Mainnet").analyze_multiple_contracts(
+            contracts, max_workers=2
+        )
+    finally:
+        clear_analyzers()
+
+    assert [r["address"] for r in results] == ["0x1", "0x2", "0x3", "0x4"]
+    assert [r["network"] for r in results] == ["mainnet", "polygon", "goerli", "mainnet"]
+    assert results[1]["analyzed_on"] == "polygon"
+    # scorarea finală rulează o dată per rețea, pe analizorul rețelei
+    assert [r.get("scored_on") for r in results] == ["mainnet", "polygon", None, "mainnet"]
+    assert results[2]["status"] == "error"
+    assert results[2]["name"] == "G"
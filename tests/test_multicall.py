@@ -0,0 +1,90 @@
+from eth_abi import decode, encode
+from web3 import Web3
+from web3.providers.base import BaseProvider
+
+from multicall import MULTICALL3_ADDRESS, Multicall, encode_call
+
+VESTING = "0x00000000000000000000000000000000000000aa"
+BENEFICIARY = "0x00000000000000000000000000000000000000bb"
+
+VESTING_ABI = [
+    {"type": "function", "name": "vestedAmount", "stateMutability": "view",
+     "inputs": [{"name": "beneficiary", "type": "address"}],
+     "outputs": [{"name": "", "type": "uint256"}]},
+    {"type": "function", "name": "released", "stateMutability": "view",
+     "inputs": [], "outputs": [{"name": "", "type": "uint256"}]},
+    {"type": "function", "name": "releasable", "stateMutability": "view",
+     "inputs": [], "outputs": [{"name": "", "type": "uint256"}]},
+]
+
+
+class FakeMulticallProvider(BaseProvider):
+    """Answers aggregate3 eth_calls by dispatching each inner call to `handlers`."""
+
+    def __init__(self, handlers):
+        super().__init__()
+        self.handlers = handlers
+        self.eth_calls = 0
+
+    def make_request(self, method, params):
+        if method == "eth_chainId":
+            return {"jsonrpc": "2.0", "id": 1, "result": "0x1"}
+        assert method == "eth_call"
+        assert params[0]["to"].lower() == MULTICALL3_ADDRESS.lower()
+        self.eth_calls += 1
+        data = bytes.fromhex(params[0]["data"][2:])
+        (calls,) = decode(["(address,bool,bytes)[]"], data[4:])
+        results = []
+        for _, _, call_data in calls:
+            handler = self.handlers.get(call_data[:4])
+            results.append((True, handler(call_data[4:])) if handler else (False, b""))
+        payload = encode(["(bool,bytes)[]"], [results])
+        return {"jsonrpc": "2.0", "id": 1, "result": "0x" + payload.hex()}
+
+
+def selector(signature):
+    return Web3.keccak(text=signature)[:4]
+
+
+def test_aggregate_decodes_results_and_tolerates_failures():
+    handlers = {
+        selector("vestedAmount(address)"): lambda args: encode(["uint256"], [7 * 10**18]),
+        selector("released()"): lambda args: encode(["uint256"], [2 * 10**18]),
+    }
+    provider = FakeMulticallProvider(handlers)
+    w3 = Web3(provider)
+    contract = w3.eth.contract(address=Web3.to_checksum_address(VESTING), abi=VESTING_ABI)
+
+    calls = [
+        encode_call(contract, "vestedAmount", (Web3.to_checksum_address(BENEFICIARY),)),
+        encode_call(contract, "released"),
+        encode_call(contract, "releasable"),
+    ]
+    outcomes = Multicall(w3).aggregate(calls)
+
+    assert outcomes == [(True, 7 * 10**18), (True, 2 * 10**18), (False, None)]
+    assert provider.eth_calls == 1
+    assert encode_call(contract, "released", (BENEFICIARY,)) is None
+
+
+def test_get_token_amounts_uses_single_aggregate_call(make_analyzer, make_backend):
+    handlers = {
+        selector("vestedAmount(address)"): lambda args: encode(["uint256"], [5 * 10**18]),
+        selector("released()"): lambda args: encode(["uint256"], [10**18]),
+    }
+    provider = FakeMulticallProvider(handlers)
+    w3 = Web3(provider)
+    contract = w3.eth.contract(address=Web3.to_checksum_address(VESTING), abi=VESTING_ABI)
+    analyzer = make_analyzer(backend=make_backend(w3=w3, multicall=Multicall(w3)))
+
+    amounts = analyzer.get_token_amounts(contract, Web3.to_checksum_address(BENEFICIARY))
+
+    assert amounts == {
+        "vested_amount": 5 * 10**18,
+        "released_amount": 10**18,
+        "releasable_amount": 0,
+        "total_supply": 0,
+        "token": None,
+        "token_decimals": 18,
+    }
+    assert provider.eth_calls == 1
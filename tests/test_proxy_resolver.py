@@ -0,0 +1,121 @@
+from proxy_resolver import (BEACON_IMPLEMENTATION_SELECTOR, BEACON_SLOT, IMPLEMENTATION_SLOT,
+                            LEGACY_IMPLEMENTATION_SLOT, MINIMAL_PROXY_PREFIX,
+                            MINIMAL_PROXY_SUFFIX, ProxyResolver, minimal_proxy_target)
+from rpc_batch import JsonRpcError
+
+IMPL = "0x" + "1" * 40
+BEACON = "0x" + "2" * 40
+ZERO = "0x" + "0" * 64
+
+
+def word(address):
+    return "0x" + "0" * 24 + address[2:]
+
+
+class FakeNode:
+    def __init__(self, storage, codes=None, beacons=None, failing=()):
+        self.storage = storage
+        self.codes = codes or {}
+        self.beacons = beacons or {}
+        self.failing = set(failing)
+        self.batches = []
+
+    def call_many(self, calls):
+        self.batches.append(list(calls))
+        results = []
+        for method, params in calls:
+            if isinstance(params[0], str) and params[0] in self.failing:
+                results.append(JsonRpcError({"code": -32000, "message": "boom"}))
+            elif method == "eth_getCode":
+                results.append("0x" + self.codes.get(params[0], b"\x60\x80").hex())
+            elif method == "eth_getStorageAt":
+                results.append(self.storage.get((params[0], params[1]), ZERO))
+            else:
+                assert params[0]["data"] == BEACON_IMPLEMENTATION_SELECTOR
+                results.append(word(self.beacons[params[0]["to"]]))
+        return results
+
+
+def test_minimal_proxy_target_reads_implementation_from_bytecode():
+    clone = MINIMAL_PROXY_PREFIX + bytes.fromhex(IMPL[2:]) + MINIMAL_PROXY_SUFFIX
+    assert minimal_proxy_target(clone) == IMPL
+    assert minimal_proxy_target(clone + b"\x00") is None
+    assert minimal_proxy_target(b"") is None
+
+
+def test_resolves_all_proxy_kinds_in_one_batch_plus_beacons():
+    eip1967, beacon, legacy, plain, broken = ("0x" + c * 40 for c in "abcde")
+    clone = "0x" + "f" * 40
+    node = FakeNode(
+        storage={(eip1967, IMPLEMENTATION_SLOT): word(IMPL),
+                 (beacon, BEACON_SLOT): word(BEACON),
+                 (legacy, LEGACY_IMPLEMENTATION_SLOT): word(IMPL)},
+        codes={clone: MINIMAL_PROXY_PREFIX + bytes.fromhex(IMPL[2:]) + MINIMAL_PROXY_SUFFIX},
+        beacons={BEACON: IMPL},
+        failing={broken},
+    )
+    resolver = ProxyResolver(node)
+
+    resolved = resolver.resolve_many([eip1967, beacon, legacy, plain, broken, clone])
+
+    assert resolved == {eip1967: IMPL, beacon: IMPL, legacy: IMPL, plain: None, clone: IMPL}
+    # un batch pentru cod + sloturi, unul pentru beacon-uri
+    assert len(node.batches) == 2
+
+
+def test_known_code_and_cache_skip_rpc():
+    proxy = "0x" + "a" * 40
+    clone = "0x" + "b" * 40
+    now = [0.0]
+    node = FakeNode(storage={(proxy, IMPLEMENTATION_SLOT): word(IMPL)})
+    resolver = ProxyResolver(node, ttl=60, clock=lambda: now[0])
+    codes = {proxy: b"\x60\x80",
+             clone: MINIMAL_PROXY_PREFIX + bytes.fromhex(IMPL[2:]) + MINIMAL_PROXY_SUFFIX}
+
+    assert resolver.resolve_many([proxy, clone], codes) == {proxy: IMPL, clone: IMPL}
+    assert all(method == "eth_getStorageAt" for method, _ in node.batches[0])
+
+    resolver.resolve_many(["0x" + "A" * 40])
+    assert len(node.batches) == 1
+    now[0] = 61
+    resolver.resolve_many([proxy])
+    assert len(node.batches) == 2
+
+
+def test_proxies_share_the_implementation_abi(tmp_path, make_backend, fake_etherscan):
+    from abi_cache import AbiCache
+
+    abi = [{"type": "function", "name": "vestedAmount", "inputs": [], "outputs": []}]
+    backend = make_backend(abi_cache=AbiCache(str(tmp_path / "abi.sqlite3")),
+                           etherscan=fake_etherscan({"abi": abi, "is_verified": True}))
+
+    for proxy in ("0x" + "a" * 40, "0x" + "b" * 40):
+        assert backend.fetch_logic_abi(proxy, IMPL) == (IMPL, abi)
+    assert backend.etherscan.calls == 1
+
+
+def test_failed_lookup_fails_the_row_instead_of_scoring_the_proxy_abi(make_analyzer, make_backend,
+                                                                     fake_etherscan):
+    from types import SimpleNamespace
+
+    import pytest
+
+    from clone_index import CloneIndex
+    from proxy_resolver import ProxyResolutionError
+
+    proxy = "0x" + "a" * 40
+    w3 = SimpleNamespace()
+    backend = make_backend(w3=w3, proxies=ProxyResolver(FakeNode({}, failing={proxy})),
+                           etherscan=fake_etherscan({"abi": [], "is_verified": True}))
+    with pytest.raises(ProxyResolutionError):
+        backend.resolve_implementation(proxy, b"\x60\x80")
+
+    analyzer = make_analyzer(backend=backend, clone_index=CloneIndex(":memory:"))
+    del analyzer.analyze_contract
+    result = analyzer.analyze_contract(proxy, prefetched={"code": b"\x60\x80"})
+
+    assert result["status"] == "error"
+    assert "implementare" in result["error"]
+    assert backend.etherscan.calls == 0
+    # nimic salvat sub cheia `code_hash(code, None)` a unui proxy nerezolvat
+    assert len(analyzer.clone_index) == 0
@@ -0,0 +1,52 @@
+from rate_limiter import TokenBucket
+from etherscan_client import EtherscanClient
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_token_bucket_allows_burst_then_paces():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=5, burst=2, clock=clock, sleep=clock.sleep)
+
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0
+    assert bucket.acquire() > 0
+    assert abs(clock.now - 0.2) < 1e-9
+
+
+def test_token_bucket_backoff_and_recovery():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=4, burst=1, clock=clock, sleep=clock.sleep)
+
+    bucket.backoff()
+    assert bucket.rate == 2
+    for _ in range(100):
+        bucket.record_success()
+    assert bucket.rate == 4
+
+
+def test_is_rate_limited_detects_etherscan_message():
+    limited = {"status": "0", "message": "NOTOK", "result": "Max rate limit reached"}
+    ok = {"status": "1", "message": "OK", "result": "[]"}
+
+    assert EtherscanClient.is_rate_limited(limited)
+    assert not EtherscanClient.is_rate_limited(ok)
+
+
+def test_requests_larger_than_burst_pay_every_token():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, burst=4, clock=clock, sleep=clock.sleep)
+
+    bucket.acquire(10)
+
+    # 4 token-uri din burst, apoi încă 6 la 10/s
+    assert abs(clock.now - 0.6) < 1e-9
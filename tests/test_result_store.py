@@ -0,0 +1,74 @@
+from types import SimpleNamespace
+
+from result_store import TRANSFER_TOPIC, ResultStore, find_active_contracts
+
+CONTRACT_A = "0x" + "a" * 40
+CONTRACT_B = "0x" + "b" * 40
+
+
+class FakeLogsBatcher:
+    def __init__(self, logs_by_call=None):
+        self.logs_by_call = logs_by_call or {}
+        self.requests = []
+
+    def call_many(self, calls):
+        self.requests.extend(calls)
+        return [self.logs_by_call.get(i, []) for i in range(len(calls))]
+
+
+def make_store_analyzer(make_analyzer, make_backend, tmp_path, batcher, block_number):
+    analyzer = make_analyzer(backend=make_backend(
+        w3=SimpleNamespace(eth=SimpleNamespace(block_number=block_number)),
+        rpc_batcher=batcher,
+    ))
+    analyzer.result_store = ResultStore(str(tmp_path / "results.sqlite3"))
+    analyzer.prefetch_contract_data = lambda contracts_data: {}
+    analyzed = []
+    analyze = analyzer.analyze_contract
+
+    def counting_analyze(address, *args, **kwargs):
+        analyzed.append(address)
+        return analyze(address, *args, **kwargs)
+
+    analyzer.analyze_contract = counting_analyze
+    return analyzer, analyzed
+
+
+def test_store_keeps_only_latest_block(tmp_path):
+    store = ResultStore(str(tmp_path / "results.sqlite3"), clock=lambda: 1000.0)
+    store.put("mainnet", CONTRACT_A, None, 10, {"score": 1})
+    store.put("mainnet", CONTRACT_A.upper(), None, 20, {"score": 2})
+
+    assert store.latest("MAINNET", CONTRACT_A) == (20, 1000.0, {"score": 2})
+    assert store.latest("mainnet", CONTRACT_A, "0x" + "c" * 40) is None
+
+
+def test_transfer_to_contract_marks_it_active():
+    topic = "0x" + CONTRACT_B[2:].rjust(64, "0")
+    # al treilea filtru din grup: transferuri către contracte
+    batcher = FakeLogsBatcher({2: [{
+        "address": "0x" + "d" * 40,
+        "blockNumber": hex(15),
+        "topics": [TRANSFER_TOPIC, "0x" + "0" * 64, topic],
+    }]})
+
+    active = find_active_contracts(batcher, {CONTRACT_A: 10, CONTRACT_B: 10}, 20)
+
+    assert active == {CONTRACT_B}
+    assert len(batcher.requests) == 3
+
+
+def test_incremental_run_only_reanalyzes_active_contracts(tmp_path, make_analyzer, make_backend):
+    contracts = [{"address": CONTRACT_A, "name": "A"}, {"address": CONTRACT_B, "name": "B"}]
+    analyzer, analyzed = make_store_analyzer(make_analyzer, make_backend, tmp_path, FakeLogsBatcher(), 100)
+    first = analyzer.analyze_multiple_contracts(contracts)
+    assert analyzed == [CONTRACT_A, CONTRACT_B]
+    assert all(r["block_number"] == 100 for r in first)
+
+    batcher = FakeLogsBatcher({0: [{"address": CONTRACT_B, "blockNumber": hex(150), "topics": []}]})
+    analyzer, analyzed = make_store_analyzer(make_analyzer, make_backend, tmp_path, batcher, 200)
+    second = analyzer.analyze_multiple_contracts(contracts)
+
+    assert analyzed == [CONTRACT_B]
+    assert second[0]["cached"] is True and second[0]["block_number"] == 100
+    assert "cached" not in second[1] and second[1]["block_number"] == 200
@@ -0,0 +1,37 @@
+from gradio_vesting_app import create_detailed_table, generate_summary_report
+from results_table import build_results_table, to_units
+
+
+def test_to_units_is_exact_for_any_decimals():
+    assert to_units(123_456_789, 6) == 123.456789
+    assert to_units(1) == 1e-18
+    assert to_units(None) == 0.0
+
+
+def test_table_keeps_exact_amounts_and_scales_per_token():
+    huge = 2**255 + 1
+    results = [
+        {"name": "A", "network": "mainnet", "address": "0xa", "status": "success",
+         "security_score": 85, "risk_level": "LOW", "token": "0xusdc", "token_decimals": 6,
+         "vested_amount": 2_500_000, "released_amount": 0},
+        {"name": "B", "network": "polygon", "address": "0xb", "status": "success",
+         "security_score": 40, "risk_level": "MEDIUM", "vested_amount": huge},
+        {"name": "C", "address": "0xc", "status": "error", "error": "boom",
+         "security_score": 0, "risk_level": "ERROR"},
+    ]
+
+    table = build_results_table(results)
+
+    assert list(table["vested_amount"][:2]) == [2.5, to_units(huge, 18)]
+    assert table["vested_amount_raw"][1] == huge
+    assert list(table["token_decimals"]) == [6, 18, 18]
+    assert str(table["risk_level"].dtype) == "category"
+    assert str(table["security_score"].dtype) == "int16"
+
+    assert "Contracte analizate: 3" in generate_summary_report(table)
+    assert "- MEDIUM: 1" in generate_summary_report(table)
+    detailed = create_detailed_table(table)
+    assert list(detailed["name"]) == ["A", "B", "C"]
+    assert detailed["releasable_amount"].tolist() == [0.0, 0.0, 0.0]
+    assert detailed["vested_amount_raw"].tolist() == ["2500000", str(huge), "0"]
+    assert detailed["token_decimals"].tolist() == [6, 18, 18]
@@ -0,0 +1,141 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from rpc_batch import JsonRpcBatcher, JsonRpcError
+
+
+class StandInRpcServer(ThreadingHTTPServer):
+    """Local JSON-RPC node that records batch sizes and can reject large batches."""
+
+    def __init__(self, max_accepted_batch=None):
+        super().__init__(("127.0.0.1", 0), StandInRpcHandler)
+        self.max_accepted_batch = max_accepted_batch
+        self.reject_status = 200
+        self.batch_sizes = []
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def answer(self, request):
+        method, params = request["method"], request["params"]
+        if method == "eth_getCode":
+            code = "0x" if params[0].endswith("00") else "0x6080"
+            return {"jsonrpc": "2.0", "id": request["id"], "result": code}
+        if method == "eth_blockNumber":
+            return {"jsonrpc": "2.0", "id": request["id"], "result": "0x10"}
+        return {"jsonrpc": "2.0", "id": request["id"],
+                "error": {"code": -32601, "message": "method not found"}}
+
+
+class StandInRpcHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        server = self.server
+        size = len(body) if isinstance(body, list) else 1
+        server.batch_sizes.append(size)
+        status = 200
+        if server.max_accepted_batch and size > server.max_accepted_batch:
+            status = server.reject_status
+            payload = {"jsonrpc": "2.0", "id": None,
+                       "error": {"code": -32005, "message": "batch too large"}}
+        elif isinstance(body, list):
+            payload = [server.answer(request) for request in reversed(body)]
+        else:
+            payload = server.answer(body)
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def rpc_server(request, monkeypatch):
+    monkeypatch.setenv("RPC_RATE_LIMIT", "1000")
+    monkeypatch.setenv("RPC_BURST", "1000")
+    server = StandInRpcServer(getattr(request, "param", None))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_call_many_batches_and_keeps_order(rpc_server):
+    batcher = JsonRpcBatcher(rpc_server.url, max_batch_size=3)
+    calls = [("eth_blockNumber", []), ("eth_unknown", [])] * 4
+
+    results = batcher.call_many(calls)
+
+    assert rpc_server.batch_sizes == [3, 3, 2]
+    assert results[0::2] == ["0x10"] * 4
+    assert all(isinstance(r, JsonRpcError) and r.code == -32601 for r in results[1::2])
+
+
+@pytest.mark.parametrize("rpc_server", [2], indirect=True)
+def test_rejected_batches_are_split_and_retried(rpc_server):
+    batcher = JsonRpcBatcher(rpc_server.url, max_batch_size=8)
+    addresses = [f"0x{i:040x}" for i in range(1, 9)]
+
+    codes = batcher.get_codes(addresses)
+
+    assert rpc_server.batch_sizes == [8, 4, 2, 2, 4, 2, 2]
+    assert set(codes) == set(addresses)
+    assert codes[addresses[0]] == b"\x60\x80"
+
+
+@pytest.mark.parametrize("rpc_server", [2], indirect=True)
+def test_payload_too_large_is_split(rpc_server):
+    rpc_server.reject_status = 413
+    batcher = JsonRpcBatcher(rpc_server.url, max_batch_size=4)
+
+    results = batcher.call_many([("eth_blockNumber", [])] * 4)
+
+    assert rpc_server.batch_sizes == [4, 2, 2]
+    assert results == ["0x10"] * 4
+
+
+def test_transport_failures_are_not_split(monkeypatch):
+    monkeypatch.setenv("RPC_RATE_LIMIT", "1000")
+    monkeypatch.setenv("RPC_BURST", "1000")
+    posts = []
+
+    class DownSession:
+        def post(self, url, json=None, timeout=None):
+            posts.append(len(json))
+            raise requests.ConnectionError("connection refused")
+
+    batcher = JsonRpcBatcher("http://node.invalid", max_batch_size=100, session=DownSession())
+
+    results = batcher.call_many([("eth_blockNumber", [])] * 100)
+
+    # one HTTP request, not ~199 from repeated halving
+    assert posts == [100]
+    assert all(isinstance(r, JsonRpcError) and "connection refused" in str(r) for r in results)
+
+
+def test_batches_are_charged_per_call(rpc_server):
+    acquired = []
+
+    class RecordingLimiter:
+        burst = 2
+
+        def acquire(self, tokens=1.0):
+            acquired.append(tokens)
+            return 0.0
+
+    batcher = JsonRpcBatcher(rpc_server.url, max_batch_size=5)
+    batcher.rate_limiter = RecordingLimiter()
+
+    batcher.call_many([("eth_blockNumber", [])] * 7)
+
+    assert acquired == [5, 2]
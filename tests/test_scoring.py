@@ -0,0 +1,44 @@
+import json
+import random
+
+import scoring
+
+
+def test_portfolio_scores_match_single_contract_path():
+    rng = random.Random(7)
+    vocabulary = ["vestedAmount", "releasable", "release", "released", "cliff",
+                  "getStart", "BENEFICIARY", "owner", "transfer", "", None]
+    function_lists = [rng.sample(vocabulary, rng.randint(0, 8)) for _ in range(300)]
+    verified = [rng.random() < 0.5 for _ in function_lists]
+
+    table = scoring.score_portfolio(function_lists, verified)
+
+    for i, (functions, is_verified) in enumerate(zip(function_lists, verified)):
+        found = scoring.classify_functions([f for f in functions if f])
+        score = scoring.security_score(found, is_verified)
+        assert table.loc[i, list(found)].to_dict() == found
+        assert table.loc[i, "security_score"] == score
+        assert table.loc[i, "risk_level"] == scoring.risk_level(score)
+
+
+def test_substring_matching_and_score_cap():
+    found = scoring.classify_functions(["releasedTokens", "cliffEnd", "getOwner"])
+    assert found["release"] and found["released"] and found["cliff"] and found["owner"]
+    assert not found["releasable"]
+
+    everything = list(scoring.DEFAULT_WEIGHTS)
+    table = scoring.score_portfolio([everything, []], [True, False])
+    assert table["security_score"].tolist() == [100, 0]
+    assert table["risk_level"].tolist() == ["LOW", "HIGH"]
+
+
+def test_weight_table_override(tmp_path, monkeypatch):
+    path = tmp_path / "weights.json"
+    path.write_text(json.dumps({"cliff": 50, "owner": 0}))
+    monkeypatch.setenv("SCORING_WEIGHTS", str(path))
+
+    weights = scoring.load_weights()
+    table = scoring.score_portfolio([["cliff", "owner"]], [False], weights)
+
+    assert weights["vestedAmount"] == scoring.DEFAULT_WEIGHTS["vestedAmount"]
+    assert table.loc[0, "security_score"] == 50
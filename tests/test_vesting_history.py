@@ -0,0 +1,86 @@
+from eth_abi.abi import default_codec
+
+from gradio_vesting_app import create_vesting_curve_chart
+from multicall import EncodedCall
+from vesting_history import HistoryCache, VestingHistorySampler, refine_blocks, sample_blocks
+
+VESTING = "0x" + "a" * 40
+CLIFF_BLOCK = 600
+
+
+class FakeArchiveNode:
+    def __init__(self):
+        self.requests = []
+
+    def call_many(self, calls):
+        self.requests.append(calls)
+        results = []
+        for method, params in calls:
+            block = int(params[-1] if method == "eth_call" else params[0], 16)
+            if method == "eth_getBlockByNumber":
+                results.append({"timestamp": hex(1_600_000_000 + 12 * block)})
+            else:
+                vested = 1000 if block >= CLIFF_BLOCK else 0
+                results.append("0x" + default_codec.encode(["uint256"], [vested]).hex())
+        return results
+
+
+def test_sample_blocks_covers_both_ends():
+    assert sample_blocks(100, 200, 5) == [100, 125, 150, 175, 200]
+    assert sample_blocks(10, 12, 50) == [10, 11, 12]
+    assert sample_blocks(200, 200, 5) == [200]
+
+
+def test_refine_blocks_only_splits_changing_intervals():
+    series = {0: 0, 100: 0, 200: 50, 300: 50}
+    assert refine_blocks(series, 5) == [150]
+
+
+def test_sampler_batches_calls_and_caches_history(tmp_path):
+    node = FakeArchiveNode()
+    cache = HistoryCache(str(tmp_path / "history.sqlite3"))
+    sampler = VestingHistorySampler(node, cache, "mainnet", default_codec, head_block=2000)
+    calls = {"vested_amount": EncodedCall(VESTING, b"\x01\x02\x03\x04", ["uint256"])}
+
+    rows = sampler.sample(calls, 0, 1000, samples=12)
+
+    blocks = [r["block_number"] for r in rows]
+    assert blocks == sorted(blocks) and blocks[0] == 0 and blocks[-1] == 1000
+    # grila inițială pleacă într-un singur batch, apoi subdivizarea se apropie de cliff
+    assert len(node.requests[0]) == 6
+    before_cliff = max(r["block_number"] for r in rows if r["vested_amount"] == 0)
+    after_cliff = min(r["block_number"] for r in rows if r["vested_amount"] == 1000)
+    assert after_cliff - before_cliff < 50
+
+    node.requests.clear()
+    again = sampler.sample(calls, 0, 1000, samples=12)
+    assert again == rows
+    assert node.requests == []
+
+
+def test_blocks_near_the_head_are_not_cached(tmp_path):
+    node = FakeArchiveNode()
+    cache = HistoryCache(str(tmp_path / "history.sqlite3"))
+    sampler = VestingHistorySampler(node, cache, "mainnet", default_codec, confirmations=64)
+    calls = {"vested_amount": EncodedCall(VESTING, b"\x01\x02\x03\x04", ["uint256"])}
+
+    sampler.sample(calls, 0, 1000, samples=6, adaptive=False)
+
+    # vârful este end_block: doar blocurile <= 936 sunt finale
+    cached = cache.get_values("mainnet", calls["vested_amount"], range(1001))
+    assert cached and max(cached) <= 936
+    assert max(cache.get_timestamps("mainnet", range(1001))) <= 936
+    node.requests.clear()
+    sampler.read(calls, [1000])
+    assert len(node.requests) == 1
+
+
+def test_vesting_curve_chart_has_one_trace_per_metric():
+    history = [
+        {"name": "A", "block_number": b, "timestamp": None,
+         "vested_amount": float(b), "released_amount": b / 2}
+        for b in (1, 2, 3)
+    ]
+    fig = create_vesting_curve_chart(history)
+    assert len(fig.data) == 2
+    assert create_vesting_curve_chart([]).layout.title.text == "Fără date"
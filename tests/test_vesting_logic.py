@@ -12,13 +12,11 @@ class DummyAnalyzer:
             "Released": 10,
             "Security Score": 80
         }]
-    def generate_security_chart(self, results):
-        return "security_chart"
-    def generate_token_chart(self, results):
-        return "token_chart"
 
 def test_analyze_vesting_contracts(monkeypatch):
     monkeypatch.setattr(vesting_logic, "VestingAnalyzer", DummyAnalyzer)
+    monkeypatch.setattr(vesting_logic, "generate_security_chart", lambda df: "security_chart")
+    monkeypatch.setattr(vesting_logic, "generate_token_chart", lambda df: "token_chart")
     df, security_plot, token_plot = vesting_logic.analyze_vesting_contracts(
         "0xabc", "Test", "mainnet"
     )
@@ -26,3 +24,81 @@ def test_analyze_vesting_contracts(monkeypatch):
     assert df.iloc[0]["Contract"] == "Test"
     assert security_plot == "security_chart"
     assert token_plot == "token_chart"
+
+
+class DummyStreamingAnalyzer(DummyAnalyzer):
+    def iter_analyze_contracts(self, addresses, names):
+        for i, address in enumerate(addresses):
+            yield {"Contract": f"C{i}", "Address": address,
+                   "Vested": i, "Released": 0, "Security Score": 50}
+
+
+def test_analyze_vesting_contracts_stream_yields_partial_results(monkeypatch):
+    monkeypatch.setattr(vesting_logic, "VestingAnalyzer", DummyStreamingAnalyzer)
+    monkeypatch.setattr(vesting_logic, "STREAM_UPDATE_INTERVAL", 0)
+
+    updates = list(vesting_logic.analyze_vesting_contracts_stream(
+        "0x1\n0x2\n0x3", "", "mainnet"
+    ))
+
+    assert [len(df) for df, _, _, _ in updates] == [1, 2, 3]
+    assert list(updates[-1][0]["Address"]) == ["0x1", "0x2", "0x3"]
+    # fiecare actualizare aduce timpii acestei rulări
+    assert all(isinstance(timings, str) for _, _, _, timings in updates)
+
+
+def test_tagged_addresses_are_analyzed_on_their_network(monkeypatch):
+    class NetworkAnalyzer(DummyStreamingAnalyzer):
+        def analyze_contracts(self, addresses, names):
+            return [{"Contract": name, "Address": address, "Vested": 0, "Released": 0,
+                     "Security Score": 50, "Seen On": self.network}
+                    for address, name in zip(addresses, names)]
+
+    monkeypatch.setattr(vesting_logic, "VestingAnalyzer", NetworkAnalyzer)
+
+    df, _, _ = vesting_logic.analyze_vesting_contracts(
+        "0x1\npolygon:0x2\n0x3", "A,B,C", "Mainnet"
+    )
+
+    assert list(df["Address"]) == ["0x1", "0x2", "0x3"]
+    assert list(df["Contract"]) == ["A", "B", "C"]
+    assert list(df["Network"]) == ["mainnet", "polygon", "mainnet"]
+    assert list(df["Seen On"]) == list(df["Network"])
+
+
+def test_unsupported_network_tags_do_not_block_valid_entries(monkeypatch):
+    seen = []
+
+    class NetworkAnalyzer(DummyStreamingAnalyzer):
+        def analyze_contracts(self, addresses, names):
+            seen.extend(addresses)
+            return [{"Contract": name, "Address": address, "Vested": 0, "Released": 0,
+                     "Security Score": 50} for address, name in zip(addresses, names)]
+
+    monkeypatch.setattr(vesting_logic, "get_analyzer",
+                        lambda network, factory: NetworkAnalyzer(network))
+
+    df, _, _ = vesting_logic.analyze_vesting_contracts("0x1\narbitrum:0x2\n0x3", "A,B,C", "mainnet")
+    updates = list(vesting_logic.analyze_vesting_contracts_stream("arbitrum:0x2\n0x1", "", "mainnet"))
+
+    assert seen == ["0x1", "0x3"]
+    assert list(df["Address"]) == ["0x1", "arbitrum:0x2", "0x3"]
+    assert list(df["Contract"]) == ["A", "B", "C"]
+    assert "arbitrum" in df.iloc[1]["Error"]
+    final = updates[-1][0]
+    assert list(final["Address"]) == ["arbitrum:0x2", "0x1"]
+    assert "arbitrum" in final.iloc[0]["Error"]
+    assert final.iloc[1]["Security Score"] == 50
+
+
+def test_result_rows_keep_exact_amounts_and_token():
+    data = {"vested": 10**30 + 1, "released": 5 * 10**5, "token": "0xtoken",
+            "decimals": 6, "functions": ["release"]}
+
+    row = vesting_logic.VestingAnalyzer._result_row("C", "0x1", data, 40)
+    failed = vesting_logic.VestingAnalyzer._result_row("D", "0x2", None, 0)
+
+    assert row["Vested Raw"] == 10**30 + 1
+    assert row["Released"] == 0.5 and row["Released Raw"] == 5 * 10**5
+    assert (row["Token"], row["Decimals"]) == ("0xtoken", 6)
+    assert (failed["Vested Raw"], failed["Token"], failed["Decimals"]) == (0, None, 18)
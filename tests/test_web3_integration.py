@@ -0,0 +1,193 @@
+import threading
+
+import pytest
+
+import web3_integration
+from scoring import classify_functions, security_score
+
+
+def test_analyze_multiple_contracts_concurrent_keeps_order(make_analyzer):
+    analyzer = make_analyzer()
+    contracts = [{"address": f"0x{i:040x}", "name": f"C{i}"} for i in range(20)]
+    progress = []
+
+    results = analyzer.analyze_multiple_contracts(
+        contracts, lambda value, desc: progress.append(value), max_workers=4
+    )
+
+    assert [r["address"] for r in results] == [c["address"] for c in contracts]
+    assert progress == sorted(progress)
+    assert progress[-1] == 1.0
+
+
+@pytest.fixture
+def make_metadata_analyzer(tmp_path, make_analyzer, make_backend, fake_etherscan):
+    from abi_cache import AbiCache
+
+    def make(metadata):
+        return make_analyzer(backend=make_backend(
+            abi_cache=AbiCache(str(tmp_path / "abi.sqlite3")),
+            etherscan=fake_etherscan(metadata),
+        ))
+
+    return make
+
+
+def test_abi_and_verification_share_one_getsourcecode(make_metadata_analyzer):
+    abi = [{"type": "function", "name": "release", "inputs": [], "outputs": []}]
+    analyzer = make_metadata_analyzer({"abi": abi, "is_verified": True})
+
+    assert analyzer.fetch_contract_abi("0xAA") == abi
+    assert analyzer.check_contract_verification("0xAA") is True
+    assert analyzer.etherscan.calls == 1
+
+
+def test_unverified_contract_is_cached_negatively(make_metadata_analyzer):
+    analyzer = make_metadata_analyzer({"abi": None, "is_verified": False})
+
+    assert analyzer.fetch_contract_abi("0xBB") is None
+    assert analyzer.check_contract_verification("0xBB") is False
+    analyzer.backend._metadata.clear()
+    assert analyzer.fetch_contract_abi("0xBB") is None
+    assert analyzer.etherscan.calls == 1
+
+
+def test_creation_info_is_fetched_in_chunks_of_five(make_analyzer):
+    requested = []
+
+    class CreationEtherscan:
+        def get(self, **params):
+            chunk = params["contractaddresses"].split(",")
+            requested.append(chunk)
+            return {"status": "1", "message": "OK", "result": [
+                {"contractAddress": a, "contractCreator": "0xcreator"} for a in chunk[:-1]
+            ]}
+
+    analyzer = make_analyzer()
+    analyzer.etherscan = CreationEtherscan()
+    addresses = [f"0x{i:040X}" for i in range(12)]
+
+    info = analyzer.get_contract_creation_info_many(addresses + addresses[:2])
+
+    assert [len(chunk) for chunk in requested] == [5, 5, 2]
+    assert info[addresses[0].lower()]["contractCreator"] == "0xcreator"
+    assert info[addresses[4].lower()] == {}
+    assert len(info) == 12
+
+
+def test_failed_creation_chunk_is_retried_once_without_fan_out(make_analyzer):
+    requested = []
+
+    class FlakyEtherscan:
+        def get(self, **params):
+            chunk = params["contractaddresses"].split(",")
+            requested.append(chunk)
+            if chunk[0].endswith("1"):
+                raise ConnectionError("read timed out")
+            if len(requested) == 3:
+                return {"status": "0", "message": "NOTOK", "result": "Max rate limit reached"}
+            return {"status": "1", "message": "OK", "result": [
+                {"contractAddress": a, "txHash": "0x1"} for a in chunk
+            ]}
+
+    analyzer = make_analyzer()
+    analyzer.etherscan = FlakyEtherscan()
+    addresses = [f"0x{i:040x}" for i in range(1, 9)]
+
+    info = analyzer.get_contract_creation_info_many(addresses)
+
+    # primul grup eșuează de două ori, al doilea reușește la reîncercare
+    assert [len(chunk) for chunk in requested] == [5, 5, 3, 3]
+    assert all(info[a] == {"error": "read timed out"} for a in addresses[:5])
+    assert all(info[a]["txHash"] == "0x1" for a in addresses[5:])
+
+
+def test_prefetch_defers_creation_info_to_chunks_of_contracts(make_analyzer, make_backend):
+    requested = []
+
+    class CreationEtherscan:
+        def get(self, **params):
+            chunk = params["contractaddresses"].split(",")
+            requested.append(chunk)
+            return {"status": "1", "message": "OK", "result": [
+                {"contractAddress": a, "txHash": "0x1"} for a in chunk
+            ]}
+
+    class CodeBatcher:
+        def get_codes(self, addresses):
+            # prima adresă nu are cod
+            return {a: b"" if i == 0 else b"\x60\x80" for i, a in enumerate(addresses)}
+
+    # fără rezolvator de proxy-uri, nicio adresă nu este proxy
+    analyzer = make_analyzer(backend=make_backend(w3=object(), rpc_batcher=CodeBatcher(),
+                                                  etherscan=CreationEtherscan()))
+    contracts = [{"address": f"0x{i:040x}"} for i in range(1, 9)]
+
+    prefetched = analyzer.prefetch_contract_data(contracts)
+
+    assert requested == []
+    first = contracts[0]["address"]
+    assert "creation_chunk" not in prefetched[first]
+    for contract in contracts[1:]:
+        chunk = prefetched[contract["address"]]["creation_chunk"]
+        assert chunk.get(contract["address"]) == {"contractAddress": contract["address"],
+                                                  "txHash": "0x1"}
+    assert [len(chunk) for chunk in requested] == [5, 2]
+    assert first not in requested[0]
+
+
+def test_iter_analyze_contracts_stops_on_cancel(make_analyzer):
+    analyzer = make_analyzer()
+    contracts = [{"address": f"0x{i:040x}"} for i in range(10)]
+    cancel = threading.Event()
+    seen = []
+
+    for i, result in analyzer.iter_analyze_contracts(contracts, cancel_event=cancel):
+        seen.append(i)
+        if len(seen) == 3:
+            cancel.set()
+
+    assert seen == [0, 1, 2]
+
+
+def test_batch_results_are_scored_in_one_vectorized_pass(make_analyzer):
+    analyzer = make_analyzer()
+    functions = [["release", "vestedAmount", "owner"], ["transfer"], ["releasable", "cliff"]]
+
+    def fake_analyze(address, name="", beneficiary_address=None, prefetched=None):
+        if not address:
+            return {"address": address, "status": "error"}
+        i = int(address, 16)
+        return {"address": address, "status": "success", "functions": functions[i],
+                "is_verified": i != 1, "security_score": -1}
+
+    analyzer.analyze_contract = fake_analyze
+    contracts = [{"address": f"0x{i:040x}"} for i in range(3)] + [{"address": ""}]
+
+    results = analyzer.analyze_multiple_contracts(contracts, max_workers=2)
+
+    for result, names in zip(results, functions):
+        found = classify_functions(names)
+        assert result["security_score"] == security_score(found, result["is_verified"])
+        assert result["vesting_functions_found"] == [f for f, hit in found.items() if hit]
+    assert results[0]["risk_level"] == "MEDIUM"
+    assert "security_score" not in results[3]
+
+
+def test_stream_error_keeps_the_finished_contracts(monkeypatch):
+    class CrashingAnalyzer:
+        def iter_analyze_contracts(self, contracts_data, max_workers=1, cancel_event=None):
+            yield 0, {"address": contracts_data[0]["address"], "status": "success"}
+            raise RuntimeError("nod indisponibil")
+
+    monkeypatch.setattr(web3_integration, "create_multi_network_analyzer",
+                        lambda network: CrashingAnalyzer())
+    monkeypatch.setattr(web3_integration, "_build_outputs",
+                        lambda results, status="", timings="": (status, results))
+
+    updates = list(web3_integration.real_analyze_contracts_stream(
+        "0x" + "11" * 20 + "\n0x" + "22" * 20))
+
+    status, results = updates[-1]
+    assert status.startswith("❌") and "1/2" in status and "nod indisponibil" in status
+    assert [r["address"] for r in results] == ["0x" + "11" * 20]
@@ -1,5 +1,6 @@
 import gradio as gr
-from vesting_logic import analyze_vesting_contracts
+from vesting_logic import analyze_vesting_contracts_stream
+from web3_integration import real_vesting_curve
 import os
 from dotenv import load_dotenv
 
@@ -12,7 +13,7 @@ def create_interface():
         with gr.Row():
             contracts_input = gr.Textbox(
                 label="Contract Addresses",
-                placeholder="Enter one address per line",
+                placeholder="One address per line; prefix other chains with their network (polygon:0x...)",
                 lines=5
             )
             names_input = gr.Textbox(
@@ -22,27 +23,51 @@ def create_interface():
             )
         
         network_dropdown = gr.Dropdown(
-            label="Network",
+            label="Default Network",
             choices=["Mainnet", "Goerli", "Polygon"],
             value="Mainnet"
         )
         
-        analyze_btn = gr.Button("Analyze Contracts", variant="primary")
+        with gr.Row():
+            analyze_btn = gr.Button("Analyze Contracts", variant="primary")
+            stop_btn = gr.Button("Stop", variant="stop")
         
         with gr.Tab("Results"):
             results_output = gr.Dataframe(
-                headers=["Contract", "Address", "Vested", "Released", "Security Score"],
-                datatype=["str", "str", "number", "number", "number"]
+                headers=["Contract", "Address", "Vested", "Released", "Security Score",
+                         "Vested Raw", "Released Raw", "Token", "Decimals", "Network"],
+                datatype=["str", "str", "number", "number", "number",
+                          "str", "str", "str", "number", "str"]
             )
         
         with gr.Tab("Charts"):
             security_plot = gr.Plot()
             token_distribution = gr.Plot()
         
-        analyze_btn.click(
-            fn=analyze_vesting_contracts,
+        with gr.Tab("Timings"):
+            timings_output = gr.Markdown()
+        
+        with gr.Tab("Vesting Curve"):
+            with gr.Row():
+                samples_slider = gr.Slider(
+                    label="Sampled Blocks", minimum=4, maximum=200, step=1, value=24
+                )
+                curve_btn = gr.Button("Load History")
+            curve_plot = gr.Plot()
+        
+        # Results, charts and this run's timings refresh as each contract
+        # finishes; Stop keeps whatever was already rendered
+        analyze_event = analyze_btn.click(
+            fn=analyze_vesting_contracts_stream,
             inputs=[contracts_input, names_input, network_dropdown],
-            outputs=[results_output, security_plot, token_distribution]
+            outputs=[results_output, security_plot, token_distribution, timings_output]
+        )
+        stop_btn.click(fn=None, inputs=None, outputs=None, cancels=[analyze_event])
+        # Historical samples are cached permanently, so reloading is cheap
+        curve_btn.click(
+            fn=lambda contracts, network, samples: real_vesting_curve(contracts, "", network, samples),
+            inputs=[contracts_input, network_dropdown, samples_slider],
+            outputs=[curve_plot]
         )
     
     return app
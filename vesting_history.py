@@ -0,0 +1,259 @@
+"""Eșantionarea istorică a sumelor vested/released, cu apeluri `eth_call` la blocuri fixe.
+
+Pentru fiecare contract sunt alese înălțimi de bloc între blocul de creare și
+blocul curent, uniform sau adaptiv (intervalele în care valoarea se schimbă
+sunt subdivizate până la epuizarea bugetului de eșantioane). Toate apelurile
+unei runde pleacă într-un singur batch JSON-RPC, indiferent de bloc.
+
+Starea unui bloc confirmat nu se mai schimbă, deci valorile și timestamp-urile
+blocurilor aflate cu cel puțin `DEFAULT_CONFIRMATIONS` blocuri sub vârful
+lanțului sunt păstrate permanent într-un cache SQLite. Blocurile mai noi pot
+fi încă înlocuite de o reorganizare și sunt citite din nou la fiecare cerere.
+"""
+
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from metrics import increment
+from multicall import EncodedCall, decode_result
+from rpc_batch import JsonRpcError
+
+DEFAULT_HISTORY_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "vesting_analyzer", "history.sqlite3"
+)
+DEFAULT_SAMPLES = 24
+# Adâncimea după care un bloc este considerat final (~2 epoci pe mainnet)
+DEFAULT_CONFIRMATIONS = 64
+
+
+class HistoryCache:
+    """Rezultatele apelurilor `eth_call` și timestamp-urile blocurilor, fără expirare."""
+
+    def __init__(self, path: str = DEFAULT_HISTORY_CACHE_PATH) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS calls ("
+                " network TEXT NOT NULL,"
+                " target TEXT NOT NULL,"
+                " data BLOB NOT NULL,"
+                " block_number INTEGER NOT NULL,"
+                # NULL = apelul a fost executat, dar nu a returnat o valoare decodabilă
+                " value TEXT,"
+                " PRIMARY KEY (network, target, data, block_number))"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS block_times ("
+                " network TEXT NOT NULL,"
+                " block_number INTEGER NOT NULL,"
+                " timestamp INTEGER NOT NULL,"
+                " PRIMARY KEY (network, block_number))"
+            )
+
+    def get_values(self, network: str, call: EncodedCall,
+                   blocks: Iterable[int]) -> Dict[int, Optional[int]]:
+        """Returnează valorile salvate pentru `call`, doar pentru blocurile găsite."""
+        blocks = list(blocks)
+        found: Dict[int, Optional[int]] = {}
+        with self._lock:
+            for start in range(0, len(blocks), 500):
+                chunk = blocks[start:start + 500]
+                rows = self._conn.execute(
+                    "SELECT block_number, value FROM calls"
+                    " WHERE network = ? AND target = ? AND data = ?"
+                    f" AND block_number IN ({','.join('?' * len(chunk))})",
+                    (network, call.target.lower(), call.data, *chunk),
+                ).fetchall()
+                found.update((block, int(value) if value is not None else None)
+                             for block, value in rows)
+        return found
+
+    def put_values(self, network: str,
+                   rows: Sequence[Tuple[EncodedCall, int, Optional[int]]]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO calls VALUES (?, ?, ?, ?, ?)",
+                [(network, call.target.lower(), call.data, block,
+                  str(value) if value is not None else None)
+                 for call, block, value in rows],
+            )
+
+    def get_timestamps(self, network: str, blocks: Iterable[int]) -> Dict[int, int]:
+        blocks = list(blocks)
+        found: Dict[int, int] = {}
+        with self._lock:
+            for start in range(0, len(blocks), 500):
+                chunk = blocks[start:start + 500]
+                found.update(self._conn.execute(
+                    "SELECT block_number, timestamp FROM block_times WHERE network = ?"
+                    f" AND block_number IN ({','.join('?' * len(chunk))})",
+                    (network, *chunk),
+                ).fetchall())
+        return found
+
+    def put_timestamps(self, network: str, timestamps: Dict[int, int]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO block_times VALUES (?, ?, ?)",
+                [(network, block, ts) for block, ts in timestamps.items()],
+            )
+
+
+def sample_blocks(start: int, end: int, samples: int) -> List[int]:
+    """Alege `samples` blocuri distribuite uniform în [start, end], inclusiv capetele."""
+    if end <= start or samples <= 1:
+        return [end]
+    samples = min(samples, end - start + 1)
+    step = (end - start) / (samples - 1)
+    return sorted({start + round(i * step) for i in range(samples)})
+
+
+def refine_blocks(series: Dict[int, Optional[int]], budget: int) -> List[int]:
+    """Alege cel mult `budget` blocuri noi, la mijlocul intervalelor cu cea mai mare variație.
+
+    Intervalele plate nu sunt subdivizate, astfel încât eșantioanele se
+    concentrează în jurul cliff-urilor și al eliberărilor.
+    """
+    blocks = sorted(series)
+    candidates = []
+    for left, right in zip(blocks, blocks[1:]):
+        if right - left < 2:
+            continue
+        change = abs((series[right] or 0) - (series[left] or 0))
+        if change:
+            candidates.append((change, right - left, (left + right) // 2))
+    candidates.sort(reverse=True)
+    return [middle for _, _, middle in candidates[:budget]]
+
+
+class VestingHistorySampler:
+    """Citește valori istorice ale apelurilor view, cu batch JSON-RPC și cache permanent.
+
+    Doar blocurile cu cel puțin `confirmations` blocuri sub `head_block` ajung
+    în cache. Fără `head_block`, `sample` folosește `end_block` drept vârf.
+    """
+
+    def __init__(self, batcher, cache: HistoryCache, network: str, codec,
+                 head_block: Optional[int] = None,
+                 confirmations: int = DEFAULT_CONFIRMATIONS) -> None:
+        self.batcher = batcher
+        self.cache = cache
+        self.network = network.lower()
+        self.codec = codec
+        self.head_block = head_block
+        self.confirmations = confirmations
+
+    def _is_final(self, block: int) -> bool:
+        return self.head_block is None or block <= self.head_block - self.confirmations
+
+    def read(self, calls: Dict[str, EncodedCall],
+             blocks: Sequence[int]) -> Dict[str, Dict[int, Optional[int]]]:
+        """Returnează {cheie: {bloc: valoare}} pentru toate apelurile și blocurile cerute.
+
+        Blocurile pentru care nodul a răspuns cu eroare (ex. stare istorică
+        indisponibilă pe un nod non-arhivă) lipsesc din rezultat și nu sunt
+        salvate în cache.
+        """
+        values: Dict[str, Dict[int, Optional[int]]] = {}
+        missing: List[Tuple[str, int]] = []
+        for key, call in calls.items():
+            values[key] = self.cache.get_values(self.network, call, blocks)
+            missing.extend((key, block) for block in blocks if block not in values[key])
+        increment("cache_hits_total", len(calls) * len(blocks) - len(missing), cache="history")
+        increment("cache_misses_total", len(missing), cache="history")
+
+        if missing:
+            results = self.batcher.call_many([
+                ("eth_call", [{"to": calls[key].target, "data": "0x" + calls[key].data.hex()},
+                              hex(block)])
+                for key, block in missing
+            ])
+            fresh = []
+            for (key, block), result in zip(missing, results):
+                if isinstance(result, JsonRpcError) or not isinstance(result, str):
+                    continue
+                data = bytes.fromhex(result[2:])
+                ok, value = decode_result(self.codec, calls[key], True, data)
+                value = value if ok and isinstance(value, int) else None
+                values[key][block] = value
+                if self._is_final(block):
+                    fresh.append((calls[key], block, value))
+            self.cache.put_values(self.network, fresh)
+        return values
+
+    def block_timestamps(self, blocks: Sequence[int]) -> Dict[int, int]:
+        """Timestamp-ul fiecărui bloc, citit din cache sau într-un singur batch."""
+        timestamps = self.cache.get_timestamps(self.network, blocks)
+        missing = [block for block in blocks if block not in timestamps]
+        if missing:
+            results = self.batcher.call_many(
+                [("eth_getBlockByNumber", [hex(block), False]) for block in missing]
+            )
+            fresh = {
+                block: int(result["timestamp"], 16)
+                for block, result in zip(missing, results)
+                if isinstance(result, dict) and result.get("timestamp")
+            }
+            self.cache.put_timestamps(self.network, {
+                block: ts for block, ts in fresh.items() if self._is_final(block)
+            })
+            timestamps.update(fresh)
+        return timestamps
+
+    def sample(self, calls: Dict[str, EncodedCall], start_block: int, end_block: int,
+               samples: int = DEFAULT_SAMPLES, adaptive: bool = True) -> List[Dict[str, Any]]:
+        """Eșantionează apelurile între `start_block` și `end_block`.
+
+        În modul adaptiv jumătate din buget merge pe o grilă uniformă, iar
+        restul pe subdivizarea intervalelor în care prima valoare din `calls`
+        se schimbă. Returnează rânduri {block_number, timestamp, <cheie>: valoare}
+        ordonate după bloc.
+        """
+        if not calls:
+            return []
+        if self.head_block is None:
+            self.head_block = end_block
+        initial = max(samples // 2, 2) if adaptive else samples
+        blocks = sample_blocks(start_block, end_block, initial)
+        values = self.read(calls, blocks)
+
+        if adaptive:
+            primary = next(iter(calls))
+            budget = samples - len(blocks)
+            while budget > 0:
+                extra = [b for b in refine_blocks(values[primary], budget)
+                         if b not in values[primary]]
+                if not extra:
+                    break
+                fresh = self.read(calls, extra)
+                for key in calls:
+                    values[key].update(fresh[key])
+                budget -= len(extra)
+
+        sampled = sorted(set().union(*(v.keys() for v in values.values())))
+        timestamps = self.block_timestamps(sampled)
+        return [
+            {"block_number": block, "timestamp": timestamps.get(block),
+             **{key: values[key].get(block) for key in calls}}
+            for block in sampled
+        ]
+
+
+_caches: Dict[str, HistoryCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_history_cache(path: Optional[str] = None) -> HistoryCache:
+    """Returnează cache-ul partajat, configurat prin HISTORY_CACHE_PATH."""
+    path = path or os.getenv("HISTORY_CACHE_PATH") or DEFAULT_HISTORY_CACHE_PATH
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = _caches[path] = HistoryCache(path)
+        return cache
@@ -1,79 +1,202 @@
 import json
 import time
-import plotly.express as px
-import pandas as pd
+from analyzer_registry import get_analyzer
+from chart_data import score_bin_labels, score_histogram, top_n_with_other
+from metrics import Metrics, format_breakdown, iter_recorded, span
+from multi_network import group_by_network, iter_by_network, split_network_tag
+from results_table import DEFAULT_DECIMALS, to_units
+from scoring import classify_functions, load_weights, score_portfolio, security_score
 from web3_connector import Web3Connector
 
 class VestingAnalyzer:
     def __init__(self, network="mainnet"):
         self.web3_conn = Web3Connector(network)
+        self.score_weights = load_weights()
         
     def analyze_contracts(self, addresses, names=None):
-        results = []
+        """Analyze all contracts, then score the whole portfolio in one vectorized pass."""
+        fetched = list(self._iter_vesting_data(addresses, names))
+        table = score_portfolio(
+            [data['functions'] if data else [] for _, _, data in fetched],
+            weights=self.score_weights,
+        )
+        return [
+            self._result_row(name, address, data, int(score) if data else 0)
+            for (name, address, data), score in zip(fetched, table['security_score'])
+        ]
+
+    def iter_analyze_contracts(self, addresses, names=None):
+        """Yield one result row per contract as soon as it is analyzed."""
+        for name, address, data in self._iter_vesting_data(addresses, names):
+            score = self.calculate_security_score(data) if data else 0
+            yield self._result_row(name, address, data, score)
+
+    def _iter_vesting_data(self, addresses, names=None):
+        self.web3_conn.resolve_proxies(addresses)
         for i, address in enumerate(addresses):
             name = names[i] if names and i < len(names) else f"Contract_{i+1}"
             try:
-                contract_data = self.web3_conn.get_vesting_data(address)
-                results.append({
-                    "Contract": name,
-                    "Address": address,
-                    "Vested": contract_data['vested'],
-                    "Released": contract_data['released'],
-                    "Security Score": self.calculate_security_score(contract_data)
-                })
+                with span("analyze_contract"):
+                    data = self.web3_conn.get_vesting_data(address)
+                yield name, address, data
             except Exception as e:
                 print(f"Error analyzing {address}: {str(e)}")
-                results.append({
-                    "Contract": name,
-                    "Address": address,
-                    "Vested": 0,
-                    "Released": 0,
-                    "Security Score": 0
-                })
-        return results
+                yield name, address, None
+
+    @staticmethod
+    def _result_row(name, address, data, score):
+        # Display values in token units, next to the exact base-unit integers
+        decimals = data['decimals'] if data else DEFAULT_DECIMALS
+        return {
+            "Contract": name,
+            "Address": address,
+            "Vested": to_units(data['vested'], decimals) if data else 0,
+            "Released": to_units(data['released'], decimals) if data else 0,
+            "Security Score": score,
+            "Vested Raw": data['vested'] if data else 0,
+            "Released Raw": data['released'] if data else 0,
+            "Token": data['token'] if data else None,
+            "Decimals": decimals
+        }
     
     def calculate_security_score(self, contract_data):
-        score = 0
-        if 'vestedAmount' in contract_data['functions']: score += 30
-        if 'releasable' in contract_data['functions']: score += 25
-        if 'cliff' in contract_data['functions']: score += 20
-        if 'beneficiary' in contract_data['functions']: score += 15
-        if 'start' in contract_data['functions']: score += 10
-        return score
-    
-    def generate_security_chart(self, results):
-        df = pd.DataFrame(results)
-        fig = px.bar(
-            df,
-            x='Contract',
-            y='Security Score',
-            color='Security Score',
-            color_continuous_scale=["red", "yellow", "green"],
-            title="Contract Security Scores"
-        )
-        fig.update_layout(yaxis_range=[0,100])
-        return fig
-    
-    def generate_token_chart(self, results):
-        df = pd.DataFrame(results)
-        fig = px.pie(
-            df,
-            names='Contract',
-            values='Vested',
-            title="Token Distribution",
-            hole=0.4
-        )
-        return fig
+        # Verified contracts only: the ABI comes from Etherscan's verified source
+        found = classify_functions(contract_data['functions'], self.score_weights)
+        return security_score(found, True, self.score_weights)
 
-def analyze_vesting_contracts(contracts_text, names_text, network):
+def generate_security_chart(results):
+    """Histogram of security scores: a fixed number of bars for any portfolio size."""
+    # pandas/plotly are imported on first chart, not at module import
+    import pandas as pd
+    import plotly.express as px
+
+    df = results if isinstance(results, pd.DataFrame) else pd.DataFrame(results)
+    if df.empty:
+        return px.bar(title="Contract Security Scores")
+    bins = score_histogram(df, score='Security Score')
+    fig = px.bar(
+        bins,
+        x='score_range',
+        y='contracts',
+        category_orders={'score_range': score_bin_labels()},
+        labels={'score_range': 'Security Score', 'contracts': 'Contracts'},
+        title="Contract Security Scores"
+    )
+    return fig
+
+def generate_token_chart(results):
+    """Token distribution of the top CHART_TOP_N contracts, the rest as one "Other" slice."""
+    import pandas as pd
+    import plotly.express as px
+
+    df = results if isinstance(results, pd.DataFrame) else pd.DataFrame(results)
+    if df.empty:
+        return px.pie(title="Token Distribution", hole=0.4)
+    top = top_n_with_other(df, 'Vested', 'Contract', other_label="Other")
+    fig = px.pie(
+        top,
+        names='Contract',
+        values='Vested',
+        title="Token Distribution",
+        hole=0.4
+    )
+    return fig
+
+# Minimum seconds between two UI refreshes while streaming
+STREAM_UPDATE_INTERVAL = 1.0
+
+def _parse_inputs(contracts_text, names_text):
     addresses = [addr.strip() for addr in contracts_text.split('\n') if addr.strip()]
     names = [name.strip() for name in names_text.split(',')] if names_text else None
-    
-    analyzer = VestingAnalyzer(network.lower())
-    results = analyzer.analyze_contracts(addresses, names)
-    
+    return addresses, names
+
+def _network_groups(addresses, names, network):
+    """Split `network:address` entries into {network: [(index, address, name)]}.
+
+    Names are assigned over the whole input, so they don't depend on grouping.
+    Returns (groups, {input index: error row}); entries tagged with an
+    unsupported network get an error row and the rest are analyzed as usual.
+    """
+    entries = []
+    invalid = {}
+    for i, entry in enumerate(addresses):
+        name = names[i] if names and i < len(names) else f"Contract_{i+1}"
+        try:
+            entry_network, address = split_network_tag(entry, network)
+        except ValueError as e:
+            invalid[i] = {**VestingAnalyzer._result_row(name, entry, None, 0),
+                          "Network": None, "Error": str(e)}
+            continue
+        entries.append((entry_network, (i, address, name)))
+    groups = group_by_network(entries, lambda e: e[0], network)
+    return {net: [item for _, item in items] for net, items in groups.items()}, invalid
+
+def _iter_network_rows(groups, analyze):
+    """Run `analyze(analyzer, addresses, names)` per network in parallel.
+
+    Yields (input index, row) as rows arrive; each row gets a "Network" column.
+    `analyze` returns or yields the rows of one network in input order.
+    """
+    def run(network, entries, stop):
+        analyzer = get_analyzer(network, VestingAnalyzer)
+        if analyzer is None:
+            raise ConnectionError(f"No connection to {network}")
+        rows = analyze(analyzer, [a for _, a, _ in entries], [n for _, _, n in entries])
+        return enumerate(rows)
+
+    for network, local_index, row in iter_by_network(groups, run):
+        yield groups[network][local_index][0], {**row, "Network": network}
+
+def _missing_rows(groups, done):
+    """Zero rows for contracts whose network could not be analyzed at all."""
+    for network, entries in groups.items():
+        for i, address, name in entries:
+            if i not in done:
+                yield i, {**VestingAnalyzer._result_row(name, address, None, 0), "Network": network}
+
+def _build_outputs(results):
+    import pandas as pd
+
+    # One table per update, shared by the results view and both charts
     df = pd.DataFrame(results)
-    security_plot = analyzer.generate_security_chart(results)
-    token_plot = analyzer.generate_token_chart(results)
-    
+    security_plot = generate_security_chart(df)
+    token_plot = generate_token_chart(df)
     return df, security_plot, token_plot
+
+def analyze_vesting_contracts(contracts_text, names_text, network):
+    """Analyze `network:address` entries (untagged ones on `network`), all networks in parallel."""
+    addresses, names = _parse_inputs(contracts_text, names_text)
+    groups, rows = _network_groups(addresses, names, network.lower())
+    rows.update(_iter_network_rows(groups, lambda a, addrs, nms: a.analyze_contracts(addrs, nms)))
+    rows.update(_missing_rows(groups, rows))
+    results = [rows[i] for i in sorted(rows)]
+    return _build_outputs(results)
+
+def analyze_vesting_contracts_stream(contracts_text, names_text, network):
+    """Generator version of `analyze_vesting_contracts` for streaming UIs.
+
+    Yields (table, security chart, token chart, timings) for the contracts
+    finished so far, at most once per STREAM_UPDATE_INTERVAL plus a final
+    update. Timings are this run's per-stage breakdown (Markdown), collected
+    apart from concurrent runs. Closing the generator (Gradio's cancel) stops
+    the analysis; the last yielded partial results stay on screen. Networks
+    are analyzed in parallel.
+    """
+    addresses, names = _parse_inputs(contracts_text, names_text)
+    groups, rows = _network_groups(addresses, names, network.lower())
+    last_update = 0.0
+    run = Metrics()
+
+    def outputs():
+        timings = format_breakdown(run.snapshot()) or "No timings recorded."
+        return (*_build_outputs([rows[k] for k in sorted(rows)]), timings)
+
+    streamed = _iter_network_rows(groups, lambda a, addrs, nms: a.iter_analyze_contracts(addrs, nms))
+    for i, result in iter_recorded(streamed, run):
+        rows[i] = result
+        now = time.monotonic()
+        if len(rows) < len(addresses) and now - last_update >= STREAM_UPDATE_INTERVAL:
+            last_update = now
+            yield outputs()
+    rows.update(_missing_rows(groups, rows))
+    yield outputs()
@@ -1,73 +1,81 @@
 # Web3 Integration pentru Verificarea Contractelor de Vesting Ethereum
-from web3 import Web3
-import requests
-import json
-import time
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 import os
 from datetime import datetime
-import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from abi_cache import AbiCache
+from analyzer_registry import get_analyzer
+from abi_signatures import SignatureIndex, build_signature_index
+from chain_backend import ChainBackend
+from chart_data import aggregate_results
+from clone_index import CloneIndex, code_hash, get_clone_index
+from event_indexer import EventIndex, EventIndexer, get_event_index
+from metrics import (Metrics, format_breakdown, in_current_context, increment,
+                     iter_recorded, record_run, span)
+from multi_network import MultiNetworkAnalyzer, split_network_tag
+from result_store import ResultStore, get_result_store, split_reusable
+from results_table import DEFAULT_DECIMALS, build_results_table, to_units
+from scoring import classify_functions, load_weights, risk_level, score_portfolio, security_score
+from vesting_history import DEFAULT_SAMPLES, VestingHistorySampler, get_history_cache
+
+# Numărul implicit de contracte analizate în paralel din interfață
+DEFAULT_MAX_WORKERS = int(os.getenv("ANALYZER_MAX_WORKERS", "4"))
+
+
+class CreationInfoChunk:
+    """Informațiile de creare ale unui grup de adrese, citite la prima cerere
+
+    Primul contract din grup care ajunge la etapa de creare face apelul
+    `getcontractcreation` pentru tot grupul; ceilalți așteaptă și folosesc
+    același răspuns. Dacă cererea eșuează, fiecare adresă din grup primește
+    eroarea (`{"error": ...}`), fără cereri separate per adresă.
+    """
+
+    def __init__(self, fetch, addresses: List[str]) -> None:
+        self._fetch = fetch
+        self.addresses = addresses
+        self._lock = threading.Lock()
+        self._info: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def get(self, address: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if self._info is None:
+                self._info = self._fetch(self.addresses)
+        return self._info.get(address.lower())
 
 class VestingContractAnalyzer:
     """Analizor complet pentru contractele de vesting Ethereum"""
 
-    NETWORK_URLS = {
-        "mainnet": {
-            "infura": "https://mainnet.infura.io/v3/{pid}",
-            "etherscan": "https://api.etherscan.io/api",
-        },
-        "goerli": {
-            "infura": "https://goerli.infura.io/v3/{pid}",
-            "etherscan": "https://api-goerli.etherscan.io/api",
-        },
-        "polygon": {
-            "infura": "https://polygon-mainnet.infura.io/v3/{pid}",
-            "etherscan": "https://api.polygonscan.com/api",
-        },
-    }
-
-    def __init__(self, network: str = "mainnet"):
-        """Inițializează analizorul cu configurația API specifică rețelei"""
-        self.network = network.lower()
-        self.etherscan_key = os.getenv("ETHERSCAN_API_KEY")
-        project_id = os.getenv("INFURA_PROJECT_ID")
-
-        urls = self.NETWORK_URLS.get(self.network, self.NETWORK_URLS["mainnet"])
-        self.infura_url = urls["infura"].format(pid=project_id)
-        self.etherscan_url = urls["etherscan"]
-        
-        # Inițializează Web3
-        try:
-            self.w3 = Web3(Web3.HTTPProvider(self.infura_url))
-            if not self.w3.is_connected():
-                raise ConnectionError("Nu s-a putut conecta la rețeaua Ethereum")
-        except Exception as e:
-            print(f"Eroare la conectarea Web3: {e}")
-            self.w3 = None
+    def __init__(self, network: str = "mainnet", abi_cache: Optional[AbiCache] = None,
+                 result_store: Optional[ResultStore] = None,
+                 backend: Optional[ChainBackend] = None,
+                 clone_index: Optional[CloneIndex] = None):
+        """Inițializează analizorul peste backend-ul rețelei (provider RPC, Etherscan, cache-uri)"""
+        self.backend = backend or ChainBackend(network, abi_cache=abi_cache)
+        self.network = self.backend.network
+        self.result_store = result_store
+        self.clone_index = clone_index if clone_index is not None else get_clone_index()
+        self.score_weights = load_weights()
+        # Resursele backend-ului, folosite direct de etapele analizei
+        self.abi_cache = self.backend.abi_cache
+        self.etherscan = self.backend.etherscan
+        self.w3 = self.backend.w3
+        self.rpc_batcher = self.backend.rpc_batcher
+
+    def fetch_contract_metadata(self, address: str) -> Optional[Dict[str, Any]]:
+        """Obține metadatele contractului (ABI, verificare, sursă, proxy) dintr-un singur `getsourcecode`
+
+        Cererea este memorată de backend, astfel încât `fetch_contract_abi` și
+        `check_contract_verification` folosesc același răspuns.
+        """
+        return self.backend.fetch_contract_metadata(address)
     
     def fetch_contract_abi(self, address: str) -> Optional[Dict]:
-        """Obține ABI-ul contractului de pe Etherscan"""
-        try:
-            params = {
-                "module": "contract",
-                "action": "getabi", 
-                "address": address,
-                "apikey": self.etherscan_key
-            }
-            
-            response = requests.get(self.etherscan_url, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
-            if data["status"] == "1":
-                return json.loads(data["result"])
-            else:
-                print(f"Eroare Etherscan: {data.get('message', 'Unknown error')}")
-                return None
-                
-        except Exception as e:
-            print(f"Eroare la obținerea ABI: {e}")
-            return None
+        """Obține ABI-ul contractului din cache sau de pe Etherscan"""
+        return self.backend.fetch_abi(address)
     
     def get_contract_functions(self, abi: List[Dict]) -> List[str]:
         """Extrage funcțiile din ABI-ul contractului"""
@@ -83,175 +91,340 @@ class VestingContractAnalyzer:
     
     def check_vesting_functions(self, functions: List[str]) -> Dict[str, bool]:
         """Verifică prezența funcțiilor standard de vesting"""
-        vesting_functions = {
-            "vestedAmount": False,
-            "releasable": False, 
-            "release": False,
-            "released": False,
-            "cliff": False,
-            "duration": False,
-            "start": False,
-            "beneficiary": False,
-            "owner": False,
-            "token": False
-        }
-        
-        for func in functions:
-            func_lower = func.lower()
-            for vesting_func in vesting_functions.keys():
-                if vesting_func.lower() in func_lower:
-                    vesting_functions[vesting_func] = True
-        
-        return vesting_functions
+        return classify_functions(functions, self.score_weights)
     
     def calculate_security_score(self, vesting_functions: Dict[str, bool], 
                                 contract_verified: bool = True) -> int:
         """Calculează scorul de securitate pe baza funcțiilor găsite"""
-        score = 0
-        
-        # Funcții critice (20 puncte fiecare)
-        critical_functions = ["vestedAmount", "releasable", "release"]
-        for func in critical_functions:
-            if vesting_functions.get(func, False):
-                score += 20
-        
-        # Funcții importante (10 puncte fiecare)  
-        important_functions = ["released", "cliff", "duration", "start"]
-        for func in important_functions:
-            if vesting_functions.get(func, False):
-                score += 10
-        
-        # Funcții auxiliare (5 puncte fiecare)
-        auxiliary_functions = ["beneficiary", "owner", "token"]
-        for func in auxiliary_functions:
-            if vesting_functions.get(func, False):
-                score += 5
-        
-        # Bonus pentru contract verificat
-        if contract_verified:
-            score += 5
-        
-        return min(score, 100)  # Cap la 100
+        return security_score(vesting_functions, contract_verified, self.score_weights)
     
     def determine_risk_level(self, score: int) -> str:
         """Determină nivelul de risc pe baza scorului"""
-        if score >= 80:
-            return "LOW"
-        elif score >= 40:
-            return "MEDIUM"
-        else:
-            return "HIGH"
+        return risk_level(score)
     
+    # (cheie rezultat, funcție view, primește adresa beneficiarului)
+    TOKEN_AMOUNT_CALLS = [
+        ("vested_amount", "vestedAmount", True),
+        ("released_amount", "released", True),
+        ("releasable_amount", "releasable", True),
+        ("total_supply", "totalSupply", False),
+        ("token", "token", False),
+    ]
+
+    def get_signature_index(self, address: str, abi: List[Dict]) -> SignatureIndex:
+        """Returnează indexul de semnături salvat cu ABI-ul sau îl construiește"""
+        return self.backend.signature_index(address, abi)
+
     def call_contract_function(self, contract, function_name: str, 
-                              beneficiary_address: str = None) -> Any:
-        """Apelează o funcție din contract cu gestionarea erorilor"""
-        try:
-            if not hasattr(contract.functions, function_name):
-                return None
-            
-            func = getattr(contract.functions, function_name)
-            
-            # Încearcă cu adresa beneficiarului dacă este furnizată
-            if beneficiary_address:
-                try:
-                    return func(beneficiary_address).call()
-                except:
-                    pass
-            
-            # Încearcă fără parametri
-            try:
-                return func().call()
-            except Exception as e:
-                print(f"Eroare la apelarea {function_name}: {e}")
-                return None
-                
-        except Exception as e:
-            print(f"Eroare la apelarea funcției {function_name}: {e}")
+                              beneficiary_address: str = None,
+                              signatures: Optional[SignatureIndex] = None) -> Any:
+        """Apelează o funcție view din contract, alegând overload-ul după ABI
+
+        Varianta cu adresa beneficiarului este preferată când ABI-ul o conține;
+        funcțiile care nu sunt view/pure nu sunt apelate.
+        """
+        if signatures is None:
+            signatures = build_signature_index(contract.abi)
+        call = self.backend.encode_view(contract, signatures, function_name, beneficiary_address)
+        if call is None:
             return None
+        success, value = self.backend.call_views([call])[0]
+        return value if success else None
     
-    def get_token_amounts(self, contract, address: str) -> Dict[str, float]:
-        """Obține cantitățile de token-uri vested și released"""
-        amounts = {
-            "vested_amount": 0.0,
-            "released_amount": 0.0,
-            "releasable_amount": 0.0,
-            "total_supply": 0.0
-        }
-        
-        try:
-            # Încearcă să obțină cantitatea vested
-            vested = self.call_contract_function(contract, "vestedAmount", address)
-            if vested is not None:
-                amounts["vested_amount"] = float(vested) / 1e18  # Convert from wei
-            
-            # Încearcă să obțină cantitatea released  
-            released = self.call_contract_function(contract, "released", address)
-            if released is not None:
-                amounts["released_amount"] = float(released) / 1e18
-            
-            # Încearcă să obțină cantitatea releasable
-            releasable = self.call_contract_function(contract, "releasable", address)
-            if releasable is not None:
-                amounts["releasable_amount"] = float(releasable) / 1e18
-            
-            # Încearcă să obțină total supply din contractul token
-            total_supply = self.call_contract_function(contract, "totalSupply")
-            if total_supply is not None:
-                amounts["total_supply"] = float(total_supply) / 1e18
-            
-        except Exception as e:
-            print(f"Eroare la obținerea cantităților: {e}")
-        
+    def get_token_amounts(self, contract, address: str,
+                          signatures: Optional[SignatureIndex] = None) -> Dict[str, Any]:
+        """Obține cantitățile de token-uri vested și released prin Multicall3
+
+        Toate apelurile view (inclusiv `token()`) sunt codificate într-un
+        singur `aggregate3`, cu overload-ul ales din indexul de semnături;
+        apelurile eșuate nu afectează restul. Sumele sunt întregi exacți în
+        unitățile de bază ale token-ului, însoțiți de `token` și
+        `token_decimals` (citit o singură dată per token).
+        """
+        from web3 import Web3
+
+        if signatures is None:
+            signatures = build_signature_index(contract.abi)
+        # web3 codifică doar adrese checksum; o adresă cu litere mici nu ar fi apelată
+        address = Web3.to_checksum_address(address) if address else address
+        keys = []
+        calls = []
+        for key, function_name, with_address in self.TOKEN_AMOUNT_CALLS:
+            encoded = self.backend.encode_view(contract, signatures, function_name,
+                                               address if with_address else None)
+            if encoded is not None:
+                keys.append(key)
+                calls.append(encoded)
+
+        amounts: Dict[str, Any] = {key: 0 for key, _, _ in self.TOKEN_AMOUNT_CALLS}
+        amounts["token"] = None
+        for key, (success, value) in zip(keys, self.backend.call_views(calls)):
+            if not success:
+                continue
+            if key == "token":
+                amounts[key] = value if isinstance(value, str) else None
+            elif isinstance(value, int):
+                amounts[key] = value
+
+        token = amounts["token"]
+        amounts["token_decimals"] = (self.backend.token_decimals([token])[token.lower()]
+                                     if token else DEFAULT_DECIMALS)
         return amounts
     
+    # Apelurile eșantionate în curba istorică (cheie rezultat, funcție view)
+    HISTORY_CALLS = [
+        ("vested_amount", "vestedAmount"),
+        ("released_amount", "released"),
+    ]
+
+    def get_vesting_history(self, address: str, beneficiary_address: str = None,
+                            samples: int = DEFAULT_SAMPLES, adaptive: bool = True,
+                            start_block: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Eșantionează sumele vested/released între blocul de creare și blocul curent
+
+        Returnează rânduri ordonate după bloc, cu `timestamp` (datetime) și
+        sumele convertite în unități de token cu `decimals()` token-ului;
+        listă goală dacă ABI-ul nu are funcțiile.
+        """
+        if not self.w3:
+            return []
+        implementation = self.backend.resolve_implementation(address)
+        abi_address, abi = self.backend.fetch_logic_abi(address, implementation)
+        if not abi:
+            return []
+        contract = self.backend.contract(address, abi)
+        signatures = self.get_signature_index(abi_address, abi)
+
+        calls = {}
+        for key, function_name in self.HISTORY_CALLS:
+            encoded = self.backend.encode_view(contract, signatures, function_name,
+                                               beneficiary_address or contract.address)
+            if encoded is not None:
+                calls[key] = encoded
+        if not calls:
+            return []
+
+        end_block = self.w3.eth.block_number
+        if start_block is None:
+            start_block = self.get_creation_blocks([address]).get(address.lower(), 0)
+        sampler = VestingHistorySampler(self.rpc_batcher, get_history_cache(),
+                                        self.network, self.w3.codec, head_block=end_block)
+        rows = sampler.sample(calls, start_block, end_block, samples, adaptive)
+        decimals = self.get_token_decimals(contract, signatures)
+        for row in rows:
+            if row["timestamp"] is not None:
+                row["timestamp"] = datetime.fromtimestamp(row["timestamp"])
+            for key in calls:
+                if row[key] is not None:
+                    row[key] = to_units(row[key], decimals)
+        return rows
+
+    def get_token_decimals(self, contract, signatures: SignatureIndex) -> int:
+        """`decimals()` al token-ului din `token()`; DEFAULT_DECIMALS fără token"""
+        encoded = self.backend.encode_view(contract, signatures, "token")
+        if encoded is None:
+            return DEFAULT_DECIMALS
+        success, token = self.backend.call_views([encoded])[0]
+        if not success or not isinstance(token, str):
+            return DEFAULT_DECIMALS
+        return self.backend.token_decimals([token])[token.lower()]
+    
     def check_contract_verification(self, address: str) -> bool:
         """Verifică dacă contractul este verificat pe Etherscan"""
-        try:
-            params = {
-                "module": "contract",
-                "action": "getsourcecode",
-                "address": address,
-                "apikey": self.etherscan_key
-            }
-            
-            response = requests.get(self.etherscan_url, params=params)
-            data = response.json()
-            
-            if data["status"] == "1" and data["result"]:
-                source_code = data["result"][0].get("SourceCode", "")
-                return len(source_code) > 0
-            
-            return False
-            
-        except Exception as e:
-            print(f"Eroare la verificarea contractului: {e}")
-            return False
+        # Un ABI în cache înseamnă contract verificat, o intrare negativă - neverificat
+        found, abi = self.abi_cache.get(self.network, address)
+        if found:
+            return abi is not None
+
+        metadata = self.fetch_contract_metadata(address)
+        return bool(metadata and metadata["is_verified"])
     
     def get_contract_creation_info(self, address: str) -> Dict[str, Any]:
         """Obține informații despre crearea contractului"""
-        try:
-            params = {
-                "module": "contract",
-                "action": "getcontractcreation", 
-                "contractaddresses": address,
-                "apikey": self.etherscan_key
-            }
-            
-            response = requests.get(self.etherscan_url, params=params)
-            data = response.json()
-            
-            if data["status"] == "1" and data["result"]:
-                return data["result"][0]
-            
+        return self.get_contract_creation_info_many([address]).get(address.lower(), {})
+
+    # Etherscan acceptă cel mult 5 adrese într-un apel `getcontractcreation`
+    CREATION_INFO_CHUNK_SIZE = 5
+    # Un grup eșuat este reîncercat o dată, tot prin limitatorul Etherscan
+    CREATION_INFO_ATTEMPTS = 2
+
+    def get_contract_creation_info_many(self, addresses: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Obține informațiile de creare pentru mai multe contracte, câte 5 pe cerere
+
+        Rezultatul este indexat după adresa cu litere mici; adresele fără date
+        primesc {}. Un grup care eșuează și la reîncercare nu este împărțit în
+        cereri per adresă: fiecare membru primește `{"error": ...}`.
+        """
+        unique = list(dict.fromkeys(a.lower() for a in addresses if a))
+        info: Dict[str, Dict[str, Any]] = {}
+        for start in range(0, len(unique), self.CREATION_INFO_CHUNK_SIZE):
+            chunk = unique[start:start + self.CREATION_INFO_CHUNK_SIZE]
+            found = None
+            for _ in range(self.CREATION_INFO_ATTEMPTS):
+                try:
+                    data = self.etherscan.get(module="contract", action="getcontractcreation",
+                                              contractaddresses=",".join(chunk))
+                except Exception as e:
+                    error = str(e)
+                    print(f"Eroare la obținerea info creație: {e}")
+                    continue
+
+                if data.get("status") == "1" and isinstance(data.get("result"), list):
+                    found = {
+                        entry.get("contractAddress", "").lower(): entry
+                        for entry in data["result"]
+                    }
+                    break
+                if "no data" in f"{data.get('message', '')} {data.get('result', '')}".lower():
+                    found = {}
+                    break
+                error = str(data.get("result"))
+                print(f"Eroare Etherscan la getcontractcreation: {error}")
+            if found is None:
+                increment("creation_info_failures_total")
+            for address in chunk:
+                info[address] = {"error": error} if found is None else found.get(address, {})
+        return info
+    
+    def get_creation_blocks(self, addresses: List[str]) -> Dict[str, int]:
+        """Blocul de creare al fiecărui contract, indexat după adresa cu litere mici
+
+        Folosește `blockNumber` din `getcontractcreation` când Etherscan îl
+        returnează; altfel citește tranzacțiile de creare într-un batch JSON-RPC.
+        """
+        blocks: Dict[str, int] = {}
+        pending: Dict[str, str] = {}
+        for address, entry in self.get_contract_creation_info_many(addresses).items():
+            if entry.get("blockNumber"):
+                blocks[address] = int(entry["blockNumber"])
+            elif entry.get("txHash"):
+                pending[address] = entry["txHash"]
+
+        if pending and self.rpc_batcher is not None:
+            transactions = self.rpc_batcher.call_many(
+                [("eth_getTransactionByHash", [tx_hash]) for tx_hash in pending.values()]
+            )
+            for address, tx in zip(pending, transactions):
+                if isinstance(tx, dict) and tx.get("blockNumber"):
+                    blocks[address] = int(tx["blockNumber"], 16)
+        return blocks
+
+    def index_release_history(self, addresses: List[str], index: Optional[EventIndex] = None,
+                              max_workers: int = DEFAULT_MAX_WORKERS) -> Dict[str, int]:
+        """Actualizează indexul local de eliberări și transferuri până la ultimul bloc confirmat
+
+        Contractele noi sunt scanate de la blocul de creare, cele deja
+        indexate doar de la ultimul bloc scanat.
+        """
+        if not self.w3:
             return {}
-            
-        except Exception as e:
-            print(f"Eroare la obținerea info creație: {e}")
+        index = index or get_event_index()
+        head_block = self.w3.eth.block_number
+        known = index.cursors(self.network, addresses)
+        start_blocks = self.get_creation_blocks([a for a in addresses if a.lower() not in known])
+        indexer = EventIndexer(self.rpc_batcher, index, self.network, max_workers=max_workers)
+        return indexer.update(addresses, head_block, start_blocks)
+
+    def prefetch_contract_data(self, contracts_data: List[Dict[str, str]]) -> Dict[str, Dict[str, Any]]:
+        """Citește în grup datele independente ale contractelor
+
+        Codul runtime și implementarea proxy-urilor vin din batch-uri JSON-RPC.
+        Informațiile de creare (doar pentru adresele cu cod) nu se citesc aici:
+        fiecare grup de 5 adrese primește un `CreationInfoChunk`, citit de
+        primul contract al grupului care ajunge la acea etapă, deci primele
+        rezultate nu așteaptă toate cererile Etherscan. Returnează, indexat
+        după adresa cu litere mici, datele care pot fi transmise ca
+        `prefetched` către `analyze_contract`.
+        """
+        from web3 import Web3
+
+        if not self.w3 or self.rpc_batcher is None:
             return {}
-    
+
+        addresses = []
+        for contract_data in contracts_data:
+            try:
+                addresses.append(Web3.to_checksum_address(contract_data.get("address", "")))
+            except Exception:
+                continue
+
+        prefetched: Dict[str, Dict[str, Any]] = {}
+        codes: Dict[str, bytes] = {}
+        try:
+            for address, code in self.rpc_batcher.get_codes(addresses).items():
+                codes[address.lower()] = code
+                prefetched.setdefault(address.lower(), {})["code"] = code
+        except Exception as e:
+            print(f"Eroare la citirea batch a codului: {e}")
+
+        with_code = [a for a in addresses if codes.get(a.lower())]
+        for address, implementation in self.backend.resolve_implementations(with_code, codes).items():
+            prefetched.setdefault(address, {})["implementation"] = implementation
+
+        step = self.CREATION_INFO_CHUNK_SIZE
+        for start in range(0, len(with_code), step):
+            chunk = CreationInfoChunk(self.get_contract_creation_info_many,
+                                      with_code[start:start + step])
+            for address in chunk.addresses:
+                prefetched.setdefault(address.lower(), {})["creation_chunk"] = chunk
+        return prefetched
+
+    def build_contract_profile(self, address: str,
+                               implementation: Optional[str] = None) -> Dict[str, Any]:
+        """Analiza statică a contractului: ABI, funcții, verificare și scor"""
+        # Obține ABI-ul contractului (al implementării, comun tuturor proxy-urilor ei)
+        with span("abi_fetch"):
+            abi_address, abi = self.backend.fetch_logic_abi(address, implementation)
+        if not abi:
+            raise ValueError("Nu s-a putut obține ABI-ul contractului")
+        
+        with span("verification"):
+            is_verified = self.check_contract_verification(abi_address)
+        return self.score_profile({
+            "abi_address": abi_address,
+            "abi": abi,
+            "functions": self.get_contract_functions(abi),
+            "is_verified": is_verified,
+        })
+
+    def score_profile(self, profile: Dict[str, Any]) -> Dict[str, Any]:
+        """Clasifică funcțiile profilului și calculează scorul cu ponderile curente"""
+        vesting_functions = self.check_vesting_functions(profile["functions"])
+        return {
+            **profile,
+            "vesting_functions": vesting_functions,
+            "security_score": self.calculate_security_score(vesting_functions,
+                                                            profile["is_verified"]),
+            "weights": dict(self.score_weights),
+        }
+
+    def get_contract_profile(self, address: str, code: bytes,
+                             implementation: Optional[str] = None) -> Dict[str, Any]:
+        """Profilul static al contractului, refolosit din indexul de clone când există
+
+        Contractele cu același cod runtime (și aceeași implementare) primesc
+        profilul primului membru analizat al familiei. Dacă ponderile scorului
+        s-au schimbat între timp, clasificarea și scorul se recalculează local.
+        """
+        profile = self.clone_index.get_or_compute(
+            self.network, code_hash(code, implementation),
+            lambda: self.build_contract_profile(address, implementation)
+        )
+        if profile.get("weights") != dict(self.score_weights):
+            profile = self.score_profile(profile)
+        return profile
+
     def analyze_contract(self, address: str, name: str = "", 
-                        beneficiary_address: str = None) -> Dict[str, Any]:
-        """Analizează complet un contract de vesting"""
+                        beneficiary_address: str = None,
+                        prefetched: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Analizează complet un contract de vesting
+
+        `prefetched` poate conține date deja citite în batch (de ex. `code`),
+        care nu mai sunt cerute din nou.
+        """
+        from web3 import Web3
+
+        prefetched = prefetched or {}
         result = {
             "name": name or f"Contract_{address[:8]}",
             "address": address,
@@ -261,39 +434,54 @@ class VestingContractAnalyzer:
         }
         
         try:
-            if not self.w3 or not self.w3.is_connected():
+            # Legătura este verificată periodic de registrul de analizoare; o
+            # cădere între verificări apare ca eroarea primului apel RPC
+            if not self.w3:
                 raise ConnectionError("Nu există conexiune la blockchain")
             
             # Verifică dacă adresa este un contract
-            code = self.w3.eth.get_code(Web3.to_checksum_address(address))
+            code = prefetched.get("code")
+            if code is None:
+                with span("get_code"):
+                    code = self.w3.eth.get_code(Web3.to_checksum_address(address))
             if code == b'':
                 raise ValueError("Adresa nu pare să fie un contract")
             
-            # Obține ABI-ul contractului
-            abi = self.fetch_contract_abi(address)
-            if not abi:
-                raise ValueError("Nu s-a putut obține ABI-ul contractului")
-            
-            # Creează obiectul contract
-            contract = self.w3.eth.contract(
-                address=Web3.to_checksum_address(address), 
-                abi=abi
-            )
+            # Proxy-urile sunt analizate după ABI-ul implementării. O adresă lipsă
+            # din batch-ul prefetch (citire eșuată) este rezolvată din nou aici;
+            # dacă eșuează și acum, rândul eșuează în loc să fie scorat ca non-proxy
+            if "implementation" in prefetched:
+                implementation = prefetched["implementation"]
+            else:
+                with span("proxy_resolution"):
+                    implementation = self.backend.resolve_implementation(address, code)
+
+            # ABI-ul, funcțiile și scorul sunt comune tuturor contractelor cu același
+            # cod (familia de clone); doar primul membru ajunge la Etherscan
+            profile = self.get_contract_profile(address, code, implementation)
+            abi_address, abi = profile["abi_address"], profile["abi"]
             
-            # Analizează funcțiile
-            all_functions = self.get_contract_functions(abi)
-            vesting_functions = self.check_vesting_functions(all_functions)
+            # Creează obiectul contract; apelurile merg tot către proxy
+            contract = self.backend.contract(address, abi)
             
-            # Calculează scorul de securitate
-            is_verified = self.check_contract_verification(address)
-            security_score = self.calculate_security_score(vesting_functions, is_verified)
+            signatures = self.get_signature_index(abi_address, abi)
+            vesting_functions = profile["vesting_functions"]
+            is_verified = profile["is_verified"]
+            security_score = profile["security_score"]
             risk_level = self.determine_risk_level(security_score)
             
             # Obține cantitățile de token-uri
-            token_amounts = self.get_token_amounts(contract, beneficiary_address or address)
+            with span("token_amounts"):
+                token_amounts = self.get_token_amounts(contract, beneficiary_address or address,
+                                                       signatures)
             
             # Obține informații despre crearea contractului
-            creation_info = self.get_contract_creation_info(address)
+            with span("creation_info"):
+                chunk = prefetched.get("creation_chunk")
+                if chunk is not None:
+                    creation_info = chunk.get(address)
+                else:
+                    creation_info = self.get_contract_creation_info(address)
             
             # Funcțiile găsite pentru raport
             found_functions = [k for k, v in vesting_functions.items() if v]
@@ -303,8 +491,11 @@ class VestingContractAnalyzer:
                 "security_score": security_score,
                 "risk_level": risk_level,
                 "vesting_functions_found": found_functions,
-                "all_functions_count": len(all_functions),
+                "functions": profile["functions"],
+                "all_functions_count": len(profile["functions"]),
                 "is_verified": is_verified,
+                "is_proxy": implementation is not None,
+                "implementation": implementation,
                 "creation_info": creation_info,
                 **token_amounts
             })
@@ -313,41 +504,165 @@ class VestingContractAnalyzer:
             result["error"] = str(e)
             result["security_score"] = 0
             result["risk_level"] = "ERROR"
+            increment("contracts_failed_total")
             print(f"Eroare la analiza contractului {address}: {e}")
         
         return result
     
+    def _analyze_entry(self, contract_data: Dict[str, str],
+                       prefetched: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Analizează un contract pe baza unei intrări din lista de analiză"""
+        address = contract_data.get("address", "")
+        with span("analyze_contract"):
+            return self.analyze_contract(
+                address,
+                contract_data.get("name", ""),
+                contract_data.get("beneficiary", None),
+                prefetched=(prefetched or {}).get(address.lower())
+            )
+
     def analyze_multiple_contracts(self, contracts_data: List[Dict[str, str]], 
-                                  progress_callback=None) -> List[Dict[str, Any]]:
-        """Analizează multiple contracte cu progress tracking"""
-        results = []
+                                  progress_callback=None,
+                                  max_workers: int = 1) -> List[Dict[str, Any]]:
+        """Analizează multiple contracte cu progress tracking
+
+        Cu ``max_workers > 1`` contractele sunt analizate concurent pe un
+        pool de thread-uri limitat; rezultatele păstrează ordinea de intrare,
+        iar ``progress_callback`` este apelat din thread-ul apelantului.
+        Ritmul cererilor este impus de limitatoarele partajate din
+        `rate_limiter`, nu de pauze fixe.
+        """
         total = len(contracts_data)
-        
-        for i, contract_data in enumerate(contracts_data):
-            address = contract_data.get("address", "")
-            name = contract_data.get("name", "")
-            beneficiary = contract_data.get("beneficiary", None)
-            
+        results: List[Optional[Dict[str, Any]]] = [None] * total
+        max_workers = min(max_workers, total) if total else 1
+
+        if progress_callback:
+            if max_workers > 1:
+                progress_callback(0.0, f"Analizez {total} contracte ({max_workers} în paralel)...")
+            else:
+                progress_callback(0.0, f"Analizez {total} contracte...")
+
+        completed = self.iter_analyze_contracts(contracts_data, max_workers)
+        for done, (i, result) in enumerate(completed, start=1):
+            results[i] = result
             if progress_callback:
-                progress_callback(i / total, f"Analizez {name or address[:10]}...")
-            
-            result = self.analyze_contract(address, name, beneficiary)
-            results.append(result)
-            
-            # Rate limiting pentru API-urile publice
-            time.sleep(0.2)  # 200ms delay între cereri
-        
+                contract_data = contracts_data[i]
+                label = contract_data.get("name", "") or contract_data.get("address", "")[:10]
+                progress_callback(done / total, f"Analizat {label} ({done}/{total})")
+
+        # Scorurile finale ale întregului portofoliu, într-o singură trecere vectorizată
+        with span("scoring"):
+            self.score_results(results)
         if progress_callback:
             progress_callback(1.0, "Analiza completă!")
-        
+
         return results
 
+    def score_results(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Clasifică și notează toate rezultatele reușite cu `score_portfolio`
+
+        Folosește lista `functions` și `is_verified` ale fiecărui rezultat;
+        cele fără `functions` (eșuate sau salvate de o versiune anterioară)
+        rămân neschimbate. Rezultatele sunt modificate pe loc.
+        """
+        scored = [r for r in results if r and r.get("status") == "success" and "functions" in r]
+        if not scored:
+            return results
+        table = score_portfolio([r["functions"] for r in scored],
+                                [bool(r.get("is_verified")) for r in scored], self.score_weights)
+        features = list(self.score_weights)
+        found = table[features].to_numpy()
+        for result, score, level, hits in zip(scored, table["security_score"].tolist(),
+                                              table["risk_level"].tolist(), found):
+            result.update({
+                "security_score": int(score),
+                "risk_level": str(level),
+                "vesting_functions_found": [f for f, hit in zip(features, hits) if hit],
+            })
+        return results
+
+    def iter_analyze_contracts(self, contracts_data: List[Dict[str, str]],
+                               max_workers: int = 1,
+                               cancel_event: Optional[threading.Event] = None,
+                               prefetched: Optional[Dict[str, Dict[str, Any]]] = None
+                               ) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Generează perechi (index, rezultat) pe măsură ce contractele sunt analizate
+
+        Ordinea este cea a finalizării, nu cea de intrare. Analiza se oprește
+        când `cancel_event` este setat sau când generatorul este închis;
+        contractele încă neîncepute sunt anulate, iar rezultatele deja
+        generate rămân valabile.
+
+        Cu un `result_store` configurat, contractele fără activitate după
+        blocul rezultatului salvat sunt servite din stocare (`cached` = True),
+        iar rezultatele noi sunt salvate cu blocul curent.
+        """
+        block_number = None
+        reused: Dict[int, Dict[str, Any]] = {}
+        if self.result_store is not None and self.w3:
+            try:
+                block_number = self.w3.eth.block_number
+                reused = split_reusable(self.result_store, self.rpc_batcher, self.network,
+                                        contracts_data, block_number)
+            except Exception as e:
+                print(f"Eroare la verificarea rezultatelor salvate: {e}")
+                reused = {}
+
+        for i, result in reused.items():
+            if cancel_event is not None and cancel_event.is_set():
+                return
+            yield i, result
+
+        pending = [i for i in range(len(contracts_data)) if i not in reused]
+        if prefetched is None:
+            with span("prefetch"):
+                prefetched = self.prefetch_contract_data([contracts_data[i] for i in pending])
+
+        analyzed = self._run_analysis(contracts_data, pending, max_workers,
+                                      cancel_event, prefetched)
+        try:
+            for i, result in analyzed:
+                if block_number is not None and result.get("status") == "success":
+                    result["block_number"] = block_number
+                    self.result_store.put(self.network, result["address"],
+                                          contracts_data[i].get("beneficiary"),
+                                          block_number, result)
+                yield i, result
+        finally:
+            analyzed.close()
+
+    def _run_analysis(self, contracts_data: List[Dict[str, str]], indices: List[int],
+                      max_workers: int, cancel_event: Optional[threading.Event],
+                      prefetched: Dict[str, Dict[str, Any]]
+                      ) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Analizează intrările `indices`, secvențial sau pe un pool de thread-uri"""
+        if max_workers <= 1:
+            for i in indices:
+                if cancel_event is not None and cancel_event.is_set():
+                    return
+                yield i, self._analyze_entry(contracts_data[i], prefetched)
+            return
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            futures = {
+                executor.submit(in_current_context(self._analyze_entry),
+                                contracts_data[i], prefetched): i
+                for i in indices
+            }
+            for future in as_completed(futures):
+                if cancel_event is not None and cancel_event.is_set():
+                    return
+                yield futures[future], future.result()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
 # ── INTEGRARE CU GRADIO ──────────────────────────────────────────────────────────
 
-def create_analyzer_instance(network: str = "mainnet"):
+def create_analyzer_instance(network: str = "mainnet", result_store_path: Optional[str] = None):
     """Creează o instanță a analizorului cu verificarea configurației"""
     try:
-        analyzer = VestingContractAnalyzer(network)
+        analyzer = VestingContractAnalyzer(network, result_store=get_result_store(result_store_path))
         
         # Testează conexiunea
         if analyzer.w3 and analyzer.w3.is_connected():
@@ -362,43 +677,92 @@ def create_analyzer_instance(network: str = "mainnet"):
         print(f"❌ Eroare la inițializarea analizorului: {e}")
         return None
 
-def real_analyze_contracts(addresses_text: str, names_text: str = "",
-                          network: str = "Mainnet", progress=None) -> tuple:
-    """Funcție de analiză reală pentru integrarea cu Gradio"""
-    
-    # Creează analizorul
-    analyzer = create_analyzer_instance(network.lower())
-    if not analyzer:
-        return ("❌ Nu s-a putut inițializa analizorul. Verifică cheile API.", 
-                None, None, None, None)
-    
+def _parse_contracts_input(addresses_text: str, names_text: str = "",
+                           network: str = "mainnet") -> tuple:
+    """Parsează textul din interfață; returnează (contracts_data, mesaj_eroare)
+
+    Fiecare linie poate fi precedată de rețea (`polygon:0x...`); liniile fără
+    rețea aparțin lui `network`.
+    """
+    from web3 import Web3
+
     if not addresses_text.strip():
-        return ("⚠️ Vă rugăm să introduceți cel puțin o adresă de contract.", 
-                None, None, None, None)
+        return None, "⚠️ Vă rugăm să introduceți cel puțin o adresă de contract."
     
     # Parsează datele de intrare
-    addresses = [addr.strip() for addr in addresses_text.strip().split('\n') if addr.strip()]
+    entries = [addr.strip() for addr in addresses_text.strip().split('\n') if addr.strip()]
     names = [name.strip() for name in names_text.strip().split('\n') if name.strip()] if names_text else []
     
-    # Validează adresele Ethereum
+    # Validează rețelele și adresele Ethereum
+    tagged = []
     invalid_addresses = []
-    for addr in addresses:
+    for entry in entries:
         try:
+            entry_network, addr = split_network_tag(entry, network)
             Web3.to_checksum_address(addr)
+            tagged.append((entry_network, addr))
         except:
-            invalid_addresses.append(addr)
+            invalid_addresses.append(entry)
     
     if invalid_addresses:
-        return (f"❌ Adrese invalide: {', '.join(invalid_addresses[:3])}", 
-                None, None, None, None)
+        return None, f"❌ Adrese invalide: {', '.join(invalid_addresses[:3])}"
     
     # Pregătește datele pentru analiză
     contracts_data = []
-    for i, address in enumerate(addresses):
+    for i, (entry_network, address) in enumerate(tagged):
         contracts_data.append({
             "address": address,
-            "name": names[i] if i < len(names) else f"Contract_{i+1}"
+            "name": names[i] if i < len(names) else f"Contract_{i+1}",
+            "network": entry_network
         })
+    return contracts_data, None
+
+def _build_outputs(results: List[Dict[str, Any]], status: str = "",
+                   timings: str = "") -> tuple:
+    """Generează raportul, graficele și tabelul pentru rezultatele date
+
+    `timings` (defalcarea pe etape a rulării) este adăugat la finalul raportului.
+    """
+    # Importă funcțiile de generare din modulul principal
+    from gradio_vesting_app import (
+        generate_summary_report, 
+        create_security_scores_chart,
+        create_token_distribution_chart, 
+        create_risk_distribution_chart,
+        create_detailed_table
+    )
+    
+    # Un singur tabel columnar per actualizare, folosit de toate ieșirile
+    table = build_results_table(results)
+    summary = generate_summary_report(table)
+    if status:
+        summary = f"{status}\n{summary}"
+    if timings:
+        summary = f"{summary}\n\n{timings}"
+    # Agregatele graficelor, dintr-o singură grupare a tabelului
+    aggregates = aggregate_results(table)
+    security_chart = create_security_scores_chart(table, aggregates)
+    distribution_chart = create_token_distribution_chart(table, aggregates)
+    risk_chart = create_risk_distribution_chart(table, aggregates)
+    details_table = create_detailed_table(table)
+    
+    return summary, security_chart, distribution_chart, risk_chart, details_table
+
+def create_multi_network_analyzer(network: str = "mainnet") -> MultiNetworkAnalyzer:
+    """Analizor pentru intrări de pe mai multe rețele, peste analizoarele "calde" ale fiecăreia"""
+    return MultiNetworkAnalyzer(create_analyzer_instance, network)
+
+def real_analyze_contracts(addresses_text: str, names_text: str = "",
+                          network: str = "Mainnet", progress=None) -> tuple:
+    """Funcție de analiză reală pentru integrarea cu Gradio
+
+    Adresele pot fi de pe rețele diferite (`polygon:0x...`); fiecare rețea
+    este analizată în paralel, pe analizorul ei "cald" (creat la prima cerere).
+    """
+    contracts_data, error = _parse_contracts_input(addresses_text, names_text, network.lower())
+    if error:
+        return (error, None, None, None, None)
+    analyzer = create_multi_network_analyzer(network.lower())
     
     # Funcție de callback pentru progress
     def progress_callback(progress_val, desc):
@@ -407,30 +771,93 @@ def real_analyze_contracts(addresses_text: str, names_text: str = "",
     
     # Efectuează analiza
     try:
-        results = analyzer.analyze_multiple_contracts(contracts_data, progress_callback)
-        
-        # Importă funcțiile de generare din modulul principal
-        from gradio_vesting_app import (
-            generate_summary_report, 
-            create_security_scores_chart,
-            create_token_distribution_chart, 
-            create_risk_distribution_chart,
-            create_detailed_table
-        )
-        
-        # Generează outputurile
-        summary = generate_summary_report(results)
-        security_chart = create_security_scores_chart(results)
-        distribution_chart = create_token_distribution_chart(results)
-        risk_chart = create_risk_distribution_chart(results)
-        details_table = create_detailed_table(results)
-        
-        return summary, security_chart, distribution_chart, risk_chart, details_table
+        # Colectorul acestei rulări: rulările concurente nu își amestecă timpii
+        run = Metrics()
+        with record_run(run):
+            results = analyzer.analyze_multiple_contracts(contracts_data, progress_callback,
+                                                          max_workers=DEFAULT_MAX_WORKERS)
+        timings = format_breakdown(run.snapshot(), "⏱️ Timpi per etapă")
+        return _build_outputs(results, timings=timings)
         
     except Exception as e:
         return (f"❌ Eroare în timpul analizei: {str(e)}", 
                 None, None, None, None)
 
+def real_vesting_curve(addresses_text: str, names_text: str = "",
+                       network: str = "Mainnet", samples: int = DEFAULT_SAMPLES):
+    """Generează graficul istoric vested/released pentru contractele introduse"""
+    from gradio_vesting_app import create_vesting_curve_chart
+
+    contracts_data, error = _parse_contracts_input(addresses_text, names_text, network.lower())
+    if error:
+        return create_vesting_curve_chart([])
+
+    history = []
+    for contract_data in contracts_data:
+        address = contract_data["address"]
+        analyzer = get_analyzer(contract_data["network"], create_analyzer_instance)
+        if not analyzer:
+            continue
+        try:
+            rows = analyzer.get_vesting_history(address, samples=int(samples))
+        except Exception as e:
+            print(f"Eroare la eșantionarea istoricului pentru {address}: {e}")
+            continue
+        history.extend({"name": contract_data["name"], **row} for row in rows)
+    return create_vesting_curve_chart(history)
+
+# Intervalul minim (secunde) între două actualizări ale interfeței în modul streaming
+STREAM_UPDATE_INTERVAL = 1.0
+
+def real_analyze_contracts_stream(addresses_text: str, names_text: str = "",
+                                  network: str = "Mainnet",
+                                  cancel_event: Optional[threading.Event] = None):
+    """Variantă generator a `real_analyze_contracts` pentru Gradio
+
+    Fiecare valoare generată are forma rezultatului `real_analyze_contracts`
+    și conține toate contractele terminate până atunci. Analiza se oprește la
+    setarea `cancel_event` sau la închiderea generatorului (butonul Stop din
+    Gradio), iar ultima actualizare păstrează rezultatele parțiale, la fel
+    ca la o eroare în mijlocul analizei. Ca în
+    `real_analyze_contracts`, rețelele diferite sunt analizate în paralel.
+    """
+    contracts_data, error = _parse_contracts_input(addresses_text, names_text, network.lower())
+    if error:
+        yield (error, None, None, None, None)
+        return
+    analyzer = create_multi_network_analyzer(network.lower())
+    
+    total = len(contracts_data)
+    completed: Dict[int, Dict[str, Any]] = {}
+    last_update = 0.0
+    run = Metrics()
+    try:
+        streamed = analyzer.iter_analyze_contracts(contracts_data, DEFAULT_MAX_WORKERS,
+                                                   cancel_event)
+        for i, result in iter_recorded(streamed, run):
+            completed[i] = result
+            now = time.monotonic()
+            if len(completed) == total or now - last_update < STREAM_UPDATE_INTERVAL:
+                continue
+            last_update = now
+            results = [completed[k] for k in sorted(completed)]
+            yield _build_outputs(results, f"⏳ Analizate {len(completed)}/{total} contracte")
+    except Exception as e:
+        # Contractele terminate înainte de eroare rămân afișate
+        results = [completed[k] for k in sorted(completed)]
+        yield _build_outputs(results, f"❌ Eroare în timpul analizei după "
+                                      f"{len(completed)}/{total} contracte: {str(e)}",
+                             format_breakdown(run.snapshot(), "⏱️ Timpi per etapă"))
+        return
+    
+    results = [completed[k] for k in sorted(completed)]
+    timings = format_breakdown(run.snapshot(), "⏱️ Timpi per etapă")
+    if len(completed) < total:
+        yield _build_outputs(results, f"⏹️ Analiză oprită după {len(completed)}/{total} contracte",
+                             timings)
+    else:
+        yield _build_outputs(results, "✅ Analiza completă!", timings)
+
 # ── TESTARE ȘI DEBUGGING ─────────────────────────────────────────────────────────
 
 def test_analyzer():